@@ -0,0 +1,78 @@
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from benchmarks.accuracy import band_errors
+from benchmarks.suite import Measurement, benchmarks, measure
+
+
+def main() -> int:
+    """Run the benchmark suite and compare it against, or record it as, the baseline."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Momentum performance benchmarks.')
+    parser.add_argument('--baseline', type=Path, default=Path('var/benchmarks/baseline.json'))
+    parser.add_argument('--update-baseline', action='store_true', help='Record this run as the new baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown or memory growth.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark.')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this text.')
+    parser.add_argument('--accuracy', action='store_true', help='Report band error against path count instead.')
+    arguments = parser.parse_args()
+
+    if arguments.accuracy:
+        print(f'{"sampling":<12} {"dtype":<8} {"paths":>8} {"band error":>12}')
+        for result in band_errors():
+            print(f'{result.sampling:<12} {result.dtype:<8} {result.paths:>8} {result.error:>12.3%}')
+        return 0
+
+    baseline: dict[str, dict[str, float]] = (
+        json.loads(arguments.baseline.read_text()) if arguments.baseline.exists() else {}
+    )
+    results: dict[str, Measurement] = {}
+    regressions: list[str] = []
+    failures: list[str] = []
+
+    print(f'{"benchmark":<40} {"best":>10} {"median":>10} {"peak":>10} {"vs baseline":>12}')
+    for benchmark in benchmarks():
+        if arguments.filter not in benchmark.name:
+            continue
+
+        try:
+            measurement = results[benchmark.name] = measure(benchmark, arguments.repeat)
+        except Exception as error:
+            failures.append(f'{benchmark.name}: {type(error).__name__}: {error}')
+            print(f'{benchmark.name:<40} {"failed":>10}')
+            continue
+
+        reference = baseline.get(benchmark.name)
+        change = ''
+        if reference:
+            slowdown = measurement.seconds / reference['seconds'] - 1
+            growth = measurement.peak_bytes / max(reference['peak_bytes'], 1) - 1
+            change = f'{slowdown:+.0%}'
+            if slowdown > arguments.tolerance or growth > arguments.tolerance:
+                regressions.append(f'{benchmark.name}: time {slowdown:+.0%}, peak memory {growth:+.0%}')
+
+        print(
+            f'{benchmark.name:<40} {measurement.seconds * 1e3:>8.1f}ms {measurement.median_seconds * 1e3:>8.1f}ms '
+            f'{measurement.peak_bytes / 2**20:>8.1f}MB {change:>12}'
+        )
+
+    if failures:
+        print('\nFailed benchmarks:', *failures, sep='\n  ')
+
+    if arguments.update_baseline:
+        arguments.baseline.parent.mkdir(parents=True, exist_ok=True)
+        recorded = baseline | {name: asdict(measurement) for name, measurement in results.items()}
+        arguments.baseline.write_text(json.dumps(recorded, indent=2, sort_keys=True) + '\n')
+        print(f'\nBaseline written to {arguments.baseline}.')
+        return 1 if failures else 0
+
+    if regressions:
+        print('\nRegressions beyond the tolerance:', *regressions, sep='\n  ')
+
+    return 1 if failures or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
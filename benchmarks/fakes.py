@@ -0,0 +1,44 @@
+from typing import Any, Final
+from zlib import crc32
+
+import numpy
+from pandas import DataFrame, bdate_range
+
+from rebelist.momentum.domain import FinanceProvider, Stock
+
+
+def history_frame(length: int, seed: int = 0) -> DataFrame:
+    """Daily closes shaped like a Yahoo Finance history: a geometric random walk on a business-day index."""
+    generator = numpy.random.default_rng(seed)
+    closes = 100.0 * numpy.exp(numpy.cumsum(generator.normal(0.0003, 0.015, length)))
+    index = bdate_range(end='2025-09-17', periods=length, tz='America/New_York')
+
+    return DataFrame({'Close': closes}, index=index)
+
+
+class SyntheticProvider(FinanceProvider):
+    """Offline FinanceProvider serving a reproducible random-walk history for any symbol."""
+
+    def __init__(self, length: int = 1_260) -> None:
+        self.__length = length
+
+    def get_stock(self, symbol: str) -> Stock:
+        """Build the synthetic history of a symbol, the same on every call."""
+        frame = history_frame(self.__length, seed=crc32(symbol.encode()))
+        timestamps = frame.index.to_numpy(dtype='datetime64[ms]').astype(numpy.int64)
+
+        return Stock(symbol, symbol, 'USD', timestamps, frame['Close'].to_numpy(dtype=numpy.float64))
+
+
+class SyntheticTicker:
+    """Stand-in for ``yfinance.Ticker`` that serves a prepared history instead of downloading one."""
+
+    FRAMES: Final[dict[str, DataFrame]] = {}
+
+    def __init__(self, symbol: str, session: Any = None) -> None:
+        self.__symbol = symbol
+        self.info: dict[str, Any] = {'regularMarketPrice': 1.0, 'longName': symbol, 'currency': 'USD'}
+
+    def history(self, **_: Any) -> DataFrame:
+        """Return the history prepared for the symbol."""
+        return self.FRAMES[self.__symbol]
@@ -0,0 +1,296 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib import import_module
+from random import Random
+from typing import Any, Final
+from urllib.parse import urlencode
+
+import httpx
+import numpy
+import socketio
+from dependency_injector.providers import Object
+from nicegui import ui
+
+from benchmarks.fakes import SyntheticProvider
+from rebelist.momentum.application.cache import ForecastCache
+from rebelist.momentum.application.use_cases import GetStockForecastUseCase
+from rebelist.momentum.config import get_container
+from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator
+
+_ELEMENTS: Final[re.Pattern[str]] = re.compile(r'parseElements\(String\.raw`(.*?)`\)', re.DOTALL)
+_CLIENT_ID: Final[re.Pattern[str]] = re.compile(r"'client_id': '([^']+)'")
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    """What the simulated users ask for: tickers drawn by weight, and simulation counts and lengths drawn uniformly."""
+
+    tickers: dict[str, float]
+    simulation_counts: tuple[int, ...]
+    forecast_lengths: tuple[int, ...]
+
+    def draw(self, random: Random) -> tuple[str, int, int]:
+        """One request of the mix."""
+        ticker = random.choices(list(self.tickers), weights=list(self.tickers.values()))[0]
+        return ticker, random.choice(self.simulation_counts), random.choice(self.forecast_lengths)
+
+
+@dataclass(frozen=True, slots=True)
+class LoadReport:
+    """Latencies of the forecasts that completed, the number that failed or timed out, and the wall time of the run."""
+
+    clients: int
+    latencies: tuple[float, ...]
+    failures: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Completed forecasts per second."""
+        return len(self.latencies) / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Latency below which the given percentage of the completed forecasts fall, in seconds."""
+        return float(numpy.percentile(self.latencies, percent)) if self.latencies else float('nan')
+
+
+class DashboardUser:
+    """One browser tab on the dashboard, driven over the page request and Socket.IO connection a browser would use.
+
+    A forecast is submitted the way the page does it, by sending the input values and the button click as events, and
+    is complete when the server hides the activity spinner again.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.__url = url
+        self.__socket = socketio.AsyncClient(reconnection=False)
+        self.__client_id = ''
+        self.__elements: dict[str, dict[str, Any]] = {}
+        self.__activity = ''
+        self.__idle = asyncio.Event()
+        self.__next_message_id = 0
+        self.__socket.on('update', self.__on_update)
+
+    async def open(self, http: httpx.AsyncClient) -> None:
+        """Load the page and connect its socket."""
+        page = (await http.get(self.__url)).raise_for_status().text
+        elements, client_id = _ELEMENTS.search(page), _CLIENT_ID.search(page)
+        if elements is None or client_id is None:
+            raise RuntimeError(f'{self.__url} did not serve a NiceGUI page.')
+
+        self.__elements = json.loads(elements.group(1))
+        self.__client_id = client_id.group(1)
+        self.__activity = next(key for key, element in self.__elements.items() if element['tag'] == 'q-spinner')
+        query = {
+            'client_id': self.__client_id,
+            'next_message_id': 0,
+            'implicit_handshake': 'true',
+            'document_id': str(uuid.uuid4()),
+            'tab_id': str(uuid.uuid4()),
+        }
+        await self.__socket.connect(
+            f'{self.__url}?{urlencode(query)}', socketio_path='/_nicegui_ws/socket.io', transports=['websocket']
+        )
+
+    async def forecast(self, ticker: str, simulation_count: int, forecast_length: int, timeout: float) -> float:
+        """Submit a forecast and wait for it to be drawn; returns the seconds from the click to the idle page."""
+        await self.__emit(self.__labelled('Ticker Symbol'), 'update:value', ticker)
+        await self.__emit(self.__labelled('Simulations'), 'update:modelValue', simulation_count)
+        await self.__emit(self.__labelled('Forecast Days'), 'update:modelValue', forecast_length)
+
+        self.__idle.clear()
+        started = time.perf_counter()
+        await self.__emit(next(key for key, element in self.__elements.items() if element['tag'] == 'q-btn'), 'click')
+        await asyncio.wait_for(self.__idle.wait(), timeout)
+        latency = time.perf_counter() - started
+
+        # Browsers acknowledge what they received, so the server can drop it from its replay history.
+        await self.__socket.emit('ack', {'client_id': self.__client_id, 'next_message_id': self.__next_message_id})
+        return latency
+
+    async def close(self) -> None:
+        """Disconnect the socket, as closing the tab would."""
+        await self.__socket.disconnect()
+
+    async def __on_update(self, data: dict[str, Any]) -> None:
+        self.__next_message_id = int(data.get('_id', -1)) + 1
+        activity = data.get(self.__activity)
+        if activity is not None and 'hidden' in activity.get('class', []):
+            self.__idle.set()
+
+    def __labelled(self, label: str) -> str:
+        return next(key for key, element in self.__elements.items() if element.get('props', {}).get('label') == label)
+
+    async def __emit(self, key: str, kind: str, value: Any = None) -> None:
+        listener = next(event for event in self.__elements[key]['events'] if event['type'] == kind)
+        arguments = [] if value is None else [json.dumps(value)]
+        message = {'id': int(key), 'client_id': self.__client_id, 'listener_id': listener['listener_id']}
+        await self.__socket.emit('event', message | {'args': arguments})
+
+
+async def drive(
+    url: str,
+    workload: Workload,
+    clients: int,
+    requests: int,
+    think: float = 0.0,
+    timeout: float = 60.0,
+    seed: int = 0,
+) -> LoadReport:
+    """Open the dashboard in ``clients`` tabs at once and have each submit ``requests`` forecasts, one at a time.
+
+    Every user pauses ``think`` seconds between forecasts and draws its requests from the workload with its own seed.
+    """
+    users = [DashboardUser(url) for _ in range(clients)]
+    async with httpx.AsyncClient(timeout=timeout) as http:
+        await asyncio.gather(*(user.open(http) for user in users))
+
+    async def session(user: DashboardUser, random: Random) -> list[float | None]:
+        latencies: list[float | None] = []
+        for number in range(requests):
+            if number and think:
+                await asyncio.sleep(think)
+            try:
+                latencies.append(await user.forecast(*workload.draw(random), timeout))
+            except TimeoutError:
+                latencies.append(None)
+
+        return latencies
+
+    started = time.perf_counter()
+    try:
+        sessions = await asyncio.gather(*(session(user, Random(seed + index)) for index, user in enumerate(users)))
+    finally:
+        seconds = time.perf_counter() - started
+        await asyncio.gather(*(user.close() for user in users), return_exceptions=True)
+
+    latencies = [latency for latencies in sessions for latency in latencies]
+    completed = tuple(latency for latency in latencies if latency is not None)
+    return LoadReport(clients, completed, len(latencies) - len(completed), seconds)
+
+
+def serve(port: int, workers: int | None, cache: bool) -> None:
+    """Serve the dashboard on a local port, forecasting synthetic histories instead of downloading them.
+
+    The forecast use case is built from the container's simulator settings, with the synthetic provider. The forecast
+    cache and the simulator's horizon cache are only kept when asked for, so repeated requests are simulated rather
+    than served from memory.
+    """
+    container = get_container()
+    if workers is not None:
+        container.config.simulator.workers.from_value(workers)
+
+    settings = {name: value for name, value in container.config.simulator().items() if name != 'model'}
+    if not cache:
+        settings['horizon_cache_size'] = 0
+    telemetry = container.telemetry()
+    forecast_cache = (
+        ForecastCache(container.config.forecast_cache.ttl(), container.config.forecast_cache.max_size())
+        if cache
+        else None
+    )
+    use_case = GetStockForecastUseCase(
+        SyntheticProvider(), MonteCarloSimulator(telemetry=telemetry, **settings), forecast_cache, telemetry
+    )
+    container.get_stock_forecast_use_case.override(Object(use_case))
+
+    # Importing the dashboard registers its page and routes.
+    import_module('rebelist.momentum.presentation.dashboard')
+    ui.run(
+        host='127.0.0.1',
+        port=port,
+        show=False,
+        reload=False,
+        show_welcome_message=False,
+        uvicorn_logging_level='warning',
+    )
+
+
+@contextmanager
+def running_dashboard(port: int = 0, workers: int | None = None, cache: bool = False) -> Generator[str, None, None]:
+    """Run the dashboard in its own process, so the clients do not compete with it for the GIL; yields its URL."""
+    if not port:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+
+    url = f'http://127.0.0.1:{port}/'
+    # NiceGUI only runs in a main process, so the server is a fresh interpreter rather than a multiprocessing child.
+    command = [sys.executable, '-c', f'from benchmarks.load import serve; serve({port}, {workers}, {cache})']
+    environment = os.environ | {'PYTHONPATH': os.pathsep.join(sys.path)}
+    process = subprocess.Popen(command, env=environment)
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                httpx.get(f'{url}metrics').raise_for_status()
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError('The dashboard did not start.') from None
+                time.sleep(0.1)
+
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _weights(text: str) -> dict[str, float]:
+    """Parse ``VOO:3,AAPL,MSFT:2`` into ticker weights; a ticker without one weighs 1."""
+    weights: dict[str, float] = {}
+    for item in text.split(','):
+        ticker, _, weight = item.strip().partition(':')
+        weights[ticker.upper()] = float(weight or 1)
+
+    return weights
+
+
+def _sizes(text: str) -> tuple[int, ...]:
+    return tuple(int(size) for size in text.split(','))
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    """Load the dashboard with simulated users and report throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load', description='Momentum dashboard load test.')
+    parser.add_argument('--clients', type=int, default=10, help='Concurrent users, each in its own tab.')
+    parser.add_argument('--requests', type=int, default=5, help='Forecasts each user submits, one after another.')
+    parser.add_argument('--tickers', type=_weights, default='VOO:3,AAPL:2,MSFT,NVDA', help='Weighted ticker mix.')
+    parser.add_argument('--simulations', type=_sizes, default='1000,10000', help='Simulation counts to draw from.')
+    parser.add_argument('--days', type=_sizes, default='30,200', help='Forecast lengths to draw from.')
+    parser.add_argument('--think', type=float, default=0.0, help='Seconds each user waits between forecasts.')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds after which a forecast counts as failed.')
+    parser.add_argument('--workers', type=int, default=None, help='Simulator workers; the container default if unset.')
+    parser.add_argument('--cache', action='store_true', help='Serve repeated forecasts from the caches.')
+    parser.add_argument('--port', type=int, default=0, help='Port to serve on; any free port by default.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the request draws.')
+    options = parser.parse_args(arguments)
+
+    workload = Workload(options.tickers, options.simulations, options.days)
+    with running_dashboard(options.port, options.workers, options.cache) as url:
+        report = asyncio.run(
+            drive(url, workload, options.clients, options.requests, options.think, options.timeout, options.seed)
+        )
+
+    print(f'{"clients":>8} {"completed":>10} {"failed":>8} {"throughput":>12} {"p50":>10} {"p95":>10} {"p99":>10}')
+    print(
+        f'{report.clients:>8} {len(report.latencies):>10} {report.failures:>8} {report.throughput:>10.2f}/s '
+        + ' '.join(f'{report.percentile(percent) * 1e3:>8.0f}ms' for percent in (50, 95, 99))
+    )
+
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from itertools import product
+from time import perf_counter
+from unittest.mock import patch
+
+import numpy
+
+from benchmarks.fakes import SyntheticProvider, SyntheticTicker, history_frame
+from rebelist.momentum.application.use_cases import GetStockForecastUseCase
+from rebelist.momentum.domain import Stock
+from rebelist.momentum.infrastructure.finance import YahooProvider
+from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator, QuantileSketch, percentiles_in_place
+
+PATH_COUNTS = (1_000, 10_000, 100_000, 250_000)
+HORIZONS = (30, 120)
+SWEEP_HORIZONS = (30, 60, 120, 250, 500)
+HISTORY_LENGTHS = (250, 1_260, 5_000)
+REDUCTION_HORIZON = 120
+STARTUP_MODULES = ('rebelist.momentum.config', 'rebelist.momentum.presentation.cli')
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    """A named operation to measure; ``prepare`` builds its inputs outside the timed section."""
+
+    name: str
+    prepare: Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    """Best and median wall time over the repeats, and the peak memory traced during one extra run."""
+
+    seconds: float
+    median_seconds: float
+    peak_bytes: int
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Measurement:
+    """Time the operation ``repeat`` times after a warm-up run, then trace its peak allocation once."""
+    operation = benchmark.prepare()
+    operation()
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = perf_counter()
+        operation()
+        timings.append(perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(min(timings), statistics.median(timings), peak)
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """The whole suite: simulation grid, history ingestion, band reduction, the end-to-end use case and startup."""
+    stock = SyntheticProvider().get_stock('BENCH')
+
+    for paths, horizon in product(PATH_COUNTS, HORIZONS):
+        yield Benchmark(f'simulate[paths={paths},horizon={horizon}]', partial(_simulate, stock, paths, horizon))
+    for paths in (10_000, 100_000):
+        yield Benchmark(
+            f'simulate[paths={paths},horizon=120,dtype=float32]', partial(_simulate, stock, paths, 120, 'float32')
+        )
+    yield Benchmark('sweep[paths=10000,horizons=5]', partial(_sweep, stock, 10_000))
+
+    for length in HISTORY_LENGTHS:
+        yield Benchmark(f'ingest[bars={length}]', partial(_ingest, length))
+
+    for paths in (10_000, 100_000):
+        yield Benchmark(f'reduce.percentile[paths={paths}]', partial(_reduce_exact, paths))
+        yield Benchmark(f'reduce.sketch[paths={paths}]', partial(_reduce_sketch, paths))
+
+    yield Benchmark('use_case[paths=10000,horizon=60]', _end_to_end)
+
+    for module in STARTUP_MODULES:
+        yield Benchmark(f'import[{module}]', partial(_import, module))
+
+
+def _simulate(stock: Stock, paths: int, horizon: int, dtype: str = 'float64') -> Callable[[], object]:
+    # Without the horizon cache every repeat generates its paths, rather than slicing those of the first.
+    simulator = MonteCarloSimulator(dtype=dtype, horizon_cache_size=0)
+    return lambda: simulator.simulate(stock, paths, horizon, seed=1)
+
+
+def _sweep(stock: Stock, paths: int) -> Callable[[], object]:
+    simulator = MonteCarloSimulator(horizon_cache_size=0)
+    return lambda: simulator.sweep(stock, paths, SWEEP_HORIZONS, seed=1)
+
+
+def _ingest(length: int) -> Callable[[], object]:
+    SyntheticTicker.FRAMES['BENCH'] = history_frame(length)
+    provider = YahooProvider()
+
+    def run() -> object:
+        with patch('rebelist.momentum.infrastructure.finance.yahoo_provider.Ticker', SyntheticTicker):
+            return provider.get_stock('BENCH')
+
+    return run
+
+
+def _log_paths(paths: int) -> numpy.ndarray:
+    generator = numpy.random.default_rng(1)
+    return numpy.cumsum(generator.normal(0.0, 0.015, (REDUCTION_HORIZON, paths)), axis=0)
+
+
+def _reduce_exact(paths: int) -> Callable[[], object]:
+    log_paths = _log_paths(paths)
+    buffer = numpy.empty_like(log_paths)
+
+    def run() -> object:
+        # The simulator partitions its path buffer in place, so every run starts from a fresh, unpartitioned copy.
+        numpy.copyto(buffer, log_paths)
+        return percentiles_in_place(buffer, (10, 50, 90))
+
+    return run
+
+
+def _reduce_sketch(paths: int) -> Callable[[], object]:
+    log_paths = _log_paths(paths)
+    spread = 8 * 0.015 * numpy.sqrt(numpy.arange(1, REDUCTION_HORIZON + 1))
+
+    def run() -> object:
+        sketch = QuantileSketch(-spread, spread, 0.002)
+        sketch.update(log_paths)
+        return sketch.quantiles([0.1, 0.5, 0.9])
+
+    return run
+
+
+def _end_to_end() -> Callable[[], object]:
+    use_case = GetStockForecastUseCase(SyntheticProvider(), MonteCarloSimulator(horizon_cache_size=0))
+    return lambda: use_case('BENCH', 10_000, 60, seed=1)
+
+
+def _import(module: str) -> Callable[[], object]:
+    """Cold import in a fresh interpreter; the traced peak is the parent's only, so only the timings are meaningful."""
+    command = [sys.executable, '-c', f'import {module}']
+    environment = os.environ | {'PYTHONPATH': os.pathsep.join(sys.path)}
+    return lambda: subprocess.run(command, check=True, env=environment)
@@ -0,0 +1,3 @@
+from rebelist.momentum.application.cache.forecast_cache import CacheStatistics, ForecastCache, ForecastKey
+
+__all__ = ['ForecastCache', 'ForecastKey', 'CacheStatistics']
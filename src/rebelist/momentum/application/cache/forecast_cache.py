@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from rebelist.momentum.domain import Distribution, Forecast, PathReducer
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastKey:
+    """Identifies a forecast by its request parameters and the exact price history it was simulated from."""
+
+    symbol: str
+    simulation_count: int
+    forecast_length: int
+    seed: int | None
+    fingerprint: str
+    reducers: tuple[PathReducer, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStatistics:
+    """Snapshot of the cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    forecast: Forecast
+    size: int
+    expires_at: float
+
+
+class ForecastCache:
+    """Thread-safe in-memory forecast cache with per-entry time to live and a least-recently-used size cap.
+
+    Entries expire ``ttl`` seconds after they are stored. Whenever the estimated size of all entries exceeds
+    ``max_size`` bytes, the least recently used entries are evicted until it fits again.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.__ttl = ttl
+        self.__max_size = max_size
+        self.__entries: OrderedDict[ForecastKey, _Entry] = OrderedDict()
+        self.__size = 0
+        self.__lock = Lock()
+        self.__hits = self.__misses = self.__evictions = self.__expirations = 0
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """Current hit, miss, eviction and expiration counters."""
+        with self.__lock:
+            return CacheStatistics(
+                self.__hits, self.__misses, self.__evictions, self.__expirations, len(self.__entries), self.__size
+            )
+
+    def get(self, key: ForecastKey) -> Forecast | None:
+        """Return the cached forecast for the key, or None when it is missing or expired."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry.expires_at <= monotonic():
+                self.__remove(key)
+                self.__expirations += 1
+                entry = None
+
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry.forecast
+
+    def put(self, key: ForecastKey, forecast: Forecast) -> None:
+        """Store a forecast, evicting the least recently used entries beyond the size cap."""
+        size = self.__estimate_size(forecast)
+        if size > self.__max_size:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+            self.__entries[key] = _Entry(forecast, size, monotonic() + self.__ttl)
+            self.__size += size
+
+            while self.__size > self.__max_size:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __remove(self, key: ForecastKey) -> None:
+        self.__size -= self.__entries.pop(key).size
+
+    @staticmethod
+    def __estimate_size(forecast: Forecast) -> int:
+        """Estimate the bytes held by the forecast arrays and the price history of its stock."""
+        arrays = [forecast.timestamps, forecast.upper, forecast.median, forecast.lower]
+        arrays += [forecast.stock.timestamps, forecast.stock.prices]
+        for statistic in forecast.analytics.values():
+            if isinstance(statistic, Distribution):
+                arrays += [statistic.edges, statistic.probabilities]
+
+        return sum(array.nbytes for array in arrays)
@@ -1,3 +1,4 @@
 from rebelist.momentum.application.use_cases.forecast import GetStockForecastUseCase
+from rebelist.momentum.application.use_cases.portfolio_forecast import GetPortfolioForecastUseCase
 
-__all__ = ['GetStockForecastUseCase']
+__all__ = ['GetStockForecastUseCase', 'GetPortfolioForecastUseCase']
@@ -1,16 +1,121 @@
-from rebelist.momentum.domain import FinanceProvider, FinanceSimulator, Forecast
+from collections.abc import Generator, Iterable, Sequence
+
+from rebelist.momentum.application.cache import ForecastCache, ForecastKey
+from rebelist.momentum.domain import FinanceProvider, FinanceSimulator, Forecast, PathReducer
+from rebelist.momentum.telemetry import Telemetry
 
 
 class GetStockForecastUseCase:
     """Application use case for generating a stock price forecast."""
 
-    def __init__(self, provider: FinanceProvider, simulator: FinanceSimulator) -> None:
+    def __init__(
+        self,
+        provider: FinanceProvider,
+        simulator: FinanceSimulator,
+        cache: ForecastCache | None = None,
+        telemetry: Telemetry | None = None,
+    ) -> None:
         self.__provider = provider
         self.__simulator = simulator
+        self.__cache = cache
+        self.__telemetry = telemetry or Telemetry(enabled=False)
+
+    def __call__(
+        self,
+        symbol: str,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Forecast:
+        """Execute the use case to generate a forecast for a given stock symbol, with the analytics of the reducers."""
+        with self.__telemetry.span('use_case.forecast'):
+            return self.__forecast(symbol, simulation_count, forecast_length, seed, tuple(reducers))
+
+    def progressively(
+        self,
+        symbol: str,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Generator[Forecast, None, None]:
+        """Yield ever more precise forecasts as the simulation goes, ending with the complete one.
+
+        A cached forecast is yielded straight away, and only the complete forecast is cached. The lookup and every
+        estimate are timed in spans of their own, closed before yielding, so the time the consumer spends between
+        estimates is not counted and a stream that is dropped leaves no span open.
+        """
+        with self.__telemetry.span('use_case.forecast'):
+            stock = self.__provider.get_stock(symbol)
+            key = ForecastKey(symbol, simulation_count, forecast_length, seed, stock.fingerprint, tuple(reducers))
+            cached = self.__cache.get(key) if self.__cache is not None else None
+        if cached is not None:
+            yield cached
+            return
+
+        estimates = self.__simulator.simulate_progressively(stock, simulation_count, forecast_length, seed, reducers)
+        forecast: Forecast | None = None
+        while True:
+            with self.__telemetry.span('use_case.forecast'):
+                estimate = next(estimates, None)
+                if estimate is None and self.__cache is not None and forecast is not None:
+                    self.__cache.put(key, forecast)
+            if estimate is None:
+                return
+            forecast = estimate
+            yield forecast
 
-    def __call__(self, symbol: str, simulation_count: int, forecast_length: int) -> Forecast:
-        """Execute the use case to generate a forecast for a given stock symbol."""
+    def sweep(
+        self,
+        symbol: str,
+        simulation_count: int,
+        forecast_lengths: Iterable[int],
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> dict[int, Forecast]:
+        """Generate the forecasts of a stock for many forecast lengths at once, keyed by length.
+
+        Lengths already cached are served from the cache, the others are simulated together, and cached in turn.
+        """
+        with self.__telemetry.span('use_case.forecast'):
+            stock = self.__provider.get_stock(symbol)
+            keys = {
+                length: ForecastKey(symbol, simulation_count, length, seed, stock.fingerprint, tuple(reducers))
+                for length in sorted(set(forecast_lengths))
+            }
+            forecasts: dict[int, Forecast] = {}
+            for length, key in keys.items():
+                cached = self.__cache.get(key) if self.__cache is not None else None
+                if cached is not None:
+                    forecasts[length] = cached
+
+            missing = [length for length in keys if length not in forecasts]
+            if missing:
+                simulated = self.__simulator.sweep(stock, simulation_count, missing, seed, reducers)
+                for length in missing:
+                    forecasts[length] = simulated[length]
+                    if self.__cache is not None:
+                        self.__cache.put(keys[length], simulated[length])
+
+            return {length: forecasts[length] for length in keys}
+
+    def __forecast(
+        self,
+        symbol: str,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None,
+        reducers: tuple[PathReducer, ...],
+    ) -> Forecast:
         stock = self.__provider.get_stock(symbol)
-        forecast = self.__simulator.simulate(stock, simulation_count, forecast_length)
+        if self.__cache is None:
+            return self.__simulator.simulate(stock, simulation_count, forecast_length, seed, reducers)
+
+        key = ForecastKey(symbol, simulation_count, forecast_length, seed, stock.fingerprint, reducers)
+        forecast = self.__cache.get(key)
+        if forecast is None:
+            forecast = self.__simulator.simulate(stock, simulation_count, forecast_length, seed, reducers)
+            self.__cache.put(key, forecast)
 
         return forecast
@@ -0,0 +1,25 @@
+from collections.abc import Sequence
+
+from rebelist.momentum.domain import FinanceProvider, PortfolioForecast, PortfolioSimulator
+
+
+class GetPortfolioForecastUseCase:
+    """Application use case for generating a price forecast of a weighted basket of stocks."""
+
+    def __init__(self, provider: FinanceProvider, simulator: PortfolioSimulator) -> None:
+        self.__provider = provider
+        self.__simulator = simulator
+
+    def __call__(
+        self,
+        symbols: Sequence[str],
+        weights: Sequence[float],
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        include_assets: bool = False,
+    ) -> PortfolioForecast:
+        """Execute the use case to generate a forecast for the basket, fetching every history in one batch."""
+        stocks = self.__provider.get_stocks(symbols)
+
+        return self.__simulator.simulate(stocks, weights, simulation_count, forecast_length, seed, include_assets)
@@ -1,3 +1,12 @@
-from rebelist.momentum.config.container import Container
+from typing import TYPE_CHECKING
 
-__all__ = ['Container']
+from rebelist.momentum.config.container import Container, get_container
+from rebelist.momentum.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from rebelist.momentum.config.warmup import warm_up
+
+__all__ = ['Container', 'get_container', 'warm_up']
+
+# The warm-up imports the whole forecast stack, which is exactly what importing the container avoids.
+__getattr__, __dir__ = lazy_exports(__name__, {'warm_up': 'warmup'})
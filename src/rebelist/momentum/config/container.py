@@ -1,26 +1,144 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Callable
+from importlib import import_module
+from threading import Lock
+from typing import Any
+
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
-from dependency_injector.providers import Singleton
+from dependency_injector.providers import Configuration, Object, Selector, Singleton
+
+from rebelist.momentum.application.cache import ForecastCache
+from rebelist.momentum.application.use_cases import GetPortfolioForecastUseCase, GetStockForecastUseCase
+from rebelist.momentum.telemetry import Telemetry
+
+
+def _deferred(path: str) -> Callable[..., Any]:
+    """Constructor of the class at ``path`` that only imports it when the first instance is built."""
+    module, name = path.rsplit('.', 1)
 
-from rebelist.momentum.application.use_cases import GetStockForecastUseCase
-from rebelist.momentum.infrastructure.finance import YahooProvider
-from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator
+    def construct(*args: Any, **kwargs: Any) -> Any:
+        return getattr(import_module(module), name)(*args, **kwargs)
+
+    return construct
 
 
 class Container(DeclarativeContainer):
-    """Dependency injection container."""
+    """Dependency injection container.
+
+    Infrastructure services are built through deferred constructors, so importing and creating the container does not
+    load yfinance or pandas; they are imported when the first service that needs them is resolved.
+    """
 
+    # Wiring imports every presentation module, NiceGUI included, so it is not done on construction: headless entry
+    # points build the container without the UI stack, and an entry point using injection markers calls ``wire()``.
     wiring_config = WiringConfiguration(
-        auto_wire=True,
+        auto_wire=False,
         packages=['rebelist.momentum.presentation'],
     )
 
+    config = Configuration(
+        default={
+            'history_store': {'directory': 'var/cache/history'},
+            'shared_history': {'mode': 'mmap', 'directory': 'var/cache/shared', 'max_age': 300.0},
+            'upstream': {'rate': 2.0, 'burst': 5, 'retries': 3, 'backoff': 0.5},
+            'simulator': {
+                'model': 'monte_carlo',
+                'workers': os.cpu_count() or 1,
+                'chunk_size': 8_192,
+                'sampling': 'pseudo',
+                'tolerance': None,
+                'dtype': 'float64',
+                'horizon_cache_size': 64,
+                'horizon_analytics': False,
+            },
+            'forecast_cache': {'mode': 'memory', 'ttl': 300.0, 'max_size': 64 * 1024 * 1024},
+            'telemetry': {'enabled': True, 'trace_memory': False},
+            'warmup': {'enabled': True},
+        }
+    )
+
+    ### Shared Services ###
+
+    telemetry = Singleton(Telemetry, enabled=config.telemetry.enabled, trace_memory=config.telemetry.trace_memory)
+
+    finance_simulator = Selector(
+        config.simulator.model,
+        monte_carlo=Singleton(
+            _deferred('rebelist.momentum.infrastructure.forecast.MonteCarloSimulator'),
+            workers=config.simulator.workers,
+            chunk_size=config.simulator.chunk_size,
+            telemetry=telemetry,
+            sampling=config.simulator.sampling,
+            tolerance=config.simulator.tolerance,
+            dtype=config.simulator.dtype,
+            horizon_cache_size=config.simulator.horizon_cache_size,
+            horizon_analytics=config.simulator.horizon_analytics,
+        ),
+        lognormal=Singleton(_deferred('rebelist.momentum.infrastructure.forecast.LognormalSimulator')),
+    )
+
     ### Private Services ###
 
-    __finance_provider = Singleton(YahooProvider)
+    __price_history_store = Singleton(
+        _deferred('rebelist.momentum.infrastructure.finance.PriceHistoryStore'), config.history_store.directory
+    )
+
+    __shared_history_cache = Selector(
+        config.shared_history.mode,
+        mmap=Singleton(
+            _deferred('rebelist.momentum.infrastructure.finance.SharedHistoryCache'),
+            config.shared_history.directory,
+            config.shared_history.max_age,
+        ),
+        disabled=Object(None),
+    )
+
+    __upstream_rate_limit = Singleton(
+        _deferred('rebelist.momentum.infrastructure.finance.TokenBucket'),
+        rate=config.upstream.rate,
+        capacity=config.upstream.burst,
+    )
+
+    __finance_provider = Singleton(
+        _deferred('rebelist.momentum.infrastructure.finance.YahooProvider'),
+        __price_history_store,
+        telemetry,
+        shared=__shared_history_cache,
+        rate_limit=__upstream_rate_limit,
+        retries=config.upstream.retries,
+        backoff=config.upstream.backoff,
+    )
+
+    __portfolio_simulator = Singleton(
+        _deferred('rebelist.momentum.infrastructure.forecast.CorrelatedMonteCarloSimulator')
+    )
 
-    __finance_simulator = Singleton(MonteCarloSimulator)
+    __forecast_cache = Selector(
+        config.forecast_cache.mode,
+        memory=Singleton(ForecastCache, ttl=config.forecast_cache.ttl, max_size=config.forecast_cache.max_size),
+        disabled=Object(None),
+    )
 
     ### Public Services ###
-    get_stock_forecast_use_case = Singleton(GetStockForecastUseCase, __finance_provider, __finance_simulator)
+    get_stock_forecast_use_case = Singleton(
+        GetStockForecastUseCase, __finance_provider, finance_simulator, __forecast_cache, telemetry
+    )
+
+    get_portfolio_forecast_use_case = Singleton(GetPortfolioForecastUseCase, __finance_provider, __portfolio_simulator)
+
+
+_container: Container | None = None
+_container_lock = Lock()
+
+
+def get_container() -> Container:
+    """The process-wide container, created on first use and shared by every page and request."""
+    global _container
+
+    with _container_lock:
+        if _container is None:
+            _container = Container()
+
+    return _container
@@ -0,0 +1,21 @@
+import numpy
+
+from rebelist.momentum.config.container import Container
+from rebelist.momentum.domain import Stock
+
+_DAY_MILLISECONDS = 86_400_000
+
+
+def warm_up(container: Container) -> None:
+    """Prepare a process before it serves traffic, so the first request pays no import or setup cost.
+
+    Resolves the use cases, which imports yfinance and pandas and builds the provider, simulators and cache, then runs
+    a tiny offline, unseeded simulation on the configured simulator, to load the NumPy code paths a forecast goes
+    through and start its workers without leaving anything in its caches.
+    """
+    container.get_stock_forecast_use_case()
+    container.get_portfolio_forecast_use_case()
+
+    timestamps = 1_700_000_000_000 + numpy.arange(30) * _DAY_MILLISECONDS
+    prices = 100.0 * numpy.exp(numpy.linspace(0.0, 0.05, 30) + 0.01 * numpy.sin(numpy.arange(30)))
+    container.finance_simulator().simulate(Stock('Warm-up', 'WARMUP', 'USD', timestamps, prices), 64, 5)
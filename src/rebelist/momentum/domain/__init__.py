@@ -1,4 +1,27 @@
-from rebelist.momentum.domain.models import Forecast, Stock
-from rebelist.momentum.domain.services import FinanceProvider, FinanceSimulator, ProviderError
+from rebelist.momentum.domain.models import (
+    Distribution,
+    Forecast,
+    PathStatistic,
+    PortfolioForecast,
+    ReturnStatistics,
+    Stock,
+)
+from rebelist.momentum.domain.path_reducers import HitProbability, MaximumDrawdown, PathReducer, TerminalDistribution
+from rebelist.momentum.domain.services import FinanceProvider, FinanceSimulator, PortfolioSimulator, ProviderError
 
-__all__ = ['Stock', 'Forecast', 'FinanceProvider', 'ProviderError', 'FinanceSimulator']
+__all__ = [
+    'Stock',
+    'ReturnStatistics',
+    'Forecast',
+    'PortfolioForecast',
+    'Distribution',
+    'PathStatistic',
+    'PathReducer',
+    'HitProbability',
+    'MaximumDrawdown',
+    'TerminalDistribution',
+    'FinanceProvider',
+    'ProviderError',
+    'FinanceSimulator',
+    'PortfolioSimulator',
+]
@@ -1,21 +1,208 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from hashlib import blake2b
+from types import MappingProxyType
+from typing import Any, cast
+
+import numpy
+from numpy.typing import NDArray
+
+
+def _read_only(values: Any, dtype: type[numpy.generic]) -> NDArray[Any]:
+    """Contiguous one-dimensional read-only view of the values, copying only when the layout or dtype differs."""
+    array = numpy.ascontiguousarray(values, dtype=dtype).view()
+    if array.ndim != 1:
+        raise ValueError('Series must be one-dimensional.')
+    array.flags.writeable = False
+
+    return array
+
+
+def _equal(left: object, right: object) -> bool:
+    """Field-wise equality of two array-backed models of the same type."""
+    if type(left) is not type(right):
+        return False
+
+    for model_field in fields(cast(Any, left)):
+        if not model_field.compare:
+            continue
+        mine: Any = getattr(left, model_field.name)
+        theirs: Any = getattr(right, model_field.name)
+        if isinstance(mine, numpy.ndarray):
+            if not numpy.array_equal(cast(NDArray[Any], mine), theirs):
+                return False
+        elif mine != theirs:
+            return False
+
+    return True
 
 
 @dataclass(frozen=True, slots=True)
+class ReturnStatistics:
+    """Sample moments of the daily log-returns of a price history: what a simulation is parameterised with."""
+
+    count: int
+    mean: float
+    standard_deviation: float
+
+    @classmethod
+    def from_prices(cls, prices: NDArray[numpy.float64]) -> ReturnStatistics:
+        """Compute the moments of the log-returns between consecutive prices in one pass over the history."""
+        returns = numpy.diff(numpy.log(prices))
+
+        return cls(returns.size, float(returns.mean()), float(returns.std(ddof=1)))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Stock:
-    """Represents a financial stock with its identifying information and future price forecast."""
+    """Represents a financial stock with its identifying information and price history.
+
+    The price history is held as two aligned, read-only arrays: epoch-millisecond timestamps and closing prices.
+    Providers that keep the return moments up to date may attach them as ``statistics``, sparing consumers a pass
+    over the history; they are derived data and take no part in equality. ``exchange`` is the ISO 10383 market
+    identifier of the exchange the prices are quoted on, when the provider knows it.
+    """
 
     name: str
     ticker: str
     currency: str
-    history: dict[int, float]
+    timestamps: NDArray[numpy.int64]
+    prices: NDArray[numpy.float64]
+    statistics: ReturnStatistics | None = field(default=None, compare=False)
+    exchange: str | None = None
 
+    def __post_init__(self) -> None:
+        """Freeze the history into aligned read-only arrays."""
+        object.__setattr__(self, 'timestamps', _read_only(self.timestamps, numpy.int64))
+        object.__setattr__(self, 'prices', _read_only(self.prices, numpy.float64))
+        if self.timestamps.shape != self.prices.shape:
+            raise ValueError('Every timestamp needs exactly one price.')
 
-@dataclass(frozen=True, slots=True)
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field, arrays element-wise."""
+        return _equal(self, other)
+
+    @classmethod
+    def from_history(cls, name: str, ticker: str, currency: str, history: Mapping[int, float]) -> Stock:
+        """Build a stock from a timestamp to price mapping, sorted by timestamp."""
+        timestamps = numpy.fromiter(history.keys(), dtype=numpy.int64, count=len(history))
+        prices = numpy.fromiter(history.values(), dtype=numpy.float64, count=len(history))
+        order = numpy.argsort(timestamps, kind='stable')
+
+        return cls(name, ticker, currency, timestamps[order], prices[order])
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the price history, which changes whenever a bar is added or revised."""
+        digest = blake2b(digest_size=16)
+        digest.update(self.timestamps.tobytes())
+        digest.update(self.prices.tobytes())
+
+        return digest.hexdigest()
+
+    @property
+    def return_statistics(self) -> ReturnStatistics:
+        """Moments of the daily log-returns, as attached by the provider or else computed from the history."""
+        return self.statistics if self.statistics is not None else ReturnStatistics.from_prices(self.prices)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Distribution:
+    """Histogram of a simulated quantity: the probability of falling in each bin between consecutive ``edges``.
+
+    Values beyond the outer edges are counted in the outer bins, so the probabilities add up to one.
+    """
+
+    edges: NDArray[numpy.float64]
+    probabilities: NDArray[numpy.float64]
+
+    def __post_init__(self) -> None:
+        """Freeze the edges and probabilities into read-only arrays, one more edge than bins."""
+        object.__setattr__(self, 'edges', _read_only(self.edges, numpy.float64))
+        object.__setattr__(self, 'probabilities', _read_only(self.probabilities, numpy.float64))
+        if self.edges.size != self.probabilities.size + 1:
+            raise ValueError('Every bin needs a lower and an upper edge.')
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field, arrays element-wise."""
+        return _equal(self, other)
+
+    def quantile(self, probability: float) -> float:
+        """Value below which the given probability lies, interpolated linearly within its bin."""
+        cumulative = numpy.concatenate(([0.0], numpy.cumsum(self.probabilities)))
+        return float(numpy.interp(probability * float(cumulative[-1]), cumulative, self.edges))
+
+    def cumulative(self, value: float) -> float:
+        """Probability of falling below the value, interpolated linearly within its bin."""
+        cumulative = numpy.concatenate(([0.0], numpy.cumsum(self.probabilities)))
+        return float(numpy.interp(value, self.edges, cumulative))
+
+
+PathStatistic = float | Distribution
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Forecast:
-    """Represents a financial price forecast."""
+    """Represents a financial price forecast.
+
+    Bands are read-only price arrays aligned with ``timestamps``; ``points`` turns one into chart pairs. Simulators
+    may report the number of ``paths`` the bands were estimated from and, when they measure it, their ``precision``:
+    the relative half-width of the 95% confidence interval of the least precise band. ``analytics`` holds the result
+    of every path reducer the forecast was requested with, by reducer name.
+    """
 
     stock: Stock
-    upper: list[tuple[int, float]]
-    median: list[tuple[int, float]]
-    lower: list[tuple[int, float]]
+    timestamps: NDArray[numpy.int64]
+    upper: NDArray[numpy.float64]
+    median: NDArray[numpy.float64]
+    lower: NDArray[numpy.float64]
+    paths: int | None = None
+    precision: float | None = None
+    analytics: Mapping[str, PathStatistic] = field(default_factory=dict[str, PathStatistic])
+
+    def __post_init__(self) -> None:
+        """Freeze the bands into read-only arrays aligned with the timestamps, and the analytics into a mapping."""
+        object.__setattr__(self, 'timestamps', _read_only(self.timestamps, numpy.int64))
+        for band in ('upper', 'median', 'lower'):
+            object.__setattr__(self, band, _read_only(getattr(self, band), numpy.float64))
+            if getattr(self, band).shape != self.timestamps.shape:
+                raise ValueError('Every band needs exactly one price per timestamp.')
+        object.__setattr__(self, 'analytics', MappingProxyType(dict(self.analytics)))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field, arrays element-wise."""
+        return _equal(self, other)
+
+    def points(self, band: NDArray[numpy.float64]) -> list[tuple[int, float]]:
+        """Band as (timestamp, price) pairs."""
+        return list(zip(self.timestamps.tolist(), band.tolist(), strict=True))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class PortfolioForecast:
+    """Represents a price forecast for a weighted basket of stocks, valued from a common starting amount."""
+
+    stocks: list[Stock]
+    weights: NDArray[numpy.float64]
+    timestamps: NDArray[numpy.int64]
+    upper: NDArray[numpy.float64]
+    median: NDArray[numpy.float64]
+    lower: NDArray[numpy.float64]
+    assets: list[Forecast]
+
+    def __post_init__(self) -> None:
+        """Freeze the weights and bands into read-only arrays."""
+        object.__setattr__(self, 'weights', _read_only(self.weights, numpy.float64))
+        object.__setattr__(self, 'timestamps', _read_only(self.timestamps, numpy.int64))
+        for band in ('upper', 'median', 'lower'):
+            object.__setattr__(self, band, _read_only(getattr(self, band), numpy.float64))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field, arrays element-wise."""
+        return _equal(self, other)
+
+    def points(self, band: NDArray[numpy.float64]) -> list[tuple[int, float]]:
+        """Band as (timestamp, price) pairs."""
+        return list(zip(self.timestamps.tolist(), band.tolist(), strict=True))
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Final
+
+import numpy
+from numpy.typing import NDArray
+
+from rebelist.momentum.domain.models import Distribution, PathStatistic, Stock
+
+_BLOCK_VALUES: Final[int] = 1 << 16
+_EDGE_ROUNDING: Final[float] = 1e-6
+
+
+class PathReducer(ABC):
+    """A statistic of whole simulated price paths, accumulated chunk by chunk while the paths are generated.
+
+    ``reduce`` summarises a chunk of paths into an array of counts, or any other additive partial result; simulators
+    sum it over the chunks, in whatever order and on whatever thread they were generated, and ``finish`` turns the sum
+    over all the paths into the statistic attached to the forecast under ``name``. ``reduce_prefixes`` summarises
+    every horizon of the chunk at once, so that a simulator can keep the statistic of any shorter horizon. Reducers are
+    immutable values, so that they can be part of cache keys.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Key of the statistic in ``Forecast.analytics``."""
+        ...
+
+    @abstractmethod
+    def reduce(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Summarise a day-major (forecast_length, paths) chunk of cumulative log-returns from the last price."""
+        ...
+
+    def reduce_prefixes(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Summaries of every prefix of the chunk: row ``d`` is what ``reduce`` gives for the first ``d + 1`` days.
+
+        Reducers override this with a single pass over the days; this fallback reduces every prefix on its own.
+        """
+        return numpy.stack([self.reduce(stock, log_paths[:days]) for days in range(1, log_paths.shape[0] + 1)])
+
+    @abstractmethod
+    def finish(self, stock: Stock, forecast_length: int, total: NDArray[numpy.float64], paths: int) -> PathStatistic:
+        """Turn the summaries of all the paths, summed, into the statistic."""
+        ...
+
+
+def _histogram(values: NDArray[numpy.float64], edges: NDArray[numpy.float64]) -> NDArray[numpy.float64]:
+    """Counts of the values per bin, those beyond the outer edges in the outer bins."""
+    bins = numpy.clip(numpy.searchsorted(edges, values, side='right') - 1, 0, edges.size - 2)
+    return numpy.bincount(bins, minlength=edges.size - 1).astype(numpy.float64)
+
+
+def _day_blocks(log_paths: NDArray[numpy.floating]) -> list[slice]:
+    """Runs of consecutive days of about ``_BLOCK_VALUES`` values, small enough to keep their temporaries in cache."""
+    step = max(1, _BLOCK_VALUES // max(log_paths.shape[1], 1))
+    return [slice(start, start + step) for start in range(0, log_paths.shape[0], step)]
+
+
+def _daily_histograms(values: NDArray[numpy.float64], edges: NDArray[numpy.float64]) -> NDArray[numpy.float64]:
+    """What ``_histogram`` gives for every row of values over the equally wide bins of the same row of edges.
+
+    Values are placed arithmetically; those within rounding of an edge are then checked against the edges themselves,
+    so that they land in the bin ``_histogram`` puts them in. The edges may be one row shared by all the values.
+    """
+    days, bins = values.shape[0], edges.shape[1] - 1
+    low, high = edges[:, :1], edges[:, -1:]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        positions = (values - low) * (bins / (high - low))
+    # Values on the edge of a day without spread, and NaNs, sort past the last edge, like in the binary search.
+    numpy.nan_to_num(positions, copy=False, nan=bins, posinf=bins, neginf=0)
+    located = numpy.clip(positions, 0, bins - 1).astype(numpy.intp)
+
+    rows, columns = numpy.nonzero(numpy.abs(positions - numpy.rint(positions)) < _EDGE_ROUNDING)
+    if rows.size:
+        row_edges = edges[rows % edges.shape[0]]
+        near, value = located[rows, columns], values[rows, columns]
+        near -= value < numpy.take_along_axis(row_edges, near[:, numpy.newaxis], axis=1)[:, 0]
+        numpy.maximum(near, 0, out=near)
+        near += value >= numpy.take_along_axis(row_edges, near[:, numpy.newaxis] + 1, axis=1)[:, 0]
+        located[rows, columns] = numpy.minimum(near, bins - 1)
+
+    located += numpy.arange(0, days * bins, bins, dtype=numpy.intp)[:, numpy.newaxis]
+    counts = numpy.bincount(located.ravel(), minlength=days * bins)
+    return counts.reshape(days, bins).astype(numpy.float64)
+
+
+@dataclass(frozen=True, slots=True)
+class HitProbability(PathReducer):
+    """Probability that the closing price touches ``target`` on any day of the forecast.
+
+    A target above the last price is touched by closing at or above it, one below by closing at or below it. Prices
+    are only observed at the daily closes, so intraday touches are not counted.
+    """
+
+    target: float
+
+    def __post_init__(self) -> None:
+        """Reject targets that no price can reach."""
+        if self.target <= 0:
+            raise ValueError('The target price must be positive.')
+
+    @property
+    def name(self) -> str:
+        """Key of the statistic in ``Forecast.analytics``."""
+        return f'hit_probability[{self.target:g}]'
+
+    def reduce(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Count the paths that touch the target."""
+        threshold = math.log(self.target / float(stock.prices[-1]))
+        if threshold >= 0:
+            hits = log_paths.max(axis=0) >= threshold
+        else:
+            hits = log_paths.min(axis=0) <= threshold
+
+        return numpy.array([numpy.count_nonzero(hits)], dtype=numpy.float64)
+
+    def reduce_prefixes(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Count the paths that touched the target by every day."""
+        threshold = math.log(self.target / float(stock.prices[-1]))
+        if threshold >= 0:
+            hits = numpy.maximum.accumulate(log_paths, axis=0) >= threshold
+        else:
+            hits = numpy.minimum.accumulate(log_paths, axis=0) <= threshold
+
+        return numpy.count_nonzero(hits, axis=1).astype(numpy.float64)[:, numpy.newaxis]
+
+    def finish(self, stock: Stock, forecast_length: int, total: NDArray[numpy.float64], paths: int) -> PathStatistic:
+        """Share of the paths that touched the target."""
+        return float(total[0]) / paths if paths else math.nan
+
+
+@dataclass(frozen=True, slots=True)
+class MaximumDrawdown(PathReducer):
+    """Distribution of the largest fall of each path from its running peak, starting at the last price.
+
+    Drawdowns are fractions of the peak, from 0 (the path never fell) to 1, histogrammed in ``bins`` equal bins.
+    """
+
+    bins: int = 20
+
+    def __post_init__(self) -> None:
+        """Reject empty histograms."""
+        if self.bins < 1:
+            raise ValueError('The histogram needs at least one bin.')
+
+    @property
+    def name(self) -> str:
+        """Key of the statistic in ``Forecast.analytics``."""
+        return 'maximum_drawdown'
+
+    def reduce(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Histogram the maximum drawdown of every path."""
+        drawdowns = -numpy.expm1(-self.__log_drawdowns(log_paths).max(axis=0).astype(numpy.float64))
+
+        return _histogram(drawdowns, self.__edges())
+
+    def reduce_prefixes(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Histogram the maximum drawdown of every path so far, day by day."""
+        edges = self.__edges()[numpy.newaxis]
+        peak = numpy.zeros(log_paths.shape[1], dtype=log_paths.dtype)
+        worst = numpy.zeros_like(peak)
+        histograms: list[NDArray[numpy.float64]] = []
+        for days in _day_blocks(log_paths):
+            # The running peak and drawdown carry over between blocks, so each block is exactly a slice of the whole.
+            log_drawdowns = numpy.maximum.accumulate(log_paths[days], axis=0)
+            numpy.maximum(log_drawdowns, peak, out=log_drawdowns)
+            peak = log_drawdowns[-1].copy()
+            log_drawdowns -= log_paths[days]
+            numpy.maximum.accumulate(log_drawdowns, axis=0, out=log_drawdowns)
+            numpy.maximum(log_drawdowns, worst, out=log_drawdowns)
+            worst = log_drawdowns[-1].copy()
+            histograms.append(_daily_histograms(-numpy.expm1(-log_drawdowns.astype(numpy.float64)), edges))
+
+        return numpy.concatenate(histograms)
+
+    @staticmethod
+    def __log_drawdowns(log_paths: NDArray[numpy.floating]) -> NDArray[numpy.floating]:
+        """Fall of every path below its running peak, the last price included, in log-returns, day by day."""
+        peaks = numpy.maximum.accumulate(log_paths, axis=0)
+        numpy.maximum(peaks, 0.0, out=peaks)
+        peaks -= log_paths
+
+        return peaks
+
+    def finish(self, stock: Stock, forecast_length: int, total: NDArray[numpy.float64], paths: int) -> PathStatistic:
+        """Share of the paths per drawdown bin."""
+        return Distribution(self.__edges(), total / max(paths, 1))
+
+    def __edges(self) -> NDArray[numpy.float64]:
+        return numpy.linspace(0.0, 1.0, self.bins + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class TerminalDistribution(PathReducer):
+    """Distribution of the price on the last day of the forecast.
+
+    The ``bins`` are equally wide in log-price and span ``deviations`` standard deviations of the terminal log-return
+    either side of its mean, as given by the stock's return moments.
+    """
+
+    bins: int = 40
+    deviations: float = 4.0
+
+    def __post_init__(self) -> None:
+        """Reject empty histograms."""
+        if self.bins < 1:
+            raise ValueError('The histogram needs at least one bin.')
+
+    @property
+    def name(self) -> str:
+        """Key of the statistic in ``Forecast.analytics``."""
+        return 'terminal_distribution'
+
+    def reduce(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Histogram the terminal log-return of every path."""
+        return _histogram(log_paths[-1].astype(numpy.float64), self.__log_edges(stock, log_paths.shape[0]))
+
+    def reduce_prefixes(self, stock: Stock, log_paths: NDArray[numpy.floating]) -> NDArray[numpy.float64]:
+        """Histogram the log-return of every day, each over the bins of a forecast ending on it."""
+        edges = self.__log_edges(stock, numpy.arange(1, log_paths.shape[0] + 1, dtype=numpy.intp))
+        return numpy.concatenate(
+            [_daily_histograms(log_paths[days].astype(numpy.float64), edges[days]) for days in _day_blocks(log_paths)]
+        )
+
+    def finish(self, stock: Stock, forecast_length: int, total: NDArray[numpy.float64], paths: int) -> PathStatistic:
+        """Share of the paths per terminal price bin."""
+        edges = float(stock.prices[-1]) * numpy.exp(self.__log_edges(stock, forecast_length))
+        return Distribution(edges, total / max(paths, 1))
+
+    def __log_edges(self, stock: Stock, forecast_length: int | NDArray[numpy.integer]) -> NDArray[numpy.float64]:
+        """Log-return bin edges of a forecast of the given length, or a row of them per length in an array."""
+        statistics = stock.return_statistics
+        lengths = numpy.asarray(forecast_length)
+        centre = statistics.mean * lengths
+        spread = self.deviations * statistics.standard_deviation * numpy.sqrt(lengths)
+
+        return numpy.linspace(centre - spread, centre + spread, self.bins + 1, axis=-1)
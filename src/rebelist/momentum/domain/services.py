@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Sequence
 
-from rebelist.momentum.domain.models import Forecast, Stock
+from rebelist.momentum.domain.models import Forecast, PortfolioForecast, Stock
+from rebelist.momentum.domain.path_reducers import PathReducer
 
 
 class ProviderError(Exception):
@@ -17,11 +19,78 @@ class FinanceProvider(ABC):
         """Get stock with price history."""
         ...
 
+    def get_stocks(self, symbols: Sequence[str]) -> list[Stock]:
+        """Get several stocks with price history; providers that can fetch in one batch override this."""
+        return [self.get_stock(symbol) for symbol in symbols]
+
 
 class FinanceSimulator(ABC):
     """Simulator for stock price forecasting."""
 
     @abstractmethod
-    def simulate(self, stock: Stock, simulation_count: int, forecast_length: int) -> Forecast:
-        """Perform multiple Monte Carlo simulations and calculates median and percentile bands."""
+    def simulate(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Forecast:
+        """Perform multiple Monte Carlo simulations and calculates median and percentile bands.
+
+        The same seed reproduces the same forecast; without one every run draws fresh randomness. The statistics of
+        the ``reducers`` are computed over the simulated paths and attached to the forecast as its ``analytics``.
+        """
+        ...
+
+    def simulate_progressively(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Iterator[Forecast]:
+        """Yield ever more precise forecasts while simulating, the last one over all ``simulation_count`` paths.
+
+        Simulators that can refine an estimate in batches override this; by default the only estimate is the final one.
+        """
+        yield self.simulate(stock, simulation_count, forecast_length, seed, reducers)
+
+    def sweep(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_lengths: Iterable[int],
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> dict[int, Forecast]:
+        """Forecast every one of the forecast lengths, keyed by length.
+
+        Simulators that can slice every length from the paths of the longest override this; by default every length is
+        simulated on its own.
+        """
+        return {
+            length: self.simulate(stock, simulation_count, length, seed, reducers)
+            for length in sorted(set(forecast_lengths))
+        }
+
+
+class PortfolioSimulator(ABC):
+    """Simulator for the value of a weighted basket of stocks."""
+
+    @abstractmethod
+    def simulate(
+        self,
+        stocks: Sequence[Stock],
+        weights: Sequence[float],
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        include_assets: bool = False,
+    ) -> PortfolioForecast:
+        """Perform correlated Monte Carlo simulations of the basket and calculate median and percentile bands.
+
+        Per-asset bands are only calculated when ``include_assets`` is set.
+        """
         ...
@@ -1,3 +1,37 @@
-from rebelist.momentum.infrastructure.finance.yahoo_provider import YahooProvider
+from typing import TYPE_CHECKING
 
-__all__ = ['YahooProvider']
+from rebelist.momentum.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from rebelist.momentum.infrastructure.finance.price_history_store import PriceHistoryStore
+    from rebelist.momentum.infrastructure.finance.return_statistics_index import ReturnStatisticsIndex, RunningMoments
+    from rebelist.momentum.infrastructure.finance.shared_history_cache import SharedHistory, SharedHistoryCache
+    from rebelist.momentum.infrastructure.finance.single_flight import SingleFlight
+    from rebelist.momentum.infrastructure.finance.token_bucket import TokenBucket
+    from rebelist.momentum.infrastructure.finance.yahoo_provider import YahooProvider
+
+__all__ = [
+    'YahooProvider',
+    'PriceHistoryStore',
+    'ReturnStatisticsIndex',
+    'RunningMoments',
+    'SharedHistory',
+    'SharedHistoryCache',
+    'SingleFlight',
+    'TokenBucket',
+]
+
+# yfinance and pandas are only imported once a provider is actually used.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        'YahooProvider': 'yahoo_provider',
+        'PriceHistoryStore': 'price_history_store',
+        'ReturnStatisticsIndex': 'return_statistics_index',
+        'RunningMoments': 'return_statistics_index',
+        'SharedHistory': 'shared_history_cache',
+        'SharedHistoryCache': 'shared_history_cache',
+        'SingleFlight': 'single_flight',
+        'TokenBucket': 'token_bucket',
+    },
+)
@@ -0,0 +1,56 @@
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as numpy
+
+
+class PriceHistoryStore:
+    """On-disk store of daily closing prices, one uncompressed NumPy archive per symbol.
+
+    Every archive holds a ``timestamps`` column of epoch milliseconds and a ``closes`` column, each a contiguous array
+    sorted by timestamp. Writes go through a temporary file and an atomic rename, so readers never see a partial file.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.__directory = Path(directory)
+
+    def load(self, symbol: str) -> tuple[numpy.ndarray, numpy.ndarray] | None:
+        """Load the stored timestamps and closing prices of a symbol, or None when nothing is stored yet."""
+        path = self.__path(symbol)
+        if not path.exists():
+            return None
+
+        with numpy.load(path, allow_pickle=False) as archive:
+            if set(archive.files) != {'timestamps', 'closes'}:
+                return None
+            timestamps, closes = archive['timestamps'], archive['closes']
+
+        if timestamps.dtype != numpy.int64 or closes.dtype != numpy.float64 or not 0 < timestamps.size == closes.size:
+            return None
+
+        return timestamps, closes
+
+    def save(self, symbol: str, timestamps: numpy.ndarray, closes: numpy.ndarray) -> None:
+        """Replace the stored history of a symbol."""
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.__directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                numpy.savez(
+                    file,
+                    timestamps=numpy.asarray(timestamps, dtype=numpy.int64),
+                    closes=numpy.asarray(closes, dtype=numpy.float64),
+                )
+            os.replace(temporary, self.__path(symbol))
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def delete(self, symbol: str) -> None:
+        """Forget the stored history of a symbol."""
+        self.__path(symbol).unlink(missing_ok=True)
+
+    def __path(self, symbol: str) -> Path:
+        return self.__directory / f'{quote(symbol, safe="")}.npz'
@@ -0,0 +1,126 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Final
+
+import numpy as numpy
+
+from rebelist.momentum.domain import ReturnStatistics
+
+
+@dataclass(slots=True)
+class RunningMoments:
+    """Welford state of a sample that values can be both added to and removed from in O(1)."""
+
+    count: int = 0
+    mean: float = 0.0
+    squared_deviations: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the sample."""
+        self.count += 1
+        deviation = value - self.mean
+        self.mean += deviation / self.count
+        self.squared_deviations += deviation * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        """Remove a value previously added to the sample."""
+        if self.count <= 1:
+            self.count, self.mean, self.squared_deviations = 0, 0.0, 0.0
+            return
+
+        deviation = value - self.mean
+        self.mean -= deviation / (self.count - 1)
+        self.squared_deviations = max(0.0, self.squared_deviations - deviation * (value - self.mean))
+        self.count -= 1
+
+    def statistics(self) -> ReturnStatistics:
+        """Sample mean and standard deviation (ddof=1), NaN where the sample is too small, as NumPy reports them."""
+        mean = self.mean if self.count else math.nan
+        variance = self.squared_deviations / (self.count - 1) if self.count > 1 else math.nan
+
+        return ReturnStatistics(self.count, mean, math.sqrt(variance))
+
+
+@dataclass(slots=True)
+class _Window:
+    """The bars of one symbol currently covered by its moments, oldest first."""
+
+    bars: deque[tuple[int, float]] = field(default_factory=deque[tuple[int, float]])
+    moments: RunningMoments = field(default_factory=RunningMoments)
+    removals: int = 0
+
+
+class ReturnStatisticsIndex:
+    """In-memory index of the daily log-return moments of every symbol, kept in step with its lookback window.
+
+    Each update only touches the bars that changed since the previous one: new bars are appended, bars that fell out
+    of the window are evicted, and a replaced latest bar (a settled close overwriting a live intraday one) is retracted,
+    each in O(1). When the oldest bar no longer agrees with the history, as after a split or dividend re-adjustment,
+    the symbol is rebuilt from scratch. So are the moments every ``REBUILD_AFTER`` removals, to shed rounding drift.
+    """
+
+    REBUILD_AFTER: Final[int] = 10_000
+
+    def __init__(self) -> None:
+        self.__windows: dict[str, _Window] = {}
+        self.__lock = Lock()
+
+    def update(self, symbol: str, timestamps: numpy.ndarray, closes: numpy.ndarray) -> ReturnStatistics:
+        """Bring the moments of a symbol in line with its current window of sorted timestamps and closing prices."""
+        with self.__lock:
+            window = self.__windows.setdefault(symbol, _Window())
+            if timestamps.size == 0:
+                window.bars.clear()
+                window.moments = RunningMoments()
+                return window.moments.statistics()
+
+            self.__retract(window, timestamps, closes)
+            self.__evict(window, int(timestamps[0]))
+            if window.bars and window.bars[0] != (int(timestamps[0]), float(closes[0])):
+                window.bars.clear()
+            if not window.bars or window.removals >= self.REBUILD_AFTER:
+                window.moments, window.removals = RunningMoments(), 0
+                window.bars.clear()
+            self.__extend(window, timestamps, closes)
+
+            return window.moments.statistics()
+
+    def forget(self, symbol: str) -> None:
+        """Drop the moments of a symbol."""
+        with self.__lock:
+            self.__windows.pop(symbol, None)
+
+    @staticmethod
+    def __retract(window: _Window, timestamps: numpy.ndarray, closes: numpy.ndarray) -> None:
+        """Remove the latest bars until the newest remaining one still appears, unchanged, in the history."""
+        while window.bars:
+            timestamp, close = window.bars[-1]
+            position = int(numpy.searchsorted(timestamps, timestamp))
+            if position < timestamps.size and timestamps[position] == timestamp and closes[position] == close:
+                return
+
+            window.bars.pop()
+            if window.bars:
+                window.moments.remove(math.log(close) - math.log(window.bars[-1][1]))
+                window.removals += 1
+
+    @staticmethod
+    def __evict(window: _Window, start: int) -> None:
+        """Remove the oldest bars that fell out of the window."""
+        while window.bars and window.bars[0][0] < start:
+            _, close = window.bars.popleft()
+            if window.bars:
+                window.moments.remove(math.log(window.bars[0][1]) - math.log(close))
+                window.removals += 1
+
+    @staticmethod
+    def __extend(window: _Window, timestamps: numpy.ndarray, closes: numpy.ndarray) -> None:
+        """Append the bars newer than the latest one covered."""
+        start = int(numpy.searchsorted(timestamps, window.bars[-1][0], side='right')) if window.bars else 0
+
+        for timestamp, close in zip(timestamps[start:].tolist(), closes[start:].tolist(), strict=True):
+            if window.bars:
+                window.moments.add(math.log(close) - math.log(window.bars[-1][1]))
+            window.bars.append((timestamp, close))
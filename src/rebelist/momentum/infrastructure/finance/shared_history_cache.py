@@ -0,0 +1,187 @@
+import fcntl
+import json
+import mmap
+import os
+import tempfile
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Final
+
+import numpy
+
+
+@dataclass(frozen=True, slots=True)
+class SharedHistory:
+    """A history served from the shared cache: read-only views into the memory-mapped arena, and its metadata."""
+
+    name: str
+    currency: str
+    timestamps: numpy.ndarray
+    closes: numpy.ndarray
+    updated_at: float
+    exchange: str | None = None
+
+
+class SharedHistoryCache:
+    """Price histories shared by every worker process of a host through one memory-mapped arena file.
+
+    Histories are appended to the arena as a block of epoch-millisecond timestamps followed by a block of closes, and
+    are never modified once written, so readers map the arena and serve zero-copy views without any locking; the
+    operating system keeps a single copy of the pages for all processes. A small JSON index maps every symbol to the
+    offset, length and update time of its latest block, and is replaced atomically after the block is written.
+
+    Writers serialise on an exclusive ``flock``, across processes, and a lock, across threads. Once superseded blocks
+    make up most of the arena it is compacted into a new file; processes still mapping the old one keep valid views.
+    Histories older than ``max_age`` seconds are not served, so that the worker asking next refreshes them for all.
+    """
+
+    INDEX: Final[str] = 'index.json'
+    LOCK: Final[str] = 'index.lock'
+    COMPACTION_THRESHOLD: Final[int] = 1024 * 1024
+
+    def __init__(self, directory: str | Path, max_age: float) -> None:
+        self.__directory = Path(directory)
+        self.__max_age = max_age
+        self.__lock = Lock()
+        self.__index: dict[str, Any] = {'arena': None, 'entries': {}}
+        self.__index_version: tuple[int, int] | None = None
+        self.__maps: dict[str, mmap.mmap] = {}
+
+    def get(self, symbol: str) -> SharedHistory | None:
+        """The history of a symbol last stored by any process, or None when it is missing or older than ``max_age``."""
+        with self.__lock:
+            index = self.__read_index()
+            entry = index['entries'].get(symbol)
+            if entry is None or time.time() - entry['updated_at'] > self.__max_age:
+                return None
+
+            length = entry['length']
+            if length == 0:
+                timestamps, closes = numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
+                return SharedHistory(
+                    entry['name'], entry['currency'], timestamps, closes, entry['updated_at'], entry.get('exchange')
+                )
+
+            try:
+                arena = self.__map(index['arena'], entry['offset'] + 16 * length)
+            except FileNotFoundError:
+                # The arena was compacted away after the index was read; the next read sees the new one.
+                return None
+
+        timestamps = numpy.frombuffer(arena, dtype=numpy.int64, count=length, offset=entry['offset'])
+        closes = numpy.frombuffer(arena, dtype=numpy.float64, count=length, offset=entry['offset'] + 8 * length)
+
+        return SharedHistory(
+            entry['name'], entry['currency'], timestamps, closes, entry['updated_at'], entry.get('exchange')
+        )
+
+    def put(
+        self,
+        symbol: str,
+        timestamps: numpy.ndarray,
+        closes: numpy.ndarray,
+        name: str,
+        currency: str,
+        exchange: str | None = None,
+    ) -> None:
+        """Publish the history of a symbol to every process, replacing the one stored before."""
+        block = numpy.ascontiguousarray(timestamps, dtype=numpy.int64).tobytes()
+        block += numpy.ascontiguousarray(closes, dtype=numpy.float64).tobytes()
+
+        with self.__lock, self.__exclusive():
+            self.__index_version = None
+            index = self.__read_index()
+            if index['arena'] is None:
+                index['arena'] = self.__new_arena_name()
+
+            path = self.__directory / index['arena']
+            with open(path, 'ab') as arena:
+                offset = arena.tell()
+                arena.write(block)
+
+            index['entries'][symbol] = {
+                'offset': offset,
+                'length': len(timestamps),
+                'updated_at': time.time(),
+                'name': name,
+                'currency': currency,
+                'exchange': exchange,
+            }
+
+            live = sum(16 * entry['length'] for entry in index['entries'].values())
+            superseded = offset + len(block) - live
+            if superseded > max(live, self.COMPACTION_THRESHOLD):
+                self.__compact(index)
+
+            self.__write_index(index)
+            if index['arena'] != path.name:
+                path.unlink(missing_ok=True)
+
+    @contextmanager
+    def __exclusive(self) -> Generator[None, None, None]:
+        """Hold the cross-process writer lock."""
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        with open(self.__directory / self.LOCK, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __read_index(self) -> dict[str, Any]:
+        """The index as last published, only parsed again when the file was replaced."""
+        path = self.__directory / self.INDEX
+        try:
+            status = path.stat()
+        except FileNotFoundError:
+            return self.__index
+
+        version = (status.st_ino, status.st_mtime_ns)
+        if version != self.__index_version:
+            self.__index = json.loads(path.read_text())
+            self.__index_version = version
+
+        return self.__index
+
+    def __write_index(self, index: dict[str, Any]) -> None:
+        descriptor, temporary = tempfile.mkstemp(dir=self.__directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(index, file)
+            os.replace(temporary, self.__directory / self.INDEX)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def __compact(self, index: dict[str, Any]) -> None:
+        """Copy the live blocks into a new arena, updating their offsets in the index."""
+        source = self.__directory / index['arena']
+        target = self.__new_arena_name()
+
+        with open(source, 'rb') as old, open(self.__directory / target, 'wb') as new:
+            for entry in index['entries'].values():
+                old.seek(entry['offset'])
+                block = old.read(16 * entry['length'])
+                entry['offset'] = new.tell()
+                new.write(block)
+
+        index['arena'] = target
+
+    def __new_arena_name(self) -> str:
+        return f'arena-{time.time_ns()}-{os.getpid()}.bin'
+
+    def __map(self, arena: str, size: int) -> mmap.mmap:
+        """Read-only map of the arena covering at least ``size`` bytes, mapped again once the arena has grown."""
+        mapped = self.__maps.get(arena)
+        if mapped is None or len(mapped) < size:
+            for stale in [name for name in self.__maps if name != arena]:
+                del self.__maps[stale]
+            with open(self.__directory / arena, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__maps[arena] = mapped
+
+        return mapped
@@ -0,0 +1,42 @@
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it runs wait for it and share its result or
+    exception instead of running the function again. Once the call completes the key is free again, so later calls
+    run afresh: nothing is cached beyond the flight itself.
+    """
+
+    def __init__(self) -> None:
+        self.__flights: dict[Hashable, Future[T]] = {}
+        self.__lock = Lock()
+
+    def do(self, key: Hashable, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run the function for the key, or wait for the call already in flight for it."""
+        with self.__lock:
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self.__flights[key] = Future()
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__flights[key]
@@ -0,0 +1,35 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting calls to ``rate`` per second on average, in bursts of up to ``capacity``.
+
+    Every acquisition takes one token, waiting for it when the bucket is empty. Tokens are reserved under the lock
+    and waited for outside of it, so concurrent callers queue up fairly, each one ``1 / rate`` seconds after the last.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        if rate <= 0:
+            raise ValueError('The rate must be positive.')
+        if capacity < 1:
+            raise ValueError('The capacity must be at least one token.')
+
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = float(capacity)
+        self.__updated = monotonic()
+        self.__lock = Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available; returns the seconds waited."""
+        with self.__lock:
+            now = monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate) - 1
+            self.__updated = now
+            wait = max(0.0, -self.__tokens / self.__rate)
+
+        if wait:
+            sleep(wait)
+
+        return wait
@@ -1,34 +1,298 @@
-from typing import Final, cast
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from time import perf_counter, sleep
+from typing import Any, Final, TypeVar, cast
 
 import numpy
 import yfinance as client
+from curl_cffi.requests import Session
 from pandas import DataFrame, DateOffset, DatetimeIndex, Timestamp, to_datetime
 from yfinance import Ticker
+from yfinance.exceptions import YFRateLimitError
 
 from rebelist.momentum.domain import FinanceProvider, ProviderError, Stock
+from rebelist.momentum.infrastructure.finance.price_history_store import PriceHistoryStore
+from rebelist.momentum.infrastructure.finance.return_statistics_index import ReturnStatisticsIndex
+from rebelist.momentum.infrastructure.finance.shared_history_cache import SharedHistoryCache
+from rebelist.momentum.infrastructure.finance.single_flight import SingleFlight
+from rebelist.momentum.infrastructure.finance.token_bucket import TokenBucket
+from rebelist.momentum.telemetry import Telemetry
+
+T = TypeVar('T')
+
+
+@dataclass(slots=True)
+class FetchLatency:
+    """Running latency statistics for one kind of history fetch."""
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of one fetch."""
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
 
 
 class YahooProvider(FinanceProvider):
-    """FinanceProvider implementation using Yahoo Finance as a data source."""
+    """FinanceProvider implementation using Yahoo Finance as a data source.
+
+    With a PriceHistoryStore the full history is only downloaded on the first (cold) request for a symbol; later
+    (warm) requests only download the bars from the last stored dates onwards and append them. Latencies of both
+    kinds are tracked separately in ``fetch_latency``. With Telemetry, the metadata call, the download and the
+    cleanup are recorded as the ``provider.info``, ``provider.history`` and ``provider.clean`` stages.
+
+    The exchange of every stock is taken from the ticker metadata, as the market identifier of its trading calendar.
+
+    The return moments of every stock are kept in a ReturnStatisticsIndex, updated by the bars that changed since the
+    previous request, and attached to the stock as its ``statistics``.
+
+    With a SharedHistoryCache, every downloaded history is published to the other worker processes of the host, and
+    a history another process published recently is served from it without any download; those requests are tracked
+    as ``shared`` fetches.
+
+    Concurrent requests for the same symbols share one in-flight fetch. Every upstream call goes through one pooled
+    HTTP session, takes a token from the optional TokenBucket first, and is retried up to ``retries`` times with
+    jittered exponential backoff when Yahoo throttles it or the connection fails.
+    """
 
     LOOPBACK_YEARS: Final[int] = 5
+    ADJUSTMENT_TOLERANCE: Final[float] = 1e-6
+    # Yahoo exchange codes of the exchanges with a trading calendar, and their ISO 10383 market identifiers.
+    EXCHANGES: Final[dict[str, str]] = {
+        'NYQ': 'XNYS',
+        'ASE': 'XNYS',
+        'PCX': 'XNYS',
+        'BTS': 'XNYS',
+        'SNP': 'XNYS',
+        'DJI': 'XNYS',
+        'NMS': 'XNAS',
+        'NGM': 'XNAS',
+        'NCM': 'XNAS',
+        'NIM': 'XNAS',
+        'LSE': 'XLON',
+        'GER': 'XETR',
+        'FRA': 'XFRA',
+    }
 
-    def __init__(self):
+    def __init__(
+        self,
+        store: PriceHistoryStore | None = None,
+        telemetry: Telemetry | None = None,
+        statistics: ReturnStatisticsIndex | None = None,
+        shared: SharedHistoryCache | None = None,
+        session: Session[Any] | None = None,
+        rate_limit: TokenBucket | None = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ):
         client.set_tz_cache_location('var/cache')
+        self.__store = store
+        self.__telemetry = telemetry or Telemetry(enabled=False)
+        self.__statistics = statistics or ReturnStatisticsIndex()
+        self.__shared = shared
+        self.__session = session if session is not None else Session(impersonate='chrome')
+        self.__rate_limit = rate_limit
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__flights: SingleFlight[Any] = SingleFlight()
+        self.fetch_latency: dict[str, FetchLatency] = {
+            'cold': FetchLatency(),
+            'warm': FetchLatency(),
+            'shared': FetchLatency(),
+        }
 
     def get_stock(self, symbol: str) -> Stock:
         """Fetch historical stock price data from Yahoo Finance with hygiene and lookback."""
-        try:
-            ticker = Ticker(symbol)
+        return self.__flights.do(symbol, self.__get_stock, symbol)
 
-            if not ticker.info or ticker.info.get('regularMarketPrice') is None:
-                raise ValueError(f"Ticker '{symbol}' appears to be invalid or delisted.")
+    def get_stocks(self, symbols: Sequence[str]) -> list[Stock]:
+        """Fetch the price histories of several stocks in one batch download."""
+        return self.__flights.do(tuple(symbols), self.__get_stocks, symbols)
 
-            ticker_history: DataFrame = ticker.history(period='max', auto_adjust=True, actions=False)
+    def __get_stock(self, symbol: str) -> Stock:
+        shared = self.__from_shared(symbol)
+        if shared is not None:
+            return shared
+
+        started = perf_counter()
+        stored = self.__store.load(symbol) if self.__store else None
+
+        try:
+            ticker = Ticker(symbol, session=self.__session)
+            with self.__telemetry.span('provider.info'):
+                info = self.__info(symbol, ticker)
+
+            window: dict[str, Any] = {'start': self.__anchor(stored)} if stored is not None else {'period': 'max'}
+            with self.__telemetry.span('provider.history'):
+                ticker_history = self.__call(lambda: ticker.history(auto_adjust=True, actions=False, **window))
         except Exception as e:
             raise ProviderError(f"Failed to fetch price history for ticker '{symbol}'.") from e
 
+        with self.__telemetry.span('provider.clean'):
+            stock = self.__build(symbol, info, ticker_history, stored)
+        if stock is None:
+            return self.__get_stock(symbol)
+
+        self.fetch_latency['warm' if stored is not None else 'cold'].record(perf_counter() - started)
+        return stock
+
+    def __get_stocks(self, symbols: Sequence[str]) -> list[Stock]:
+        shared = [self.__from_shared(symbol) for symbol in symbols]
+        missing = [symbol for symbol, stock in zip(symbols, shared, strict=True) if stock is None]
+        if len(missing) < len(symbols):
+            downloaded = iter(self.__get_stocks(missing) if missing else [])
+            return [stock if stock is not None else next(downloaded) for stock in shared]
+
+        started = perf_counter()
+        stored = {symbol: self.__store.load(symbol) if self.__store else None for symbol in symbols}
+
+        try:
+            with self.__telemetry.span('provider.info'):
+                infos = {symbol: self.__info(symbol, Ticker(symbol, session=self.__session)) for symbol in symbols}
+            anchors = [self.__anchor(history) for history in stored.values() if history is not None]
+            window: dict[str, Any] = {'start': min(anchors)} if len(anchors) == len(symbols) else {'period': 'max'}
+            with self.__telemetry.span('provider.history'):
+                batch = self.__call(
+                    lambda: cast(
+                        DataFrame,
+                        client.download(
+                            list(symbols),
+                            auto_adjust=True,
+                            ignore_tz=False,
+                            group_by='ticker',
+                            progress=False,
+                            session=self.__session,
+                            **window,
+                        ),
+                    )
+                )
+        except Exception as e:
+            raise ProviderError(f'Failed to fetch price history for tickers {", ".join(symbols)}.') from e
+
+        stocks: list[Stock] = []
+        for symbol in symbols:
+            ticker_history = cast(DataFrame, batch[symbol]) if symbol in batch.columns.get_level_values(0) else None
+            with self.__telemetry.span('provider.clean'):
+                stock = self.__build(
+                    symbol, infos[symbol], DataFrame() if ticker_history is None else ticker_history, stored[symbol]
+                )
+            stocks.append(stock if stock is not None else self.get_stock(symbol))
+
+        self.fetch_latency['warm' if len(anchors) == len(symbols) else 'cold'].record(perf_counter() - started)
+        return stocks
+
+    def __from_shared(self, symbol: str) -> Stock | None:
+        """The stock as recently published by any worker process, its prices viewed in place; None on a miss."""
+        if self.__shared is None:
+            return None
+
+        started = perf_counter()
+        history = self.__shared.get(symbol)
+        if history is None:
+            return None
+
+        statistics = self.__statistics.update(symbol, history.timestamps, history.closes)
+        self.fetch_latency['shared'].record(perf_counter() - started)
+
+        return Stock(
+            history.name, symbol, history.currency, history.timestamps, history.closes, statistics, history.exchange
+        )
+
+    def __info(self, symbol: str, ticker: Ticker) -> dict[str, Any]:
+        """Fetch the ticker metadata, rejecting tickers that are invalid or no longer trade."""
+        info = self.__call(lambda: cast(dict[str, Any] | None, ticker.info))
+        if not info or info.get('regularMarketPrice') is None:
+            raise ValueError(f"Ticker '{symbol}' appears to be invalid or delisted.")
+
+        return info
+
+    def __call(self, function: Callable[[], T]) -> T:
+        """Make one upstream call within the rate limit, retrying transient failures with exponential backoff."""
+        attempt = 0
+        while True:
+            if self.__rate_limit is not None:
+                self.__rate_limit.acquire()
+            try:
+                return function()
+            except Exception as error:
+                if attempt == self.__retries or not self.__transient(error):
+                    raise
+            sleep(self.__backoff * 2**attempt * random.uniform(0.5, 1.5))
+            attempt += 1
+
+    @staticmethod
+    def __transient(error: Exception) -> bool:
+        """Whether a failed call may succeed when retried: throttling, connection failures and server errors."""
+        if isinstance(error, YFRateLimitError):
+            return True
+        if not isinstance(error, OSError):
+            return False
+
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status is None or status == 429 or status >= 500
+
+    @staticmethod
+    def __anchor(stored: tuple[numpy.ndarray, numpy.ndarray]) -> date:
+        """Date to resume downloading from: one settled bar early, so re-adjusted past prices show in the overlap."""
+        return Timestamp(int(stored[0][-min(2, stored[0].size)]), unit='ms').date()
+
+    def __build(
+        self,
+        symbol: str,
+        info: dict[str, Any],
+        ticker_history: DataFrame,
+        stored: tuple[numpy.ndarray, numpy.ndarray] | None,
+    ) -> Stock | None:
+        """Clean, merge, trim and store a downloaded history; None when the stored history had to be dropped."""
+        timestamps, closes = self.__clean(symbol, ticker_history, allow_empty=stored is not None)
+
+        if stored is not None:
+            merged = self.__append(stored, timestamps, closes)
+            if merged is None:
+                # Past prices were re-adjusted (split or dividend) since they were stored, so start over.
+                cast(PriceHistoryStore, self.__store).delete(symbol)
+                self.__statistics.forget(symbol)
+                return None
+            timestamps, closes = merged
+
+        cutoff = Timestamp(int(timestamps[-1]), unit='ms') - DateOffset(years=self.LOOPBACK_YEARS)
+        window = timestamps >= int(cutoff.timestamp() * 1000)
+        timestamps, closes = timestamps[window], closes[window]
+
+        if self.__store and not self.__unchanged(stored, timestamps, closes):
+            self.__store.save(symbol, timestamps, closes)
+
+        name = cast(str, info.get('longName'))
+        currency = cast(str, info.get('currency'))
+        exchange = self.EXCHANGES.get(cast(str, info.get('exchange')))
+        statistics = self.__statistics.update(symbol, timestamps, closes)
+        if self.__shared:
+            self.__shared.put(symbol, timestamps, closes, name, currency, exchange)
+
+        return Stock(name, symbol, currency, timestamps, closes, statistics, exchange)
+
+    @staticmethod
+    def __unchanged(
+        stored: tuple[numpy.ndarray, numpy.ndarray] | None, timestamps: numpy.ndarray, closes: numpy.ndarray
+    ) -> bool:
+        """Whether the merged history is the stored one, so that there is nothing to write back."""
+        return stored is not None and numpy.array_equal(stored[0], timestamps) and numpy.array_equal(stored[1], closes)
+
+    def __clean(self, symbol: str, ticker_history: DataFrame, allow_empty: bool) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Turn a downloaded history into sorted epoch-millisecond timestamps and closing prices."""
         if ticker_history.empty:
+            if allow_empty:
+                return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
             raise ProviderError(f"No price history available for ticker '{symbol}'.")
 
         if not isinstance(ticker_history.index, DatetimeIndex):
@@ -40,20 +304,36 @@ class YahooProvider(FinanceProvider):
         ticker_history = ticker_history.sort_index()
         ticker_history = ticker_history.dropna(subset=['Close'])
 
-        cutoff = cast(Timestamp, ticker_history.index.max() - DateOffset(years=self.LOOPBACK_YEARS))
-        ticker_history = ticker_history[ticker_history.index >= cutoff]
-
-        if ticker_history.empty:
+        if ticker_history.empty and not allow_empty:
             raise ProviderError(
                 f"Insufficient price history for ticker '{symbol}' in the last {self.LOOPBACK_YEARS} years."
             )
 
-        name = cast(str, ticker.info.get('longName'))
-        currency = cast(str, ticker.info.get('currency'))
+        index = cast(DatetimeIndex, ticker_history.index)
+        timestamps = index.to_numpy(dtype='datetime64[ms]').astype(numpy.int64)
+        closes = ticker_history['Close'].to_numpy(dtype=numpy.float64)
 
-        history = {
-            int(cast(Timestamp, date).timestamp() * 1000): float(cast(numpy.float64, row['Close']))
-            for date, row in ticker_history.iterrows()
-        }
+        return timestamps, closes
+
+    def __append(
+        self, stored: tuple[numpy.ndarray, numpy.ndarray], timestamps: numpy.ndarray, closes: numpy.ndarray
+    ) -> tuple[numpy.ndarray, numpy.ndarray] | None:
+        """Append freshly downloaded bars to the stored ones, or None if the overlapping bars no longer agree."""
+        stored_timestamps, stored_closes = stored
+        if timestamps.size == 0:
+            return stored_timestamps, stored_closes
+
+        # The last stored bar may have been a live intraday bar, so it is replaced rather than compared.
+        settled_timestamps, settled_closes = stored_timestamps[:-1], stored_closes[:-1]
+        overlap = numpy.isin(timestamps, settled_timestamps)
+
+        if overlap.any():
+            positions = numpy.searchsorted(settled_timestamps, timestamps[overlap])
+            if not numpy.allclose(settled_closes[positions], closes[overlap], rtol=self.ADJUSTMENT_TOLERANCE):
+                return None
 
-        return Stock(name, symbol, currency, dict(sorted(history.items())))
+        fresh = timestamps > settled_timestamps[-1] if settled_timestamps.size else numpy.ones_like(overlap)
+        return (
+            numpy.concatenate((settled_timestamps, timestamps[fresh])),
+            numpy.concatenate((settled_closes, closes[fresh])),
+        )
@@ -1,3 +1,37 @@
-from rebelist.momentum.infrastructure.forecast.monte_carlo_simulator import MonteCarloSimulator
+from typing import TYPE_CHECKING
 
-__all__ = ['MonteCarloSimulator']
+from rebelist.momentum.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from rebelist.momentum.infrastructure.forecast.lognormal_simulator import LognormalSimulator
+    from rebelist.momentum.infrastructure.forecast.monte_carlo_simulator import (
+        MonteCarloSimulator,
+        percentiles_in_place,
+    )
+    from rebelist.momentum.infrastructure.forecast.portfolio_simulator import CorrelatedMonteCarloSimulator
+    from rebelist.momentum.infrastructure.forecast.quantile_sketch import QuantileSketch
+    from rebelist.momentum.infrastructure.forecast.trading_calendar import TradingCalendar, calendar_for
+
+__all__ = [
+    'MonteCarloSimulator',
+    'LognormalSimulator',
+    'CorrelatedMonteCarloSimulator',
+    'QuantileSketch',
+    'TradingCalendar',
+    'calendar_for',
+    'percentiles_in_place',
+]
+
+# Simulators are only imported when used, keeping the container import light.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        'MonteCarloSimulator': 'monte_carlo_simulator',
+        'LognormalSimulator': 'lognormal_simulator',
+        'CorrelatedMonteCarloSimulator': 'portfolio_simulator',
+        'QuantileSketch': 'quantile_sketch',
+        'TradingCalendar': 'trading_calendar',
+        'calendar_for': 'trading_calendar',
+        'percentiles_in_place': 'monte_carlo_simulator',
+    },
+)
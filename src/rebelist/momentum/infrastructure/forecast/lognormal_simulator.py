@@ -0,0 +1,50 @@
+from collections.abc import Sequence
+from statistics import NormalDist
+from typing import Final
+
+import numpy as numpy
+
+from rebelist.momentum.domain import FinanceSimulator, Forecast, PathReducer, Stock
+from rebelist.momentum.infrastructure.forecast.trading_calendar import calendar_for
+
+
+class LognormalSimulator(FinanceSimulator):
+    """Closed-form forecasts under the model the Monte Carlo simulator samples from.
+
+    With i.i.d. normal daily log-returns of mean ``m`` and standard deviation ``s``, the cumulative log-return on day
+    ``t`` is normal with mean ``m t`` and standard deviation ``s sqrt(t)``, so the price is lognormal and its
+    percentiles are exact: ``last_price * exp(m t + s sqrt(t) z)``, with ``z`` the standard normal quantile. The bands
+    cost O(forecast_length) whatever the simulation count, which is ignored, as is the seed. Without sampled paths
+    there is nothing to run path reducers on, so the forecasts carry no analytics.
+    """
+
+    LOWER_PERCENTIL: Final[int] = 10
+    UPPER_PERCENTIL: Final[int] = 90
+
+    def __init__(self) -> None:
+        self.__quantiles = numpy.array(
+            [NormalDist().inv_cdf(percentile / 100) for percentile in (self.LOWER_PERCENTIL, 50, self.UPPER_PERCENTIL)]
+        )
+
+    def simulate(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Forecast:
+        """Calculate the exact median and percentile bands of the lognormal price distribution."""
+        if stock.prices.size == 0:
+            raise ValueError('The stock has no price history.')
+
+        statistics = stock.return_statistics
+        days = numpy.arange(1, forecast_length + 1, dtype=numpy.float64)
+
+        spread = statistics.standard_deviation * numpy.sqrt(days)
+        log_bands = statistics.mean * days + spread * self.__quantiles[:, None]
+        lower, median, upper = numpy.round(float(stock.prices[-1]) * numpy.exp(log_bands), 2)
+        future_timestamps = calendar_for(stock.exchange).following(int(stock.timestamps[-1]), forecast_length)
+
+        # Exact bands: no paths were sampled, and there is no sampling error.
+        return Forecast(stock, future_timestamps, upper, median, lower, paths=None, precision=0.0)
@@ -1,53 +1,583 @@
-from datetime import datetime
-from typing import Final
+import math
+import warnings
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib import import_module
+from statistics import NormalDist
+from threading import Lock
+from typing import Any, Final, TypeVar, cast
 
 import numpy as numpy
-from pandas import Timedelta, bdate_range
+from numpy.random import SeedSequence, default_rng
 
-from rebelist.momentum.domain import FinanceSimulator, Forecast, Stock
+from rebelist.momentum.domain import FinanceSimulator, Forecast, PathReducer, PathStatistic, Stock
+from rebelist.momentum.infrastructure.forecast.quantile_sketch import QuantileSketch
+from rebelist.momentum.infrastructure.forecast.trading_calendar import calendar_for
+from rebelist.momentum.telemetry import Telemetry
+
+_Result = TypeVar('_Result')
+_HorizonKey = tuple[str, float, float, int | None, int]
+
+
+def _student_t(probability: float, degrees_of_freedom: int) -> float:
+    """Quantile of Student's t distribution, from the Cornish-Fisher expansion around the normal quantile."""
+    z = NormalDist().inv_cdf(probability)
+    return z + (z**3 + z) / (4 * degrees_of_freedom) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * degrees_of_freedom**2)
+
+
+def percentiles_in_place(values: numpy.ndarray, percentiles: Sequence[float]) -> numpy.ndarray:
+    """Percentiles of every row, interpolated in float64 exactly as ``numpy.percentile`` does, without a copy.
+
+    The rows are partitioned in place, once, around every rank the percentiles need; only those ranks are then read,
+    so the order of the values within each row is lost.
+    """
+    count = values.shape[1]
+    positions = numpy.asarray(percentiles, dtype=numpy.float64) / 100 * (count - 1)
+    below = numpy.floor(positions).astype(numpy.intp)
+    above = numpy.minimum(below + 1, count - 1)
+    values.partition(numpy.union1d(below, above), axis=1)
+
+    low = values[:, below].T.astype(numpy.float64)
+    high = values[:, above].T.astype(numpy.float64)
+    spread = high - low
+    weights = (positions - below)[:, numpy.newaxis]
+    # numpy.percentile interpolates from the nearer rank, which keeps the result within the two values.
+    return cast(numpy.ndarray, numpy.where(weights >= 0.5, high - spread * (1 - weights), low + spread * weights))
+
+
+@dataclass(frozen=True, slots=True)
+class _Horizons:
+    """The longest forecast simulated from some paths, and the per-day summaries of the reducers it ran with."""
+
+    forecast: Forecast
+    prefixes: dict[PathReducer, numpy.ndarray]
+
+
+@dataclass(frozen=True, slots=True)
+class _Chunk:
+    """A contiguous range of paths generated from its own independent random stream."""
+
+    index: int
+    start: int
+    size: int
+    seed: SeedSequence
 
 
 class MonteCarloSimulator(FinanceSimulator):
-    """Monte Carlo simulator for stock price forecasting."""
+    """Monte Carlo simulator for stock price forecasting.
+
+    Paths are generated in seeded chunks spread over ``workers`` threads, and reduced to bands exactly or, beyond
+    ``streaming_threshold`` paths, through a quantile sketch. Seeded runs are kept for the last ``horizon_cache_size``
+    histories, so that shorter horizons of the same paths are sliced rather than simulated.
+    """
 
     LOWER_PERCENTIL: Final[int] = 10
     UPPER_PERCENTIL: int = 90
+    SKETCH_RANGE_DEVIATIONS: Final[float] = 8.0
+    SAMPLING_MODES: Final[tuple[str, ...]] = ('pseudo', 'antithetic', 'sobol')
+    MIN_BATCHES: Final[int] = 8
+    FIRST_CHUNK_SIZE: Final[int] = 64
+    DTYPES: Final[tuple[str, ...]] = ('float64', 'float32')
+    __EPSILON: Final[float] = 1e-12
+
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_size: int = 8_192,
+        streaming_threshold: int = 100_000,
+        relative_accuracy: float = 0.002,
+        telemetry: Telemetry | None = None,
+        sampling: str = 'pseudo',
+        tolerance: float | None = None,
+        dtype: str = 'float64',
+        horizon_cache_size: int = 64,
+        horizon_analytics: bool = False,
+    ) -> None:
+        if workers < 1:
+            raise ValueError('The simulator needs at least one worker.')
+        if chunk_size < 1:
+            raise ValueError('The chunk size must be a positive number of paths.')
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError('The tolerance must be a positive fraction of the price.')
+        if sampling not in self.SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode '{sampling}', expected one of {', '.join(self.SAMPLING_MODES)}.")
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown path dtype '{dtype}', expected one of {', '.join(self.DTYPES)}.")
+        if sampling == 'sobol':
+            try:
+                self.__qmc: Any = import_module('scipy.stats.qmc')
+                self.__special: Any = import_module('scipy.special')
+            except ImportError as e:
+                raise RuntimeError('Sobol sampling needs scipy: install rebelist-momentum[qmc].') from e
 
-    def simulate(self, stock: Stock, simulation_count: int, forecast_length: int) -> Forecast:
+        self.__workers = workers
+        self.__chunk_size = chunk_size
+        self.__streaming_threshold = streaming_threshold
+        self.__relative_accuracy = relative_accuracy
+        self.__telemetry = telemetry or Telemetry(enabled=False)
+        self.__sampling = sampling
+        self.__tolerance = tolerance
+        # With float32 the path buffers take half the memory and bandwidth, but the paths are accumulated and reduced
+        # in double precision, so the bands are as accurate: their sampling error dwarfs single-precision rounding.
+        self.__dtype = numpy.dtype(dtype)
+        self.__executor = ThreadPoolExecutor(workers, thread_name_prefix='monte-carlo') if workers > 1 else None
+        # A Sobol Brownian bridge spans the whole horizon, and adaptive runs stop on the precision of every day, so
+        # the first days of their paths are not a shorter forecast.
+        self.__horizon_cache_size = horizon_cache_size if sampling != 'sobol' and tolerance is None else 0
+        self.__horizon_analytics = horizon_analytics
+        self.__horizons: OrderedDict[_HorizonKey, _Horizons] = OrderedDict()
+        self.__horizons_lock = Lock()
+
+    def simulate(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Forecast:
         """Perform multiple Monte Carlo simulations and calculate median and percentile bands."""
-        history = stock.history
-        if not history:
+        return self.sweep(stock, simulation_count, (forecast_length,), seed, reducers)[forecast_length]
+
+    def simulate_progressively(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> Iterator[Forecast]:
+        """Simulate in batches of chunks, doubling in size, and yield the bands of all the paths so far after each.
+
+        Since every batch has at least as many paths as all the previous ones together, a first estimate comes after
+        a few dozen paths and the estimates add up to about twice the cost of the last one. In exact mode each estimate
+        reduces all the paths so far; in streaming mode the sketch keeps accumulating. The last estimate covers every
+        path and is identical to what ``simulate`` returns for the same seed. A horizon sliced from a longer cached
+        forecast is the only estimate.
+        """
+        cached = self.__recall(stock, simulation_count, (forecast_length,), seed, reducers)
+        if cached is not None:
+            yield cached[forecast_length]
+            return
+
+        estimate: tuple[dict[int, Forecast], dict[PathReducer, numpy.ndarray]] = ({}, {})
+        prefixes = self.__prefixes(seed)
+        estimates = self.__estimate(
+            stock, simulation_count, (forecast_length,), seed, reducers, progressive=True, prefixes=prefixes
+        )
+        for estimate in estimates:
+            yield estimate[0][forecast_length]
+        self.__remember(stock, simulation_count, seed, *estimate)
+
+    def sweep(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        forecast_lengths: Iterable[int],
+        seed: int | None = None,
+        reducers: Sequence[PathReducer] = (),
+    ) -> dict[int, Forecast]:
+        """Forecast every horizon from the paths of the longest one, each identical to a ``simulate`` of its own.
+
+        Shocks are drawn day-major, so the first days of a longer forecast are exactly a shorter forecast from the same
+        streams, and so are their bands.
+        """
+        horizons = sorted(set(forecast_lengths))
+        if not horizons:
+            raise ValueError('The sweep needs at least one forecast length.')
+
+        cached = self.__recall(stock, simulation_count, horizons, seed, reducers)
+        if cached is not None:
+            return cached
+
+        *_, (forecasts, prefixes) = self.__estimate(
+            stock, simulation_count, horizons, seed, reducers, progressive=False, prefixes=self.__prefixes(seed)
+        )
+        self.__remember(stock, simulation_count, seed, forecasts, prefixes)
+        return forecasts
+
+    def __caches(self, seed: int | None) -> bool:
+        """Whether a run is kept for slicing; unseeded runs draw fresh randomness every time, so they never are."""
+        return seed is not None and self.__horizon_cache_size > 0
+
+    def __prefixes(self, seed: int | None) -> bool:
+        """Whether the reducers of a run summarise every day, which costs about half a run more, for later slicing."""
+        return self.__horizon_analytics and self.__caches(seed)
+
+    def __recall(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        horizons: Sequence[int],
+        seed: int | None,
+        reducers: Sequence[PathReducer],
+    ) -> dict[int, Forecast] | None:
+        """Slice the horizons, and the analytics of the reducers, from a cached forecast that covers the longest.
+
+        Returns None when no cached forecast covers the horizons, or when it did not run with every reducer. Only runs
+        with ``horizon_analytics`` summarise their reducers for every day, so without it only requests without
+        reducers are sliced.
+        """
+        if not self.__caches(seed) or stock.prices.size == 0:
+            return None
+
+        with self.__horizons_lock:
+            key = self.__horizon_key(stock, simulation_count, seed)
+            entry = self.__horizons.get(key)
+            if entry is None or entry.forecast.timestamps.size < max(horizons):
+                return None
+            if any(reducer not in entry.prefixes for reducer in reducers):
+                return None
+            self.__horizons.move_to_end(key)
+
+        cached = entry.forecast
+        paths = cached.paths or 0
+        return {
+            horizon: Forecast(
+                stock,
+                cached.timestamps[:horizon],
+                cached.upper[:horizon],
+                cached.median[:horizon],
+                cached.lower[:horizon],
+                cached.paths,
+                cached.precision,
+                {
+                    reducer.name: reducer.finish(stock, horizon, entry.prefixes[reducer][horizon - 1], paths)
+                    for reducer in reducers
+                },
+            )
+            for horizon in horizons
+        }
+
+    def __remember(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        seed: int | None,
+        forecasts: dict[int, Forecast],
+        prefixes: dict[PathReducer, numpy.ndarray],
+    ) -> None:
+        """Keep the longest forecast, unless a longer one of the same paths is already cached.
+
+        A run of the same length as the cached one drew the same paths, so the summaries of their reducers are merged.
+        """
+        if not self.__caches(seed) or not forecasts:
+            return
+
+        longest = forecasts[max(forecasts)]
+        with self.__horizons_lock:
+            key = self.__horizon_key(stock, simulation_count, seed)
+            cached = self.__horizons.get(key)
+            if cached is None or cached.forecast.timestamps.size < longest.timestamps.size:
+                self.__horizons[key] = _Horizons(longest, prefixes)
+            elif cached.forecast.timestamps.size == longest.timestamps.size:
+                self.__horizons[key] = _Horizons(cached.forecast, cached.prefixes | prefixes)
+            self.__horizons.move_to_end(key)
+            while len(self.__horizons) > self.__horizon_cache_size:
+                self.__horizons.popitem(last=False)
+
+    @staticmethod
+    def __horizon_key(stock: Stock, simulation_count: int, seed: int | None) -> _HorizonKey:
+        """Identify the paths: the moments they are drawn from, with the history they belong to, seed and count."""
+        statistics = stock.return_statistics
+        return stock.fingerprint, statistics.mean, statistics.standard_deviation, seed, simulation_count
+
+    def __estimate(
+        self,
+        stock: Stock,
+        simulation_count: int,
+        horizons: Sequence[int],
+        seed: int | None,
+        reducers: Sequence[PathReducer],
+        progressive: bool,
+        prefixes: bool = False,
+    ) -> Iterator[tuple[dict[int, Forecast], dict[PathReducer, numpy.ndarray]]]:
+        """Yield the forecasts of every horizon after every batch of chunks, or only the final ones if not progressive.
+
+        The paths are generated for the longest horizon; the bands of the shorter ones are its first days, and the
+        reducers run on every horizon's prefix of the paths. With ``prefixes`` the reducers summarise every day of the
+        paths instead, and those summaries are yielded with the forecasts, so that any shorter horizon can be finished
+        from them later; otherwise no summaries are yielded.
+        """
+        if stock.prices.size == 0:
             raise ValueError('The stock has no price history.')
 
-        last_timestamp, last_price = next(reversed(history.items()))
-        last_price = float(last_price)
-        start_date = datetime.fromtimestamp(last_timestamp / 1000)
+        forecast_length = max(horizons)
+        last_price = float(stock.prices[-1])
+        statistics = stock.return_statistics
+
+        future_timestamps = calendar_for(stock.exchange).following(int(stock.timestamps[-1]), forecast_length)
+
+        average_daily_move = statistics.mean
+        standard_deviation = statistics.standard_deviation
+
+        root = SeedSequence(seed)
+        chunks = self.__split(simulation_count, root)
+        tolerance = self.__tolerance
+        adaptive = tolerance is not None
+        batches = self.__batch(chunks, self.MIN_BATCHES if adaptive else 1) if progressive or adaptive else [chunks]
+        percentiles = (self.LOWER_PERCENTIL, 50, self.UPPER_PERCENTIL)
+        # Per-chunk bands, the batch means from which an adaptive run estimates its precision.
+        chunk_bands = numpy.empty((len(chunks), len(percentiles), forecast_length)) if adaptive else None
+        # Per-chunk reducer summaries, kept apart so that their sum never depends on the order the chunks finish in.
+        summaries: list[list[numpy.ndarray]] = [[] for _ in chunks]
+
+        def simulate(chunk: _Chunk) -> numpy.ndarray:
+            log_paths = self.__simulate_log_paths(chunk, root, average_daily_move, standard_deviation, forecast_length)
+            # The reducers need whole paths, so they go before the bands, which reorder the paths of every day.
+            summaries[chunk.index] = (
+                [reducer.reduce_prefixes(stock, log_paths) for reducer in reducers]
+                if prefixes
+                else [reducer.reduce(stock, log_paths[:horizon]) for horizon in horizons for reducer in reducers]
+            )
+            if chunk_bands is not None:
+                chunk_bands[chunk.index] = percentiles_in_place(log_paths, percentiles)
+            return log_paths
+
+        # Small runs are reduced exactly from one dense path matrix. Larger ones fold every chunk into a per-day sketch,
+        # so peak memory follows the chunk size and worker count rather than the path count, within relative_accuracy.
+        if simulation_count <= self.__streaming_threshold:
+            log_paths = numpy.empty((forecast_length, simulation_count), dtype=self.__dtype)
+
+            def fill(assigned: Sequence[_Chunk]) -> None:
+                for chunk in assigned:
+                    log_paths[:, chunk.start : chunk.start + chunk.size] = simulate(chunk)
+
+            def generate(batch: list[_Chunk]) -> None:
+                self.__run(fill, batch)
+
+            def reduce(paths: int) -> numpy.ndarray:
+                return percentiles_in_place(log_paths[:, :paths], percentiles)
+        else:
+            sketch = self.__create_sketch(average_daily_move, standard_deviation, forecast_length)
+
+            def stream(assigned: Sequence[_Chunk]) -> QuantileSketch:
+                partial = self.__create_sketch(average_daily_move, standard_deviation, forecast_length)
+                for chunk in assigned:
+                    partial.update(simulate(chunk))
+                return partial
+
+            def generate(batch: list[_Chunk]) -> None:
+                for partial in self.__run(stream, batch):
+                    sketch.merge(partial)
+
+            def reduce(paths: int) -> numpy.ndarray:
+                return sketch.quantiles([percentile / 100 for percentile in percentiles])
+
+        # In streaming mode generation and sketching interleave, and are both timed as paths.
+        for number, batch in enumerate(batches, 1):
+            with self.__telemetry.span('simulator.paths'):
+                generate(batch)
+            paths = batch[-1].start + batch[-1].size
+            done = batch[-1].index + 1
+            precision = None if chunk_bands is None else self.__precision(chunk_bands[:done])
+            final = number == len(batches) or (tolerance is not None and cast(float, precision) <= tolerance)
+
+            if progressive or final:
+                with self.__telemetry.span('simulator.reduce'):
+                    log_bands = reduce(paths)
+                    totals = [numpy.sum(parts, axis=0) for parts in zip(*summaries[:done], strict=True)]
+                    daily = dict(zip(reducers, totals, strict=True)) if prefixes else {}
+                    remaining = iter(totals)
+                    forecasts: dict[int, Forecast] = {}
+                    for horizon in horizons:
+                        analytics = {
+                            reducer.name: reducer.finish(
+                                stock, horizon, daily[reducer][horizon - 1] if prefixes else next(remaining), paths
+                            )
+                            for reducer in reducers
+                        }
+                        horizon_precision = (
+                            None if chunk_bands is None else self.__precision(chunk_bands[:done, :, :horizon])
+                        )
+                        forecasts[horizon] = self.__forecast(
+                            stock,
+                            future_timestamps[:horizon],
+                            last_price,
+                            log_bands[:, :horizon],
+                            paths,
+                            horizon_precision,
+                            analytics,
+                        )
+                yield forecasts, daily
+            if final:
+                return
+
+    @staticmethod
+    def __batch(chunks: list[_Chunk], first: int) -> list[list[_Chunk]]:
+        """Group the chunks into consecutive batches, each of the paths of all the previous ones and ``first`` chunks.
+
+        A batch takes chunks until it has at least that many paths, so with equal chunks every batch has ``first``
+        chunks more than all the previous ones together.
+        """
+        step = sum(chunk.size for chunk in chunks[:first])
+        batches: list[list[_Chunk]] = [[]]
+        done = pending = 0
+        for chunk in chunks:
+            if pending >= done + step:
+                batches.append([])
+                done, pending = done + pending, 0
+            batches[-1].append(chunk)
+            pending += chunk.size
+
+        return batches
+
+    @staticmethod
+    def __precision(chunk_bands: numpy.ndarray) -> float:
+        """Widest 95% confidence interval half-width of the bands, relative to the price, from per-chunk batch means.
+
+        An adaptive run stops once this is within its ``tolerance``. Sobol chunks are not independent, which makes the
+        interval conservative.
+        """
+        batches = chunk_bands.shape[0]
+        if batches < 2:
+            return math.inf
+
+        half_width = _student_t(0.975, batches - 1) * chunk_bands.std(axis=0, ddof=1) / math.sqrt(batches)
+        return float(numpy.expm1(half_width.max()))
+
+    @staticmethod
+    def __forecast(
+        stock: Stock,
+        future_timestamps: numpy.ndarray,
+        last_price: float,
+        log_bands: numpy.ndarray,
+        paths: int,
+        precision: float | None,
+        analytics: dict[str, PathStatistic],
+    ) -> Forecast:
+        """Turn the lower, median and upper cumulative log-returns into price bands."""
+        lower, median, upper = numpy.round(last_price * numpy.exp(log_bands), 2)
+
+        return Forecast(stock, future_timestamps, upper, median, lower, paths, precision, analytics)
+
+    def __split(self, simulation_count: int, root: SeedSequence) -> list[_Chunk]:
+        """Split the run into chunks, each with its own stream spawned from the run's seed.
+
+        Chunks double from ``FIRST_CHUNK_SIZE`` paths up to ``chunk_size``; those of adaptive runs, which are its batch
+        means, all have ``chunk_size`` paths. The split never depends on the worker count, so neither does a seeded run.
+        """
+        size = self.__chunk_size if self.__tolerance is not None else min(self.FIRST_CHUNK_SIZE, self.__chunk_size)
+        starts: list[int] = []
+        sizes: list[int] = []
+        start = 0
+        while start < simulation_count:
+            starts.append(start)
+            sizes.append(min(size, simulation_count - start))
+            start += sizes[-1]
+            size = min(2 * size, self.__chunk_size)
+        seeds = root.spawn(len(sizes))
+
+        return [_Chunk(index, *chunk) for index, chunk in enumerate(zip(starts, sizes, seeds, strict=True))]
+
+    def __run(self, task: Callable[[Sequence[_Chunk]], _Result], chunks: list[_Chunk]) -> list[_Result]:
+        """Deal the chunks round-robin over the workers and run the task once per worker."""
+        groups = [chunks[worker :: self.__workers] for worker in range(min(self.__workers, len(chunks)))]
+        if self.__executor is None or len(groups) < 2:
+            return [task(chunks)]
+
+        return list(self.__executor.map(task, groups))
+
+    def __create_sketch(
+        self, average_daily_move: float, standard_deviation: float, forecast_length: int
+    ) -> QuantileSketch:
+        """Create a quantile sketch whose range covers the expected spread of the cumulative log-returns."""
+        days = numpy.arange(1, forecast_length + 1, dtype=numpy.float64)
+        spread = self.SKETCH_RANGE_DEVIATIONS * standard_deviation * numpy.sqrt(days)
+
+        return QuantileSketch(
+            average_daily_move * days - spread, average_daily_move * days + spread, self.__relative_accuracy
+        )
+
+    def __simulate_log_paths(
+        self,
+        chunk: _Chunk,
+        root: SeedSequence,
+        average_daily_move: float,
+        standard_deviation: float,
+        forecast_length: int,
+    ) -> numpy.ndarray:
+        """Generate cumulative log-returns for a chunk of paths, laid out day-major as (forecast_length, chunk.size).
+
+        The whole shock matrix is drawn in bulk into a single preallocated buffer, which is then scaled to the
+        historical moments and accumulated along the day axis in place, in double precision whatever the path dtype.
+        ``pseudo`` shocks are independent; ``antithetic`` pairs every path with its mirror image, which cancels the odd
+        moments of the sampling error; ``sobol`` builds the paths from a scrambled Sobol sequence with a Brownian
+        bridge, so the leading, best-distributed dimensions decide the overall shape of each path.
+        """
+        log_paths = numpy.empty((forecast_length, chunk.size), dtype=self.__dtype)
+
+        if self.__sampling == 'sobol':
+            self.__brownian_bridge(self.__sobol_normals(chunk, root, forecast_length), log_paths)
+            log_paths *= standard_deviation
+            log_paths += average_daily_move * numpy.arange(1, forecast_length + 1, dtype=numpy.float64)[:, None]
+            return log_paths
+
+        if self.__sampling == 'antithetic':
+            shocks = default_rng(chunk.seed).standard_normal(
+                (forecast_length, (chunk.size + 1) // 2), dtype=self.__dtype
+            )
+            log_paths[:, : shocks.shape[1]] = shocks
+            numpy.negative(shocks[:, : chunk.size - shocks.shape[1]], out=log_paths[:, shocks.shape[1] :])
+        else:
+            default_rng(chunk.seed).standard_normal(dtype=self.__dtype, out=log_paths)
+        log_paths *= standard_deviation
+        log_paths += average_daily_move
+        self.__accumulate(log_paths)
+
+        return log_paths
 
-        prices = numpy.array(list(history.values()), dtype=float)
-        returns = numpy.log(prices[1:] / prices[:-1])
+    @staticmethod
+    def __accumulate(log_returns: numpy.ndarray) -> None:
+        """Accumulate daily log-returns into cumulative ones in place, along the day axis, in double precision."""
+        if log_returns.dtype == numpy.float64:
+            numpy.cumsum(log_returns, axis=0, out=log_returns)
+            return
 
-        # Business day future timeline (skip weekends)
-        future_dates = bdate_range(start=start_date + Timedelta(days=1), periods=forecast_length)
-        future_timestamps = [int(date.timestamp() * 1000) for date in future_dates]
+        # A mixed-precision cumsum converts the whole block; a running double-precision day only needs one row.
+        running = numpy.zeros(log_returns.shape[1], dtype=numpy.float64)
+        for day in log_returns:
+            running += day
+            day[...] = running
 
-        average_daily_move: float = float(returns.mean())
-        standard_deviation: float = float(returns.std(ddof=1))
+    def __sobol_normals(self, chunk: _Chunk, root: SeedSequence, forecast_length: int) -> numpy.ndarray:
+        """Standard normals from the chunk's slice of the run's scrambled Sobol sequence, one dimension per row.
 
-        all_simulations: numpy.ndarray = numpy.zeros((simulation_count, forecast_length), dtype=float)
+        Every chunk rebuilds the same scrambled sequence from the run's seed and skips ahead to its first path, so the
+        chunks partition a single sequence however they are spread over the workers.
+        """
+        # Seeded from the root's state, which unlike the root itself is not advanced by being used.
+        engine = self.__qmc.Sobol(forecast_length, scramble=True, rng=default_rng(root.generate_state(4)))
+        if chunk.start:
+            engine.fast_forward(chunk.start)
+        with warnings.catch_warnings():
+            # Chunks are consecutive slices of one sequence: the balance of the run as a whole is what matters.
+            warnings.simplefilter('ignore', UserWarning)
+            points = numpy.clip(engine.random(chunk.size), self.__EPSILON, 1 - self.__EPSILON)
 
-        for sim in range(simulation_count):
-            price: float = last_price
-            for day in range(forecast_length):
-                shock: float = numpy.random.normal(average_daily_move, standard_deviation)
-                price = price * numpy.exp(shock)
-                all_simulations[sim, day] = price
+        return numpy.ascontiguousarray(self.__special.ndtri(points).T)
 
-        median_prices = numpy.median(all_simulations, axis=0)
-        lower_prices = numpy.percentile(all_simulations, self.LOWER_PERCENTIL, axis=0)
-        upper_prices = numpy.percentile(all_simulations, self.UPPER_PERCENTIL, axis=0)
+    @staticmethod
+    def __brownian_bridge(normals: numpy.ndarray, out: numpy.ndarray) -> None:
+        """Build standard Brownian paths into ``out``, laid out day-major like the normals.
 
-        median = [(date, round(float(p), 2)) for date, p in zip(future_timestamps, median_prices, strict=True)]
-        lower = [(date, round(float(p), 2)) for date, p in zip(future_timestamps, lower_prices, strict=True)]
-        upper = [(date, round(float(p), 2)) for date, p in zip(future_timestamps, upper_prices, strict=True)]
+        The last day comes from the first row of ``normals``, then each midpoint of an interval already built from the
+        next row, coarsest intervals first.
+        """
+        days = normals.shape[0]
+        out[-1] = normals[0] * numpy.sqrt(days)
+        intervals = [(0, days)]
+        row = 1
 
-        return Forecast(stock, upper, median, lower)
+        for left, right in intervals:
+            if right - left < 2:
+                continue
+            middle = (left + right) // 2
+            start = out[left - 1] if left else 0.0
+            spread = numpy.sqrt((middle - left) * (right - middle) / (right - left))
+            out[middle - 1] = start + (out[right - 1] - start) * ((middle - left) / (right - left))
+            out[middle - 1] += spread * normals[row]
+            row += 1
+            intervals += [(left, middle), (middle, right)]
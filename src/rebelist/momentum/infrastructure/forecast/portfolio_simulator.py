@@ -0,0 +1,153 @@
+from collections.abc import Sequence
+from functools import reduce
+from typing import Final
+
+import numpy as numpy
+from numpy.random import SeedSequence, default_rng
+
+from rebelist.momentum.domain import Forecast, PortfolioForecast, PortfolioSimulator, Stock
+from rebelist.momentum.infrastructure.forecast.quantile_sketch import QuantileSketch
+from rebelist.momentum.infrastructure.forecast.trading_calendar import calendar_for
+
+
+class CorrelatedMonteCarloSimulator(PortfolioSimulator):
+    """Monte Carlo simulator for a buy-and-hold basket of stocks with correlated daily shocks.
+
+    The mean and covariance of the daily log-returns are estimated over the dates all histories have in common. Shocks
+    for every asset are drawn in bulk and correlated through a Cholesky factor of the covariance, chunk by chunk, so
+    the cost grows with the number of assets instead of looping over them. The basket starts at ``INITIAL_VALUE``
+    split by weight; prices are taken as quoted, without currency conversion. Optional per-asset bands are estimated
+    with quantile sketches, keeping memory independent of the number of assets times paths.
+    """
+
+    LOWER_PERCENTIL: Final[int] = 10
+    UPPER_PERCENTIL: Final[int] = 90
+    INITIAL_VALUE: Final[float] = 100.0
+    SKETCH_RANGE_DEVIATIONS: Final[float] = 8.0
+    DAY_MILLISECONDS: Final[int] = 86_400_000
+
+    def __init__(self, chunk_size: int = 4_096, relative_accuracy: float = 0.002) -> None:
+        if chunk_size < 1:
+            raise ValueError('The chunk size must be a positive number of paths.')
+
+        self.__chunk_size = chunk_size
+        self.__relative_accuracy = relative_accuracy
+
+    def simulate(
+        self,
+        stocks: Sequence[Stock],
+        weights: Sequence[float],
+        simulation_count: int,
+        forecast_length: int,
+        seed: int | None = None,
+        include_assets: bool = False,
+    ) -> PortfolioForecast:
+        """Perform correlated Monte Carlo simulations of the basket and calculate median and percentile bands."""
+        if not stocks:
+            raise ValueError('The portfolio has no stocks.')
+        if len(weights) != len(stocks):
+            raise ValueError('Every stock in the portfolio needs exactly one weight.')
+
+        allocation = numpy.asarray(weights, dtype=numpy.float64)
+        if numpy.any(allocation < 0) or allocation.sum() <= 0:
+            raise ValueError('Portfolio weights must be non-negative and not all zero.')
+        allocation = allocation / allocation.sum()
+
+        last_timestamp, prices = self.__align(stocks)
+        returns = numpy.diff(numpy.log(prices), axis=0)
+        average_daily_moves = returns.mean(axis=0)
+        factor = self.__factorize(numpy.atleast_2d(numpy.cov(returns, rowvar=False, ddof=1)))
+
+        # A basket spanning several exchanges is forecast on every weekday.
+        exchanges = {stock.exchange for stock in stocks}
+        exchange = exchanges.pop() if len(exchanges) == 1 else None
+        future_timestamps = calendar_for(exchange).following(last_timestamp, forecast_length)
+        percentiles = (self.LOWER_PERCENTIL, 50, self.UPPER_PERCENTIL)
+
+        values = numpy.empty((forecast_length, simulation_count), dtype=numpy.float64)
+        # Without per-asset bands there are no sketches, which also leaves the per-asset loops below empty.
+        sketches = [
+            self.__create_sketch(float(average_daily_moves[asset]), factor[asset], forecast_length)
+            for asset in range(len(stocks) if include_assets else 0)
+        ]
+
+        starts = range(0, simulation_count, self.__chunk_size)
+        for start, chunk_seed in zip(starts, SeedSequence(seed).spawn(len(starts)), strict=True):
+            path_count = min(self.__chunk_size, simulation_count - start)
+            log_paths = self.__simulate_log_paths(chunk_seed, average_daily_moves, factor, path_count, forecast_length)
+
+            for asset, sketch in enumerate(sketches):
+                sketch.update(log_paths[:, :, asset])
+
+            numpy.exp(log_paths, out=log_paths)
+            numpy.matmul(log_paths, allocation * self.INITIAL_VALUE, out=values[:, start : start + path_count])
+
+        lower, median, upper = numpy.round(numpy.percentile(values, percentiles, axis=1), 2)
+
+        assets: list[Forecast] = []
+        for stock, sketch, last_price in zip(stocks, sketches, prices[-1], strict=False):
+            asset_lower, asset_median, asset_upper = numpy.round(
+                float(last_price) * numpy.exp(sketch.quantiles([percentile / 100 for percentile in percentiles])), 2
+            )
+            assets.append(Forecast(stock, future_timestamps, asset_upper, asset_median, asset_lower))
+
+        return PortfolioForecast(list(stocks), allocation, future_timestamps, upper, median, lower, assets)
+
+    def __align(self, stocks: Sequence[Stock]) -> tuple[int, numpy.ndarray]:
+        """Align the histories on the trading dates they share, as a (dates, assets) price matrix.
+
+        Bars are matched by calendar date rather than by timestamp, since exchanges stamp their daily bars at local
+        midnight; shifting by half a day before flooring maps every UTC offset within twelve hours to its own date.
+        """
+        histories: list[tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]] = []
+        for stock in stocks:
+            if stock.prices.size == 0:
+                raise ValueError(f"The stock '{stock.ticker}' has no price history.")
+            days = (stock.timestamps + self.DAY_MILLISECONDS // 2) // self.DAY_MILLISECONDS
+            histories.append((days, stock.timestamps, stock.prices))
+
+        dates: numpy.ndarray = reduce(numpy.intersect1d, (days for days, _, _ in histories))
+        if dates.size < 3:
+            raise ValueError('The stocks share too little price history to estimate their correlation.')
+
+        prices = numpy.column_stack([closes[numpy.searchsorted(days, dates)] for days, _, closes in histories])
+        first_days, first_timestamps, _ = histories[0]
+        last_timestamp = int(first_timestamps[numpy.searchsorted(first_days, dates[-1])])
+
+        return last_timestamp, prices
+
+    @staticmethod
+    def __factorize(covariance: numpy.ndarray) -> numpy.ndarray:
+        """Square-root factor of the covariance: Cholesky, or a clipped eigendecomposition when it is singular."""
+        try:
+            return numpy.linalg.cholesky(covariance)
+        except numpy.linalg.LinAlgError:
+            eigenvalues, eigenvectors = numpy.linalg.eigh(covariance)
+            return eigenvectors * numpy.sqrt(numpy.clip(eigenvalues, 0, None))
+
+    def __create_sketch(
+        self, average_daily_move: float, loadings: numpy.ndarray, forecast_length: int
+    ) -> QuantileSketch:
+        """Create a quantile sketch whose range covers the expected spread of one asset's cumulative log-returns."""
+        days = numpy.arange(1, forecast_length + 1, dtype=numpy.float64)
+        spread = self.SKETCH_RANGE_DEVIATIONS * float(numpy.linalg.norm(loadings)) * numpy.sqrt(days)
+
+        return QuantileSketch(
+            average_daily_move * days - spread, average_daily_move * days + spread, self.__relative_accuracy
+        )
+
+    @staticmethod
+    def __simulate_log_paths(
+        seed: SeedSequence,
+        average_daily_moves: numpy.ndarray,
+        factor: numpy.ndarray,
+        path_count: int,
+        forecast_length: int,
+    ) -> numpy.ndarray:
+        """Generate correlated cumulative log-returns, laid out as (forecast_length, path_count, assets)."""
+        shocks = default_rng(seed).standard_normal((forecast_length, path_count, factor.shape[0]))
+        log_paths = shocks @ factor.T
+        log_paths += average_daily_moves
+        numpy.cumsum(log_paths, axis=0, out=log_paths)
+
+        return log_paths
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as numpy
+
+
+class QuantileSketch:
+    """Mergeable per-day quantile sketch over log-values, with a bounded relative error.
+
+    Every forecast day owns a row of equally wide buckets laid over a fixed log-value range. A bucket spans
+    ``2 * log1p(relative_accuracy)`` in log space and a quantile is answered with the log-space midpoint of the bucket
+    holding its rank, so once exponentiated the estimate lies within a factor of ``1 + relative_accuracy`` of the exact
+    order statistic. Values outside the range are clamped into the edge buckets; this only affects the estimate of a
+    quantile whose rank falls within the clamped mass. Memory depends on the number of days and buckets, never on the
+    number of values fed into the sketch.
+    """
+
+    def __init__(self, lower: numpy.ndarray, upper: numpy.ndarray, relative_accuracy: float) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('The relative accuracy must be between 0 and 1.')
+
+        self.__lower = numpy.asarray(lower, dtype=numpy.float64)
+        self.__width = 2 * math.log1p(relative_accuracy)
+        spread = float(numpy.max(numpy.asarray(upper, dtype=numpy.float64) - self.__lower, initial=0.0))
+        self.__bucket_count = int(math.ceil(spread / self.__width)) + 1
+
+        days = self.__lower.shape[0]
+        self.__counts = numpy.zeros((days, self.__bucket_count), dtype=numpy.int64)
+        self.__minimum = numpy.full(days, numpy.inf)
+        self.__maximum = numpy.full(days, -numpy.inf)
+        self.__row_offsets = (numpy.arange(days, dtype=numpy.int64) * self.__bucket_count)[:, numpy.newaxis]
+
+    @property
+    def count(self) -> int:
+        """Number of values fed into each day of the sketch."""
+        return int(self.__counts[0].sum()) if self.__counts.shape[0] else 0
+
+    def update(self, values: numpy.ndarray) -> None:
+        """Add a day-major (days, samples) block of log-values to the sketch."""
+        buckets = numpy.floor((values - self.__lower[:, numpy.newaxis]) / self.__width).astype(numpy.int64)
+        numpy.clip(buckets, 0, self.__bucket_count - 1, out=buckets)
+        buckets += self.__row_offsets
+
+        self.__counts += numpy.bincount(buckets.ravel(), minlength=self.__counts.size).reshape(self.__counts.shape)
+        numpy.minimum(self.__minimum, values.min(axis=1), out=self.__minimum)
+        numpy.maximum(self.__maximum, values.max(axis=1), out=self.__maximum)
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Fold another sketch built over the same range and accuracy into this one."""
+        if self.__counts.shape != other.__counts.shape or self.__width != other.__width:
+            raise ValueError('Only sketches with the same layout can be merged.')
+
+        self.__counts += other.__counts
+        numpy.minimum(self.__minimum, other.__minimum, out=self.__minimum)
+        numpy.maximum(self.__maximum, other.__maximum, out=self.__maximum)
+
+    def quantiles(self, probabilities: Sequence[float]) -> numpy.ndarray:
+        """Estimate the given quantiles for every day, returned as a (len(probabilities), days) array of log-values."""
+        count = self.count
+        if count == 0:
+            raise ValueError('The sketch is empty.')
+
+        cumulative = numpy.cumsum(self.__counts, axis=1)
+        estimates = numpy.empty((len(probabilities), self.__counts.shape[0]), dtype=numpy.float64)
+
+        for row, probability in enumerate(probabilities):
+            rank = probability * (count - 1)
+            buckets = (cumulative <= rank).sum(axis=1)
+            estimates[row] = self.__lower + (buckets + 0.5) * self.__width
+
+        return numpy.clip(estimates, self.__minimum, self.__maximum)
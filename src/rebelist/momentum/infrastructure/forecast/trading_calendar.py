@@ -0,0 +1,189 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import cache
+from threading import Lock
+from typing import Final
+
+import numpy
+
+_DAY_MS: Final[int] = 86_400_000
+
+
+def _easter(year: int) -> date:
+    """Western Easter Sunday, by the anonymous Gregorian algorithm."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    weekday = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * weekday) // 451
+    month, day = divmod(h + weekday - 7 * m + 114, 31)
+
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th given weekday (Monday is 0) of the month, counting from the end when n is negative."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _nearest_weekday(day: date) -> date:
+    """A Saturday holiday is observed on the Friday before, a Sunday one on the Monday after."""
+    return day + timedelta(days={5: -1, 6: 1}.get(day.weekday(), 0))
+
+
+def _next_weekday(day: date) -> date:
+    """A weekend holiday is observed on the Monday after."""
+    return day + timedelta(days={5: 2, 6: 1}.get(day.weekday(), 0))
+
+
+def _new_york(year: int) -> list[date]:
+    """NYSE and Nasdaq full-day closures; one-off closures, such as days of mourning, are not included."""
+    easter = _easter(year)
+    holidays = [
+        easter - timedelta(days=2),
+        _nth_weekday(year, 2, 0, 3),
+        _nth_weekday(year, 5, 0, -1),
+        _nearest_weekday(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),
+        _nth_weekday(year, 11, 3, 4),
+        _nearest_weekday(date(year, 12, 25)),
+    ]
+    # A New Year's Day on a Saturday is not observed, since the Friday before closes the previous year.
+    if date(year, 1, 1).weekday() != 5:
+        holidays.append(_nearest_weekday(date(year, 1, 1)))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))
+    if year >= 2022:
+        holidays.append(_nearest_weekday(date(year, 6, 19)))
+
+    return holidays
+
+
+def _london(year: int) -> list[date]:
+    """London Stock Exchange closures: the bank holidays of England and Wales, without the one-off ones."""
+    easter = _easter(year)
+    christmas = _next_weekday(date(year, 12, 25))
+
+    return [
+        _next_weekday(date(year, 1, 1)),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        _nth_weekday(year, 5, 0, 1),
+        _nth_weekday(year, 5, 0, -1),
+        _nth_weekday(year, 8, 0, -1),
+        christmas,
+        _next_weekday(max(date(year, 12, 26), christmas + timedelta(days=1))),
+    ]
+
+
+def _frankfurt(year: int) -> list[date]:
+    """Xetra and Frankfurt closures; holidays on a weekend are not moved."""
+    easter = _easter(year)
+
+    return [
+        date(year, 1, 1),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        date(year, 5, 1),
+        date(year, 12, 24),
+        date(year, 12, 25),
+        date(year, 12, 26),
+        date(year, 12, 31),
+    ]
+
+
+def _no_holidays(year: int) -> list[date]:
+    return []
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeRules:
+    """Which weekdays an exchange trades on, Monday first, and its holidays in a given year."""
+
+    weekmask: str
+    holidays: Callable[[int], list[date]]
+
+
+RULES: Final[dict[str, ExchangeRules]] = {
+    'XNYS': ExchangeRules('1111100', _new_york),
+    'XNAS': ExchangeRules('1111100', _new_york),
+    'XLON': ExchangeRules('1111100', _london),
+    'XETR': ExchangeRules('1111100', _frankfurt),
+    'XFRA': ExchangeRules('1111100', _frankfurt),
+}
+WEEKDAYS: Final[ExchangeRules] = ExchangeRules('1111100', _no_holidays)
+
+
+class TradingCalendar:
+    """Trading days of one exchange, precomputed as a sorted array of epoch-millisecond timestamps.
+
+    The days of a window of years are computed once from the exchange's rules and kept as the UTC midnights of their
+    dates, so the trading days following a bar are a ``searchsorted`` and a slice. The window starts ``PAST_YEARS``
+    before the current year and ends ``FUTURE_YEARS`` after it; requests beyond it grow the window, once.
+    """
+
+    PAST_YEARS: Final[int] = 10
+    FUTURE_YEARS: Final[int] = 10
+
+    def __init__(self, rules: ExchangeRules) -> None:
+        self.__rules = rules
+        self.__lock = Lock()
+        year = datetime.now(timezone.utc).year
+        self.__first_year = year - self.PAST_YEARS
+        self.__last_year = year + self.FUTURE_YEARS
+        self.__days = self.__trading_days(self.__first_year, self.__last_year)
+
+    def following(self, timestamp: int, count: int) -> numpy.ndarray:
+        """The next ``count`` trading days after the date of the bar at ``timestamp``, as UTC-midnight timestamps.
+
+        Daily bars are stamped at the exchange's local midnight, which is within half a day of the UTC midnight of
+        the same date, so the bar's date is that of the nearest UTC midnight.
+        """
+        day = (timestamp + _DAY_MS // 2) // _DAY_MS * _DAY_MS
+        days = self.__days
+        start = int(numpy.searchsorted(days, day, side='right'))
+        if start == 0 or start + count > days.size:
+            days = self.__cover(day, count)
+            start = int(numpy.searchsorted(days, day, side='right'))
+
+        return days[start : start + count]
+
+    def __cover(self, day: int, count: int) -> numpy.ndarray:
+        """Grow the window to cover the date and the trading days after it."""
+        year = datetime.fromtimestamp(day / 1000, timezone.utc).year
+        with self.__lock:
+            self.__first_year = min(self.__first_year, year - 1)
+            # Every exchange trades on more than half the days of a year.
+            self.__last_year = max(self.__last_year, year + 1 + 2 * count // 365)
+            self.__days = self.__trading_days(self.__first_year, self.__last_year)
+
+            return self.__days
+
+    def __trading_days(self, first_year: int, last_year: int) -> numpy.ndarray:
+        years = range(first_year, last_year + 1)
+        holidays = numpy.array([day for year in years for day in self.__rules.holidays(year)], dtype='datetime64[D]')
+        dates = numpy.arange(f'{first_year}-01-01', f'{last_year + 1}-01-01', dtype='datetime64[D]')
+        trading = numpy.is_busday(dates, weekmask=self.__rules.weekmask, holidays=holidays)
+
+        days = dates[trading].astype('datetime64[ms]').astype(numpy.int64)
+        days.flags.writeable = False
+        return days
+
+
+def calendar_for(exchange: str | None) -> TradingCalendar:
+    """The calendar of an exchange, by ISO 10383 market identifier; unknown exchanges trade every weekday."""
+    return _calendar(RULES.get(exchange or '', WEEKDAYS))
+
+
+@cache
+def _calendar(rules: ExchangeRules) -> TradingCalendar:
+    """One calendar per set of rules, shared by every exchange that follows them."""
+    return TradingCalendar(rules)
@@ -0,0 +1,26 @@
+from collections.abc import Callable, Mapping
+from importlib import import_module
+from typing import Any
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Module ``__getattr__`` and ``__dir__`` (PEP 562) importing each export from its submodule on first access.
+
+    Args:
+        package: Name of the package exporting the names, usually ``__name__``.
+        exports: Exported name to the submodule of the package that defines it.
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        if name not in exports:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+        value = getattr(import_module(f'{package}.{exports[name]}'), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from rebelist.momentum.application.use_cases import GetStockForecastUseCase
+from rebelist.momentum.config import Container
+from rebelist.momentum.domain import ProviderError
+from rebelist.momentum.presentation.writers import BatchResult, open_writer
+
+_use_case: GetStockForecastUseCase | None = None
+
+
+def read_symbols(lines: Iterable[str]) -> list[str]:
+    """Ticker symbols from a one-per-line list, skipping blank lines, ``#`` comments and repeats."""
+    symbols = (line.split('#', 1)[0].strip().upper() for line in lines)
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    """Forecast every ticker of a list in a process pool, streaming each result to the output as it finishes."""
+    parser = argparse.ArgumentParser(prog='momentum-forecast', description='Headless batch stock forecasting.')
+    parser.add_argument('tickers', type=Path, help='file with one ticker symbol per line, or - for stdin')
+    parser.add_argument('-o', '--output', type=Path, default=Path('-'), help='output file, or - for stdout')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv', 'parquet'), help='default: from the extension')
+    parser.add_argument('-n', '--simulations', type=int, default=1_000, help='simulated paths per ticker')
+    parser.add_argument('-d', '--days', type=int, default=200, help='business days to forecast')
+    parser.add_argument('-s', '--seed', type=int, help='seed for reproducible forecasts')
+    parser.add_argument('-p', '--processes', type=int, default=os.cpu_count() or 1, help='worker processes')
+    options = parser.parse_args(arguments)
+
+    if str(options.tickers) == '-':
+        symbols = read_symbols(sys.stdin)
+    else:
+        with open(options.tickers) as tickers:
+            symbols = read_symbols(tickers)
+    if not symbols:
+        parser.error('the ticker list is empty')
+
+    output_format: str = options.format or {'.csv': 'csv', '.parquet': 'parquet'}.get(options.output.suffix, 'jsonl')
+    failures = 0
+
+    with (
+        open_writer(options.output, output_format) as writer,
+        ProcessPoolExecutor(min(options.processes, len(symbols)), initializer=_initialize) as pool,
+    ):
+        futures = [
+            pool.submit(_forecast, symbol, options.simulations, options.days, options.seed) for symbol in symbols
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            writer.write(result)
+            if result.error is not None:
+                failures += 1
+                print(f'{result.symbol}: {result.error}', file=sys.stderr)
+
+    print(f'{len(symbols) - failures} of {len(symbols)} tickers forecast.', file=sys.stderr)
+    return 0 if failures < len(symbols) else 1
+
+
+def _initialize() -> GetStockForecastUseCase:
+    """Build one use case per worker process, single-threaded so the processes are what scales with the cores."""
+    global _use_case
+
+    container = Container()
+    container.config.simulator.workers.from_value(1)
+    container.config.forecast_cache.mode.from_value('disabled')
+    _use_case = container.get_stock_forecast_use_case()
+    return _use_case
+
+
+def _forecast(symbol: str, simulation_count: int, forecast_length: int, seed: int | None) -> BatchResult:
+    """Forecast one ticker in a worker process, turning per-ticker failures into a result instead of an error."""
+    use_case = _use_case or _initialize()
+
+    try:
+        return BatchResult(symbol, forecast=use_case(symbol, simulation_count, forecast_length, seed))
+    except (ProviderError, ValueError) as error:
+        return BatchResult(symbol, error=str(error))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
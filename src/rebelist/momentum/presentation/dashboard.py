@@ -1,13 +1,35 @@
-from nicegui import ui
+from fastapi import Response
+from nicegui import app, ui
 
-from rebelist.momentum.config import Container
+from rebelist.momentum.config import get_container, warm_up
+from rebelist.momentum.domain import MaximumDrawdown, TerminalDistribution
 from rebelist.momentum.presentation.models import Dashboard
+from rebelist.momentum.presentation.runner import ForecastRunner
+from rebelist.momentum.telemetry import prometheus
+
+runner = ForecastRunner()
+
+
+def prepare() -> None:
+    """Warm the process up before it accepts connections, unless the configuration opts out."""
+    container = get_container()
+    if container.config.warmup.enabled():
+        warm_up(container)
+
+
+app.on_startup(prepare)
+
+
+@app.get('/metrics')
+def metrics() -> Response:
+    """Expose the per-stage telemetry histograms for Prometheus."""
+    return Response(prometheus.render(get_container().telemetry()), media_type=prometheus.CONTENT_TYPE)
 
 
 @ui.page('/')
 def index() -> None:
     """Define the dashboard page layout."""
-    container = Container()
+    container = get_container()
     use_case = container.get_stock_forecast_use_case()
 
     with ui.header().classes('items-center bg-blue-100'):
@@ -22,12 +44,30 @@ def index() -> None:
             'ml-4 w-[120px]'
         )
         forecast_length = ui.number(label='Forecast Days', min=30, max=600, value=200, step=1).classes('ml-4 w-[120px]')
+        target = ui.number(label='Target Price', min=0, format='%.2f').classes('ml-4 w-[120px]')
         title = ui.label().classes('ml-[50px] text-xl text-bold text-gray-400')
+        activity = ui.spinner(size='md')
+        activity.set_visibility(False)
 
     submit = ui.button('Run Simulation')
+    summary = ui.label().classes('text-gray-600')
     chart = ui.column().classes('w-full h-[700px]')
 
-    dashboard = Dashboard(ticker, title, simulation_count, forecast_length, chart, use_case)
+    dashboard = Dashboard(
+        ticker,
+        title,
+        simulation_count,
+        forecast_length,
+        chart,
+        use_case,
+        runner,
+        telemetry=container.telemetry(),
+        progressive=True,
+        analytics=(MaximumDrawdown(), TerminalDistribution()),
+        target=target,
+        summary=summary,
+        activity=activity,
+    )
     ticker.on('keydown.enter', dashboard.update)
     submit.on('click', dashboard.update)
 
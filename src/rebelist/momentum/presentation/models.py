@@ -1,18 +1,48 @@
-from dataclasses import dataclass
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, cast
 
+import numpy
 from nicegui import ui
 from nicegui.elements.column import Column
 from nicegui.elements.input import Input
 from nicegui.elements.label import Label
 from nicegui.elements.number import Number
+from nicegui.elements.spinner import Spinner
+from nicegui_highcharts.highchart import Highchart
 
 from rebelist.momentum.application.use_cases import GetStockForecastUseCase
-from rebelist.momentum.domain import Forecast, ProviderError
+from rebelist.momentum.domain import (
+    Distribution,
+    Forecast,
+    HitProbability,
+    MaximumDrawdown,
+    PathReducer,
+    ProviderError,
+    TerminalDistribution,
+)
+from rebelist.momentum.presentation.runner import ForecastRunner
+from rebelist.momentum.presentation.series import compact, day_labels, downsample
+from rebelist.momentum.telemetry import Telemetry
 
 
 @dataclass(frozen=True, slots=True)
 class Dashboard:
-    """UI Dashboard elements."""
+    """UI Dashboard elements.
+
+    ``plot`` holds the chart once it is drawn, so that later forecasts update its series in place. Its x axis counts
+    trading days, labelled with their dates, so that the bands are sent as bare values rather than (date, price) pairs
+    whenever they are not downsampled to ``MAX_CHART_POINTS``.
+
+    Forecasts are requested with the ``analytics`` path reducers, and the probability of touching the ``target`` price
+    when one is entered; their results are summarised in the ``summary`` label. The ``activity`` spinner is shown
+    while any update is pending. Forecasts drawn with a ``seed`` share their paths with the longer forecasts of the
+    same stock and simulation count, so the simulator can slice them rather than simulate them again.
+    """
+
+    MAX_CHART_POINTS: ClassVar[int] = 200
+    TRADING_DAYS_PER_MONTH: ClassVar[int] = 21
 
     ticker: Input
     title: Label
@@ -20,69 +50,147 @@ class Dashboard:
     forecast_length: Number
     chart: Column
     get_stock_forecast: GetStockForecastUseCase
+    runner: ForecastRunner
+    pending: set[asyncio.Task[Any]] = field(default_factory=set[asyncio.Task[Any]])
+    telemetry: Telemetry = field(default_factory=lambda: Telemetry(enabled=False))
+    progressive: bool = False
+    plot: list[Highchart] = field(default_factory=list[Highchart])
+    analytics: tuple[PathReducer, ...] = ()
+    target: Number | None = None
+    summary: Label | None = None
+    activity: Spinner | None = None
+    seed: int | None = None
+
+    async def update(self) -> None:
+        """Updates the chart based on UI settings, without blocking the event loop while the forecast runs.
 
-    def update(self) -> None:
-        """Updates the chart based on UI settings."""
+        A new update cancels the one still pending, so only the latest request ends up on the chart. In progressive
+        mode every intermediate estimate is drawn as it arrives, refining the chart in place.
+        """
         if not self.validate():
             return
 
-        self.chart.clear()
+        for task in self.pending:
+            task.cancel()
+        current = cast(asyncio.Task[Any], asyncio.current_task())
+        self.pending.add(current)
+        if self.activity is not None:
+            self.activity.set_visibility(True)
 
+        if not self.plot:
+            self.chart.clear()
+            with self.chart:
+                ui.spinner(size='xl').classes('self-center mt-[200px]')
+
+        arguments = (str(self.ticker.value).upper(), int(self.simulation_count.value), int(self.forecast_length.value))
+        reducers = self.reducers()
         try:
-            forecast: Forecast = self.get_stock_forecast(
-                str(self.ticker.value).upper(), int(self.simulation_count.value), int(self.forecast_length.value)
-            )
+            if self.progressive:
+                async for estimate in self.runner.stream(self.get_stock_forecast, *arguments, reducers, self.seed):
+                    self.render(estimate, reducers)
+            else:
+                forecast = await self.runner.run(self.get_stock_forecast, *arguments, reducers, self.seed)
+                self.render(forecast, reducers)
         except ProviderError as error:
+            self.chart.clear()
+            self.plot.clear()
             ui.notify(f'ERROR: {error}', color='red')
-            return
+        finally:
+            self.pending.discard(current)
+            if self.activity is not None and not self.pending:
+                self.activity.set_visibility(False)
 
+    def reducers(self) -> tuple[PathReducer, ...]:
+        """The path reducers to request: the configured analytics, and the target price when one is entered."""
+        target = self.target.value if self.target is not None else None
+        return (*self.analytics, HitProbability(float(target))) if target else self.analytics
+
+    def render(self, forecast: Forecast, reducers: Sequence[PathReducer] = ()) -> None:
+        """Draw the forecast, updating the series of the chart already shown rather than building a new one."""
         self.title.text = forecast.stock.name
+        if self.summary is not None:
+            self.summary.text = self.describe(forecast, reducers)
 
-        with self.chart:
-            ui.highchart(
+        with self.telemetry.span('dashboard.chart'):
+            # Bands share their days, so one set of indices picked on the median keeps them aligned.
+            days = numpy.arange(forecast.timestamps.size, dtype=numpy.int64)
+            selected = downsample(days, forecast.median, self.MAX_CHART_POINTS)
+            positions = days[selected]
+            series: list[dict[str, Any]] = [
                 {
-                    'chart': {'type': 'area', 'height': 700},
-                    'title': False,
-                    'credits': {'enabled': False},
-                    'xAxis': {
-                        'type': 'datetime',
-                        'tickInterval': 30 * 24 * 3600 * 1000,  # ~1 month
-                        'dateTimeLabelFormats': {
-                            'month': '%b %Y',
-                            'year': '%b %Y',
-                        },
-                    },
-                    'yAxis': {
-                        'title': {'text': 'Price'},
-                    },
-                    'tooltip': {'valueSuffix': f' {forecast.stock.currency}'},
-                    'plotOptions': {
-                        'area': {'lineWidth': 2, 'fillOpacity': 0.3},
-                        'line': {'lineWidth': 2},
-                    },
-                    'series': [
-                        {
-                            'name': 'Upper',
-                            'data': forecast.upper,
-                            'type': 'area',
-                            'color': 'rgba(50,200,50,0.3)',
-                            'showInLegend': True,
-                        },
-                        {
-                            'name': 'Median',
-                            'data': forecast.median,
-                            'color': 'rgba(50,50,200,0.3)',
+                    'name': 'Upper',
+                    **compact(positions, forecast.upper[selected]),
+                    'type': 'area',
+                    'color': 'rgba(50,200,50,0.3)',
+                    'showInLegend': True,
+                },
+                {
+                    'name': 'Median',
+                    **compact(positions, forecast.median[selected]),
+                    'color': 'rgba(50,50,200,0.3)',
+                },
+                {
+                    'name': 'Lower',
+                    **compact(positions, forecast.lower[selected]),
+                    'type': 'area',
+                    'color': 'rgba(200,50,50,0.4)',
+                    'showInLegend': True,
+                },
+            ]
+            tooltip = {'valueSuffix': f' {forecast.stock.currency}'}
+            x_axis = {
+                'categories': day_labels(forecast.timestamps),
+                'tickInterval': self.TRADING_DAYS_PER_MONTH,
+            }
+
+            if self.plot:
+                plot = self.plot[0]
+                plot.options['xAxis'] = x_axis
+                plot.options['series'] = series
+                plot.options['tooltip'] = tooltip
+                plot.update()
+                return
+
+            self.chart.clear()
+            with self.chart:
+                plot = ui.highchart(
+                    {
+                        'chart': {'type': 'area', 'height': 700},
+                        'title': False,
+                        'credits': {'enabled': False},
+                        'xAxis': x_axis,
+                        'yAxis': {
+                            'title': {'text': 'Price'},
                         },
-                        {
-                            'name': 'Lower',
-                            'data': forecast.lower,
-                            'type': 'area',
-                            'color': 'rgba(200,50,50,0.4)',
-                            'showInLegend': True,
+                        'tooltip': tooltip,
+                        'plotOptions': {
+                            'area': {'lineWidth': 2, 'fillOpacity': 0.3},
+                            'line': {'lineWidth': 2},
                         },
-                    ],
-                }
-            ).classes('w-full h-[700px]')
+                        'series': series,
+                    }
+                ).classes('w-full h-[700px]')
+            self.plot.append(plot)
+
+    @staticmethod
+    def describe(forecast: Forecast, reducers: Sequence[PathReducer]) -> str:
+        """One line summarising the analytics the forecast was requested with."""
+        currency = forecast.stock.currency
+        parts: list[str] = []
+
+        for reducer in reducers:
+            statistic = forecast.analytics.get(reducer.name)
+            if isinstance(reducer, HitProbability) and isinstance(statistic, float):
+                parts.append(f'Chance to touch {reducer.target:,.2f} {currency}: {statistic:.0%}')
+            elif isinstance(reducer, MaximumDrawdown) and isinstance(statistic, Distribution):
+                parts.append(f'Median maximum drawdown: {statistic.quantile(0.5):.0%}')
+            elif isinstance(reducer, TerminalDistribution) and isinstance(statistic, Distribution):
+                last_price = float(forecast.stock.prices[-1])
+                parts.append(
+                    f'Chance to end above {last_price:,.2f} {currency}: {1 - statistic.cumulative(last_price):.0%}'
+                )
+
+        return ' · '.join(parts)
 
     def validate(self) -> bool:
         """Validates the dashboard."""
@@ -0,0 +1,162 @@
+import asyncio
+from collections.abc import AsyncGenerator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from rebelist.momentum.application.use_cases import GetStockForecastUseCase
+from rebelist.momentum.domain import Forecast, PathReducer
+
+_Key = tuple[str, int, int, tuple[PathReducer, ...], int | None]
+
+
+@dataclass(slots=True, eq=False)
+class _Run:
+    """One forecast computed in the worker pool, and the number of requests awaiting it."""
+
+    future: asyncio.Future[Forecast]
+    waiters: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class _Broadcast:
+    """The latest estimate of one progressive forecast, shared by all its consumers.
+
+    ``changed`` is set, and replaced, whenever a new estimate arrives or the forecast ends; ``wanted`` is set by a
+    consumer waiting for the next estimate, which is only computed then.
+    """
+
+    estimate: Forecast | None = None
+    version: int = 0
+    finished: bool = False
+    error: Exception | None = None
+    consumers: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    wanted: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task[None] | None = None
+
+
+class ForecastRunner:
+    """Runs forecasts in a worker pool off the event loop, sharing one computation between identical requests.
+
+    Concurrent requests for the same symbol, simulation count, forecast length, path reducers and seed await the same
+    in-flight run. Cancelling a waiter only detaches that waiter; the shared run keeps going for everyone else, and is
+    cancelled with its last waiter, so a run still queued behind others never takes a worker.
+
+    Progressive forecasts are streamed one estimate at a time, and shared the same way: a consumer joining a stream in
+    flight starts from its latest estimate. The next estimate is computed once a consumer asks for it, and the
+    simulation stops after the batch in progress when every consumer has stopped.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.__executor = ThreadPoolExecutor(workers, thread_name_prefix='forecast')
+        self.__in_flight: dict[_Key, _Run] = {}
+        self.__streams: dict[_Key, _Broadcast] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct forecasts currently being computed."""
+        return len(self.__in_flight) + len(self.__streams)
+
+    async def run(
+        self,
+        use_case: GetStockForecastUseCase,
+        symbol: str,
+        simulation_count: int,
+        forecast_length: int,
+        reducers: Sequence[PathReducer] = (),
+        seed: int | None = None,
+    ) -> Forecast:
+        """Run the use case in the worker pool, or join an identical run that is already in flight."""
+        key: _Key = (symbol, simulation_count, forecast_length, tuple(reducers), seed)
+        run = self.__in_flight.get(key)
+
+        if run is None:
+            loop = asyncio.get_running_loop()
+            call = partial(use_case, symbol, simulation_count, forecast_length, seed=seed, reducers=key[3])
+            run = self.__in_flight[key] = _Run(loop.run_in_executor(self.__executor, call))
+            run.future.add_done_callback(lambda _: self.__forget(key, run))
+
+        run.waiters += 1
+        try:
+            return await asyncio.shield(run.future)
+        finally:
+            run.waiters -= 1
+            if not run.waiters and not run.future.done():
+                # Nobody is left to take the forecast: a new request for it starts a new run.
+                self.__forget(key, run)
+                run.future.cancel()
+
+    async def stream(
+        self,
+        use_case: GetStockForecastUseCase,
+        symbol: str,
+        simulation_count: int,
+        forecast_length: int,
+        reducers: Sequence[PathReducer] = (),
+        seed: int | None = None,
+    ) -> AsyncGenerator[Forecast, None]:
+        """Yield the progressive estimates of the use case, or of an identical stream already in flight.
+
+        Every estimate is computed in the worker pool; a consumer slower than the others skips to the latest one.
+        """
+        key: _Key = (symbol, simulation_count, forecast_length, tuple(reducers), seed)
+        broadcast = self.__streams.get(key)
+        if broadcast is None:
+            estimates = use_case.progressively(symbol, simulation_count, forecast_length, seed=seed, reducers=key[3])
+            broadcast = self.__streams[key] = _Broadcast()
+            broadcast.task = asyncio.create_task(self.__broadcast(key, broadcast, estimates))
+
+        broadcast.consumers += 1
+        seen = 0
+        try:
+            while True:
+                while broadcast.version == seen and not broadcast.finished:
+                    broadcast.wanted.set()
+                    await broadcast.changed.wait()
+
+                if broadcast.version > seen and broadcast.estimate is not None:
+                    seen = broadcast.version
+                    yield broadcast.estimate
+                elif broadcast.error is not None:
+                    raise broadcast.error
+                else:
+                    return
+        finally:
+            broadcast.consumers -= 1
+            if not broadcast.consumers and not broadcast.finished and broadcast.task is not None:
+                # Nobody is left to show the estimates: a new request for the same forecast starts a new stream.
+                if self.__streams.get(key) is broadcast:
+                    del self.__streams[key]
+                broadcast.task.cancel()
+
+    async def __broadcast(self, key: _Key, broadcast: _Broadcast, estimates: Iterator[Forecast]) -> None:
+        """Compute the estimates in the worker pool one at a time, as the consumers ask for them."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await broadcast.wanted.wait()
+                broadcast.wanted.clear()
+                forecast = await loop.run_in_executor(self.__executor, next, estimates, None)
+                if forecast is None:
+                    break
+                broadcast.estimate, broadcast.version = forecast, broadcast.version + 1
+                self.__notify(broadcast)
+        except Exception as error:
+            broadcast.error = error
+        finally:
+            broadcast.finished = True
+            if self.__streams.get(key) is broadcast:
+                del self.__streams[key]
+            self.__notify(broadcast)
+
+    def __forget(self, key: _Key, run: _Run) -> None:
+        """Stop sharing the run with new requests, unless a newer run of the same forecast took its place."""
+        if self.__in_flight.get(key) is run:
+            del self.__in_flight[key]
+
+    @staticmethod
+    def __notify(broadcast: _Broadcast) -> None:
+        """Wake the consumers waiting for the broadcast to change."""
+        broadcast.changed.set()
+        broadcast.changed = asyncio.Event()
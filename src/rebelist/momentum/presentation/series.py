@@ -0,0 +1,51 @@
+from typing import Any
+
+import numpy
+from numpy.typing import NDArray
+
+
+def downsample(positions: NDArray[numpy.int64], values: NDArray[numpy.float64], threshold: int) -> NDArray[numpy.intp]:
+    """Indices of at most ``threshold`` points that preserve the visual shape of a series, at the given x positions.
+
+    Implements Largest-Triangle-Three-Buckets: the first and last points are kept, the rest is split into equal
+    buckets, and from each bucket the point forming the largest triangle with the point kept before it and the average
+    of the next bucket is selected. Series that are already short enough are returned whole.
+    """
+    size = len(positions)
+    if threshold >= size or threshold < 3:
+        return numpy.arange(size)
+
+    x = (positions - positions[0]).astype(numpy.float64)
+    y = numpy.asarray(values, dtype=numpy.float64)
+    edges = (numpy.arange(threshold - 1) * ((size - 2) / (threshold - 2))).astype(numpy.intp) + 1
+    edges[-1] = size - 1
+
+    selected = numpy.empty(threshold, dtype=numpy.intp)
+    selected[0], selected[-1] = 0, size - 1
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        following = slice(stop, edges[bucket + 2]) if bucket + 2 < len(edges) else slice(size - 1, size)
+        average_x, average_y = x[following].mean(), y[following].mean()
+        anchor_x, anchor_y = x[selected[bucket]], y[selected[bucket]]
+
+        areas = numpy.abs(
+            (anchor_x - average_x) * (y[start:stop] - anchor_y) - (anchor_x - x[start:stop]) * (average_y - anchor_y)
+        )
+        selected[bucket + 1] = start + int(numpy.argmax(areas))
+
+    return selected
+
+
+def compact(positions: NDArray[numpy.int64], values: NDArray[numpy.float64]) -> dict[str, Any]:
+    """Highcharts series options for the points, without repeating their x positions when they are evenly spaced."""
+    steps = numpy.diff(positions)
+    if positions.size and numpy.all(steps == (steps[0] if steps.size else 1)):
+        interval = int(steps[0]) if steps.size else 1
+        return {'data': values.tolist(), 'pointStart': int(positions[0]), 'pointInterval': interval}
+
+    return {'data': [list(point) for point in zip(positions.tolist(), values.tolist(), strict=True)]}
+
+
+def day_labels(timestamps: NDArray[numpy.int64]) -> list[str]:
+    """ISO dates of UTC-midnight timestamps, the category labels of an axis of trading days."""
+    return numpy.datetime_as_string(timestamps.astype('datetime64[ms]'), unit='D').tolist()
@@ -0,0 +1,166 @@
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import IO, Any, Final
+
+from rebelist.momentum.domain import Forecast
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Outcome of one ticker in a batch: its forecast, or the reason it failed."""
+
+    symbol: str
+    forecast: Forecast | None = None
+    error: str | None = None
+
+
+class ResultWriter(ABC):
+    """Streams batch results to a file as they arrive, one ticker at a time."""
+
+    COLUMNS: Final[tuple[str, ...]] = (
+        'symbol',
+        'name',
+        'currency',
+        'timestamp',
+        'lower',
+        'median',
+        'upper',
+        'error',
+    )
+
+    @abstractmethod
+    def write(self, result: BatchResult) -> None:
+        """Append the result of one ticker."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the output."""
+
+    def __enter__(self) -> 'ResultWriter':
+        """Use the writer as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close the writer."""
+        self.close()
+
+    @staticmethod
+    def rows(result: BatchResult) -> list[tuple[Any, ...]]:
+        """Long-format rows, one per forecast day; a failed ticker becomes a single row carrying the error."""
+        forecast = result.forecast
+        if forecast is None:
+            return [(result.symbol, None, None, None, None, None, None, result.error)]
+
+        stock = forecast.stock
+        return [
+            (result.symbol, stock.name, stock.currency, timestamp, lower, median, upper, None)
+            for timestamp, lower, median, upper in zip(
+                forecast.timestamps.tolist(),
+                forecast.lower.tolist(),
+                forecast.median.tolist(),
+                forecast.upper.tolist(),
+                strict=True,
+            )
+        ]
+
+
+class JsonLinesWriter(ResultWriter):
+    """One JSON object per ticker, with the bands as arrays aligned with the timestamps."""
+
+    def __init__(self, output: IO[str]) -> None:
+        self.__output = output
+
+    def write(self, result: BatchResult) -> None:
+        """Append the result of one ticker as a single line."""
+        record: dict[str, Any] = {'symbol': result.symbol}
+        if result.forecast is None:
+            record['error'] = result.error
+        else:
+            forecast = result.forecast
+            record |= {
+                'name': forecast.stock.name,
+                'currency': forecast.stock.currency,
+                'timestamps': forecast.timestamps.tolist(),
+                'lower': forecast.lower.tolist(),
+                'median': forecast.median.tolist(),
+                'upper': forecast.upper.tolist(),
+            }
+
+        self.__output.write(json.dumps(record) + '\n')
+        self.__output.flush()
+
+    def close(self) -> None:
+        """Close the output."""
+        self.__output.close()
+
+
+class CsvWriter(ResultWriter):
+    """Long-format CSV with one row per ticker and forecast day."""
+
+    def __init__(self, output: IO[str]) -> None:
+        self.__output = output
+        self.__writer = csv.writer(output)
+        self.__writer.writerow(self.COLUMNS)
+
+    def write(self, result: BatchResult) -> None:
+        """Append the rows of one ticker."""
+        self.__writer.writerows(self.rows(result))
+        self.__output.flush()
+
+    def close(self) -> None:
+        """Close the output."""
+        self.__output.close()
+
+
+class ParquetWriter(ResultWriter):
+    """Long-format Parquet file, written one row group per ticker. Requires the optional ``pyarrow`` dependency."""
+
+    def __init__(self, path: Path | IO[bytes]) -> None:
+        try:
+            pyarrow: Any = import_module('pyarrow')
+            parquet: Any = import_module('pyarrow.parquet')
+        except ImportError as e:
+            raise RuntimeError('Parquet output needs pyarrow: install rebelist-momentum[parquet].') from e
+
+        self.__pyarrow = pyarrow
+        self.__schema: Any = pyarrow.schema(
+            [
+                ('symbol', pyarrow.string()),
+                ('name', pyarrow.string()),
+                ('currency', pyarrow.string()),
+                ('timestamp', pyarrow.timestamp('ms', tz='UTC')),
+                ('lower', pyarrow.float64()),
+                ('median', pyarrow.float64()),
+                ('upper', pyarrow.float64()),
+                ('error', pyarrow.string()),
+            ]
+        )
+        self.__writer: Any = parquet.ParquetWriter(path, self.__schema)
+
+    def write(self, result: BatchResult) -> None:
+        """Append the rows of one ticker as a row group."""
+        rows = self.rows(result)
+        data = {name: [row[column] for row in rows] for column, name in enumerate(self.COLUMNS)}
+        self.__writer.write_table(self.__pyarrow.Table.from_pydict(data, schema=self.__schema))
+
+    def close(self) -> None:
+        """Write the file footer."""
+        self.__writer.close()
+
+
+def open_writer(path: Path, output_format: str) -> ResultWriter:
+    """Open a writer of the given format (``jsonl``, ``csv`` or ``parquet``) on the path, where ``-`` is stdout."""
+    to_stdout = str(path) == '-'
+    if output_format == 'parquet':
+        return ParquetWriter(sys.stdout.buffer if to_stdout else path)
+    if output_format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unknown output format '{output_format}'.")
+
+    output: IO[str] = open(sys.stdout.fileno() if to_stdout else path, 'w', newline='', closefd=not to_stdout)
+
+    return CsvWriter(output) if output_format == 'csv' else JsonLinesWriter(output)
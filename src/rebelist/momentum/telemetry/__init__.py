@@ -0,0 +1,4 @@
+from rebelist.momentum.telemetry.histogram import Histogram, HistogramSnapshot
+from rebelist.momentum.telemetry.telemetry import Telemetry
+
+__all__ = ['Telemetry', 'Histogram', 'HistogramSnapshot']
@@ -0,0 +1,67 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass
+from threading import Lock
+from typing import Final
+
+DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+MEMORY_BUCKETS: Final[tuple[float, ...]] = tuple(float(1024 * 4**power) for power in range(12))
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    """Cumulative bucket counts, aligned with the upper bounds, plus the total count and sum of observations."""
+
+    bounds: tuple[float, ...]
+    cumulative_counts: tuple[int, ...]
+    count: int
+    total: float
+
+
+class Histogram:
+    """Thread-safe histogram over fixed upper bounds, in the shape Prometheus expects."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError('Histogram bounds must be strictly increasing.')
+
+        self.__bounds = tuple(bounds)
+        self.__counts = [0] * (len(self.__bounds) + 1)
+        self.__total = 0.0
+        self.__lock = Lock()
+
+    def observe(self, value: float) -> None:
+        """Count one observation in the first bucket whose upper bound holds it."""
+        bucket = bisect_left(self.__bounds, value)
+        with self.__lock:
+            self.__counts[bucket] += 1
+            self.__total += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Consistent copy of the current counts."""
+        with self.__lock:
+            counts, total = list(self.__counts), self.__total
+
+        cumulative: list[int] = []
+        running = 0
+        for count in counts[:-1]:
+            running += count
+            cumulative.append(running)
+
+        return HistogramSnapshot(self.__bounds, tuple(cumulative), running + counts[-1], total)
@@ -0,0 +1,31 @@
+from rebelist.momentum.telemetry.histogram import HistogramSnapshot
+from rebelist.momentum.telemetry.telemetry import Telemetry
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def render(telemetry: Telemetry) -> str:
+    """Render the telemetry histograms in the Prometheus text exposition format."""
+    lines: list[str] = []
+    _histogram(lines, 'momentum_stage_duration_seconds', 'Wall time spent in each stage.', telemetry.durations())
+    _histogram(
+        lines, 'momentum_stage_peak_memory_bytes', 'Peak traced memory allocated in each stage.', telemetry.memory()
+    )
+
+    return '\n'.join(lines) + '\n'
+
+
+def _histogram(lines: list[str], name: str, description: str, histograms: dict[str, HistogramSnapshot]) -> None:
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} histogram')
+    for stage, snapshot in histograms.items():
+        label = f'stage="{_escape(stage)}"'
+        for bound, count in zip(snapshot.bounds, snapshot.cumulative_counts, strict=True):
+            lines.append(f'{name}_bucket{{{label},le="{bound:.12g}"}} {count}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {snapshot.count}')
+        lines.append(f'{name}_sum{{{label}}} {snapshot.total:.9g}')
+        lines.append(f'{name}_count{{{label}}} {snapshot.count}')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
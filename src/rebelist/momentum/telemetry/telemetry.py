@@ -0,0 +1,103 @@
+import threading
+import tracemalloc
+from contextlib import AbstractContextManager, nullcontext
+from threading import Lock
+from time import perf_counter
+from types import TracebackType
+
+from rebelist.momentum.telemetry.histogram import DURATION_BUCKETS, MEMORY_BUCKETS, Histogram, HistogramSnapshot
+
+_innermost = threading.local()
+
+
+class _Span:
+    """Times one stage and, when memory tracing is on, the peak traced memory allocated while it ran."""
+
+    __slots__ = ('__telemetry', '__stage', '__started', '__baseline', '__peak', '__parent')
+
+    def __init__(self, telemetry: 'Telemetry', stage: str) -> None:
+        self.__telemetry = telemetry
+        self.__stage = stage
+        self.__started = 0.0
+        self.__baseline = 0
+        self.__peak = 0
+        self.__parent: _Span | None = None
+
+    def __enter__(self) -> None:
+        """Start timing, and reset the traced peak so it only covers this stage."""
+        if self.__telemetry.trace_memory:
+            self.__parent = getattr(_innermost, 'span', None)
+            _innermost.span = self
+            self.__baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.__started = perf_counter()
+
+    def __exit__(
+        self, kind: type[BaseException] | None, error: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Record the elapsed time and the peak, handing the peak on to the enclosing span."""
+        elapsed = perf_counter() - self.__started
+        if not self.__telemetry.trace_memory:
+            self.__telemetry.record(self.__stage, elapsed)
+            return
+
+        self.__peak = max(self.__peak, tracemalloc.get_traced_memory()[1])
+        _innermost.span = self.__parent
+        if self.__parent is not None:
+            # The nested span reset the process-wide peak, so the enclosing one would not see it otherwise.
+            self.__parent.__peak = max(self.__parent.__peak, self.__peak)
+
+        self.__telemetry.record(self.__stage, elapsed, self.__peak - self.__baseline)
+
+
+class Telemetry:
+    """Aggregates per-stage wall time, and optionally peak traced memory, into histograms.
+
+    Stages are timed with ``with telemetry.span('stage'):``. A disabled instance hands out one shared no-op context
+    manager, so instrumented code costs a method call per stage. Memory tracing starts ``tracemalloc``, which slows
+    every allocation in the process down, so it is opt-in; peaks of stages running concurrently on different threads
+    overlap, as tracemalloc only keeps a single process-wide peak.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False) -> None:
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.__disabled: AbstractContextManager[None] = nullcontext()
+        self.__durations: dict[str, Histogram] = {}
+        self.__memory: dict[str, Histogram] = {}
+        self.__lock = Lock()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, stage: str) -> AbstractContextManager[None]:
+        """Context manager recording how long the stage takes."""
+        return _Span(self, stage) if self.enabled else self.__disabled
+
+    def record(self, stage: str, seconds: float, peak_bytes: int | None = None) -> None:
+        """Record one run of a stage."""
+        self.__histogram(self.__durations, stage, DURATION_BUCKETS).observe(seconds)
+        if peak_bytes is not None:
+            self.__histogram(self.__memory, stage, MEMORY_BUCKETS).observe(peak_bytes)
+
+    def durations(self) -> dict[str, HistogramSnapshot]:
+        """Wall-time histograms in seconds, by stage."""
+        return self.__snapshot(self.__durations)
+
+    def memory(self) -> dict[str, HistogramSnapshot]:
+        """Peak traced memory histograms in bytes, by stage."""
+        return self.__snapshot(self.__memory)
+
+    def __histogram(self, histograms: dict[str, Histogram], stage: str, bounds: tuple[float, ...]) -> Histogram:
+        histogram = histograms.get(stage)
+        if histogram is None:
+            with self.__lock:
+                histogram = histograms.setdefault(stage, Histogram(bounds))
+
+        return histogram
+
+    def __snapshot(self, histograms: dict[str, Histogram]) -> dict[str, HistogramSnapshot]:
+        with self.__lock:
+            stages = sorted(histograms.items())
+
+        return {stage: histogram.snapshot() for stage, histogram in stages}
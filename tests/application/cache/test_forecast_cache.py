@@ -0,0 +1,94 @@
+import numpy
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.application.cache import ForecastCache, ForecastKey
+from rebelist.momentum.domain import Forecast, Stock
+
+
+class TestForecastCache:
+    """Tests for the TTL/LRU forecast cache."""
+
+    @staticmethod
+    def forecast(points: int = 3) -> Forecast:
+        """Build a forecast with the given number of points per band."""
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        band = 100.0 + numpy.arange(points, dtype=numpy.float64)
+        return Forecast(stock, timestamps=numpy.arange(points), upper=band, median=band, lower=band)
+
+    @staticmethod
+    def key(symbol: str = 'TST', seed: int | None = None) -> ForecastKey:
+        """Build a cache key."""
+        return ForecastKey(symbol, simulation_count=100, forecast_length=3, seed=seed, fingerprint='abc')
+
+    def test_get_returns_stored_forecast_and_counts_hits_and_misses(self) -> None:
+        """A stored forecast is returned for its key and only for its key."""
+        cache = ForecastCache(ttl=60, max_size=1_000_000)
+        forecast = self.forecast()
+
+        assert cache.get(self.key()) is None
+        cache.put(self.key(), forecast)
+
+        assert cache.get(self.key()) is forecast
+        assert cache.get(self.key(seed=1)) is None
+        statistics = cache.statistics
+        assert (statistics.hits, statistics.misses, statistics.entries) == (1, 2, 1)
+        assert statistics.size > 0
+
+    def test_entries_expire_after_ttl(self, mocker: MockerFixture) -> None:
+        """An entry older than the TTL is dropped and reported as expired."""
+        clock = mocker.patch('rebelist.momentum.application.cache.forecast_cache.monotonic', return_value=100.0)
+        cache = ForecastCache(ttl=10, max_size=1_000_000)
+        cache.put(self.key(), self.forecast())
+
+        clock.return_value = 110.0
+
+        assert cache.get(self.key()) is None
+        assert cache.statistics.expirations == 1
+        assert cache.statistics.entries == 0
+
+    def test_least_recently_used_entry_is_evicted_beyond_size_cap(self) -> None:
+        """Once the size cap is exceeded, the least recently used entry goes first."""
+        probe = ForecastCache(ttl=60, max_size=1_000_000)
+        probe.put(self.key(), self.forecast())
+        entry_size = probe.statistics.size
+
+        cache = ForecastCache(ttl=60, max_size=2 * entry_size)
+        cache.put(self.key('A'), self.forecast())
+        cache.put(self.key('B'), self.forecast())
+        cache.get(self.key('A'))
+        cache.put(self.key('C'), self.forecast())
+
+        assert cache.get(self.key('B')) is None
+        assert cache.get(self.key('A')) is not None
+        assert cache.get(self.key('C')) is not None
+        assert cache.statistics.evictions == 1
+
+    def test_size_counts_the_price_history_of_the_stock(self) -> None:
+        """The price history of the forecast's stock counts towards the size of the entry."""
+        forecast = self.forecast()
+        history = {day: 100.0 + day for day in range(1, 1_001)}
+        long_history = Forecast(
+            Stock.from_history('Test Stock', 'TST', 'USD', history),
+            forecast.timestamps,
+            forecast.upper,
+            forecast.median,
+            forecast.lower,
+        )
+        short, long = ForecastCache(ttl=60, max_size=1_000_000), ForecastCache(ttl=60, max_size=1_000_000)
+
+        short.put(self.key(), forecast)
+        long.put(self.key(), long_history)
+
+        def history_bytes(stock: Stock) -> int:
+            return stock.timestamps.nbytes + stock.prices.nbytes
+
+        growth = history_bytes(long_history.stock) - history_bytes(forecast.stock)
+        assert long.statistics.size - short.statistics.size == growth
+
+    def test_forecast_larger_than_cap_is_not_stored(self) -> None:
+        """A forecast that could never fit is not stored and evicts nothing."""
+        cache = ForecastCache(ttl=60, max_size=10)
+        cache.put(self.key(), self.forecast())
+
+        assert cache.statistics.entries == 0
+        assert cache.statistics.evictions == 0
@@ -1,7 +1,11 @@
+import numpy
 from pytest_mock import MockerFixture
 
+from rebelist.momentum.application.cache import ForecastCache
 from rebelist.momentum.application.use_cases import GetStockForecastUseCase
-from rebelist.momentum.domain import Forecast, Stock
+from rebelist.momentum.domain import Forecast, HitProbability, MaximumDrawdown, Stock, TerminalDistribution
+from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator
+from rebelist.momentum.telemetry import Telemetry
 
 
 class TestGetStockForecastUseCase:
@@ -13,8 +17,14 @@ class TestGetStockForecastUseCase:
         mock_simulator = mocker.MagicMock()
         use_case = GetStockForecastUseCase(mock_provider, mock_simulator)
 
-        stock = Stock(name='Test Stock', ticker='TST', currency='USD', history={1: 100.0})
-        forecast = Forecast(stock, upper=[(1, 101.0)], median=[(1, 100.0)], lower=[(1, 99.0)])
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        forecast = Forecast(
+            stock,
+            timestamps=numpy.array([1]),
+            upper=numpy.array([101.0]),
+            median=numpy.array([100.0]),
+            lower=numpy.array([99.0]),
+        )
 
         mock_provider.get_stock.return_value = stock
         mock_simulator.simulate.return_value = forecast
@@ -22,5 +32,160 @@ class TestGetStockForecastUseCase:
         result = use_case('TST', simulation_count=10, forecast_length=5)
 
         mock_provider.get_stock.assert_called_once_with('TST')
-        mock_simulator.simulate.assert_called_once_with(stock, 10, 5)
+        mock_simulator.simulate.assert_called_once_with(stock, 10, 5, None, ())
         assert result == forecast
+
+    def test_use_case_serves_repeated_requests_from_cache(self, mocker: MockerFixture) -> None:
+        """Test that an identical request on an unchanged history is simulated only once."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        cache = ForecastCache(ttl=60, max_size=1_000_000)
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, cache)
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        forecast = Forecast(
+            stock,
+            timestamps=numpy.array([1]),
+            upper=numpy.array([101.0]),
+            median=numpy.array([100.0]),
+            lower=numpy.array([99.0]),
+        )
+        mock_provider.get_stock.return_value = stock
+        mock_simulator.simulate.return_value = forecast
+
+        first = use_case('TST', simulation_count=10, forecast_length=5, seed=3)
+        second = use_case('TST', simulation_count=10, forecast_length=5, seed=3)
+
+        mock_simulator.simulate.assert_called_once_with(stock, 10, 5, 3, ())
+        assert first is second
+        assert cache.statistics.hits == 1
+
+    def test_use_case_resimulates_when_history_changes(self, mocker: MockerFixture) -> None:
+        """Test that a new bar in the history invalidates the cached forecast."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, ForecastCache(ttl=60, max_size=1_000_000))
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        updated = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0, 2: 101.0})
+        mock_provider.get_stock.side_effect = [stock, updated]
+        mock_simulator.simulate.return_value = Forecast(
+            stock,
+            timestamps=numpy.empty(0, dtype=numpy.int64),
+            upper=numpy.empty(0, dtype=numpy.float64),
+            median=numpy.empty(0, dtype=numpy.float64),
+            lower=numpy.empty(0, dtype=numpy.float64),
+        )
+
+        use_case('TST', simulation_count=10, forecast_length=5)
+        use_case('TST', simulation_count=10, forecast_length=5)
+
+        assert mock_simulator.simulate.call_count == 2
+        assert stock.fingerprint != updated.fingerprint
+
+    def test_use_case_caches_forecasts_per_set_of_reducers(self, mocker: MockerFixture) -> None:
+        """Test that asking for other path analytics runs a new simulation instead of serving the cached one."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, ForecastCache(ttl=60, max_size=1_000_000))
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        mock_provider.get_stock.return_value = stock
+        mock_simulator.simulate.return_value = Forecast(
+            stock, numpy.array([1]), numpy.array([101.0]), numpy.array([100.0]), numpy.array([99.0])
+        )
+
+        use_case('TST', simulation_count=10, forecast_length=5, reducers=(HitProbability(110.0),))
+        use_case('TST', simulation_count=10, forecast_length=5, reducers=(HitProbability(110.0),))
+        use_case('TST', simulation_count=10, forecast_length=5, reducers=(HitProbability(120.0),))
+
+        assert mock_simulator.simulate.call_count == 2
+        mock_simulator.simulate.assert_called_with(stock, 10, 5, None, (HitProbability(120.0),))
+
+    def test_sweep_simulates_only_the_lengths_not_cached(self, mocker: MockerFixture) -> None:
+        """Test that a sweep serves cached lengths, simulates the rest together and caches them for single requests."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, ForecastCache(ttl=60, max_size=1_000_000))
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        band = numpy.full(20, 100.0)
+        forecasts = {
+            length: Forecast(stock, numpy.arange(length), band[:length], band[:length], band[:length])
+            for length in (5, 10, 20)
+        }
+        mock_provider.get_stock.return_value = stock
+        mock_simulator.simulate.return_value = forecasts[10]
+        mock_simulator.sweep.return_value = {5: forecasts[5], 20: forecasts[20]}
+
+        use_case('TST', simulation_count=10, forecast_length=10, seed=1)
+        sweep = use_case.sweep('TST', simulation_count=10, forecast_lengths=[20, 10, 5], seed=1)
+        single = use_case('TST', simulation_count=10, forecast_length=20, seed=1)
+
+        mock_simulator.sweep.assert_called_once_with(stock, 10, [5, 20], 1, ())
+        assert sweep == forecasts
+        assert single is forecasts[20]
+
+    def test_progressive_forecast_caches_only_the_complete_estimate(self, mocker: MockerFixture) -> None:
+        """Test that every estimate is passed on, the last one is cached and served to a repeat, each step timed."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        cache = ForecastCache(ttl=60, max_size=1_000_000)
+        telemetry = Telemetry()
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, cache, telemetry)
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        estimates = [
+            Forecast(stock, numpy.array([1]), numpy.array([upper]), numpy.array([100.0]), numpy.array([99.0]))
+            for upper in (103.0, 102.0, 101.0)
+        ]
+        mock_provider.get_stock.return_value = stock
+        mock_simulator.simulate_progressively.return_value = iter(estimates)
+
+        first = list(use_case.progressively('TST', simulation_count=10, forecast_length=5, seed=3))
+        second = list(use_case.progressively('TST', simulation_count=10, forecast_length=5, seed=3))
+
+        mock_simulator.simulate_progressively.assert_called_once_with(stock, 10, 5, 3, ())
+        assert first == estimates
+        assert second == [estimates[-1]]
+        assert telemetry.durations()['use_case.forecast'].count == 6
+
+    def test_progressive_forecast_closes_its_spans_between_estimates(self, mocker: MockerFixture) -> None:
+        """Test that a stream dropped after its first estimate has timed only the work done for it."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        telemetry = Telemetry()
+        use_case = GetStockForecastUseCase(mock_provider, mock_simulator, None, telemetry)
+
+        stock = Stock.from_history('Test Stock', 'TST', 'USD', {1: 100.0})
+        estimate = Forecast(stock, numpy.array([1]), numpy.array([101.0]), numpy.array([100.0]), numpy.array([99.0]))
+        mock_provider.get_stock.return_value = stock
+        mock_simulator.simulate_progressively.return_value = iter([estimate, estimate])
+
+        stream = use_case.progressively('TST', simulation_count=10, forecast_length=5)
+        next(stream)
+        timed = telemetry.durations()['use_case.forecast'].count
+        stream.close()
+
+        assert timed == 2
+        assert telemetry.durations()['use_case.forecast'].count == 2
+
+    def test_shorter_forecasts_with_analytics_reuse_the_simulated_paths(self, mocker: MockerFixture) -> None:
+        """Test that a shorter seeded forecast with analytics is sliced rather than simulated, when that is enabled."""
+        mock_provider = mocker.MagicMock()
+        telemetry = Telemetry()
+        cache = ForecastCache(ttl=60, max_size=1_000_000)
+        simulator = MonteCarloSimulator(telemetry=telemetry, horizon_analytics=True)
+        use_case = GetStockForecastUseCase(mock_provider, simulator, cache, telemetry)
+        history = {day * 86_400_000: 100.0 * 1.001**day + (day % 5) for day in range(1, 300)}
+        mock_provider.get_stock.return_value = Stock.from_history('Test Stock', 'TST', 'USD', history)
+        reducers = (MaximumDrawdown(), TerminalDistribution(), HitProbability(400.0))
+
+        *_, longer = use_case.progressively('TST', simulation_count=500, forecast_length=200, seed=9, reducers=reducers)
+        generated = telemetry.durations()['simulator.paths'].count
+        *_, shorter = use_case.progressively('TST', simulation_count=500, forecast_length=60, seed=9, reducers=reducers)
+
+        assert telemetry.durations()['simulator.paths'].count == generated
+        numpy.testing.assert_array_equal(shorter.median, longer.median[:60])
+        fresh = GetStockForecastUseCase(mock_provider, MonteCarloSimulator(horizon_cache_size=0))
+        assert shorter == fresh('TST', simulation_count=500, forecast_length=60, seed=9, reducers=reducers)
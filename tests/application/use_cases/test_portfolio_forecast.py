@@ -0,0 +1,34 @@
+import numpy
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.application.use_cases import GetPortfolioForecastUseCase
+from rebelist.momentum.domain import PortfolioForecast, Stock
+
+
+class TestGetPortfolioForecastUseCase:
+    """Tests for GetPortfolioForecastUseCase ensuring it fetches in batch and calls the simulator."""
+
+    def test_use_case_fetches_basket_and_simulates(self, mocker: MockerFixture) -> None:
+        """Test that the use case fetches every stock in one call and forwards them to the simulator."""
+        mock_provider = mocker.MagicMock()
+        mock_simulator = mocker.MagicMock()
+        use_case = GetPortfolioForecastUseCase(mock_provider, mock_simulator)
+
+        stocks = [Stock.from_history(name, name, 'USD', {1: 100.0}) for name in ('A', 'B')]
+        forecast = PortfolioForecast(
+            stocks,
+            numpy.array([0.5, 0.5]),
+            timestamps=numpy.empty(0, dtype=numpy.int64),
+            upper=numpy.empty(0, dtype=numpy.float64),
+            median=numpy.empty(0, dtype=numpy.float64),
+            lower=numpy.empty(0, dtype=numpy.float64),
+            assets=[],
+        )
+        mock_provider.get_stocks.return_value = stocks
+        mock_simulator.simulate.return_value = forecast
+
+        result = use_case(['A', 'B'], [1, 1], simulation_count=10, forecast_length=5, seed=2, include_assets=True)
+
+        mock_provider.get_stocks.assert_called_once_with(['A', 'B'])
+        mock_simulator.simulate.assert_called_once_with(stocks, [1, 1], 10, 5, 2, True)
+        assert result == forecast
@@ -1,5 +1,15 @@
-from rebelist.momentum.application.use_cases import GetStockForecastUseCase
-from rebelist.momentum.config import Container
+import os
+import subprocess
+import sys
+
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.application.cache import ForecastCache
+from rebelist.momentum.application.use_cases import GetPortfolioForecastUseCase, GetStockForecastUseCase
+from rebelist.momentum.config import Container, get_container, warm_up
+from rebelist.momentum.infrastructure.finance import SharedHistoryCache, TokenBucket, YahooProvider
+from rebelist.momentum.infrastructure.forecast import LognormalSimulator, MonteCarloSimulator
+from rebelist.momentum.telemetry import Telemetry
 
 
 class TestContainer:
@@ -14,3 +24,118 @@ class TestContainer:
 
         use_case2 = container.get_stock_forecast_use_case()
         assert use_case is use_case2
+
+    def test_simulator_worker_count_is_configurable(self, mocker: MockerFixture) -> None:
+        """Test that the simulator is built with the worker count from the container configuration."""
+        initializer = mocker.patch.object(MonteCarloSimulator, '__init__', return_value=None)
+        container = Container()
+        container.config.simulator.workers.from_value(3)
+
+        container.get_stock_forecast_use_case()
+
+        initializer.assert_called_once_with(
+            workers=3,
+            chunk_size=8_192,
+            telemetry=container.telemetry(),
+            sampling='pseudo',
+            tolerance=None,
+            dtype='float64',
+            horizon_cache_size=64,
+            horizon_analytics=False,
+        )
+
+    def test_simulator_model_is_selectable(self, mocker: MockerFixture) -> None:
+        """Test that the use case gets the closed-form simulator when the lognormal model is configured."""
+        initializer = mocker.patch.object(GetStockForecastUseCase, '__init__', return_value=None)
+        container = Container()
+        container.config.simulator.model.from_value('lognormal')
+
+        container.get_stock_forecast_use_case()
+
+        assert isinstance(initializer.call_args.args[1], LognormalSimulator)
+
+    def test_forecast_cache_can_be_disabled(self, mocker: MockerFixture) -> None:
+        """Test that the use case only gets a forecast cache when the cache mode enables one."""
+        initializer = mocker.patch.object(GetStockForecastUseCase, '__init__', return_value=None)
+
+        Container().get_stock_forecast_use_case()
+        disabled = Container()
+        disabled.config.forecast_cache.mode.from_value('disabled')
+        disabled.get_stock_forecast_use_case()
+
+        assert isinstance(initializer.call_args_list[0].args[2], ForecastCache)
+        assert initializer.call_args_list[1].args[2] is None
+
+    def test_shared_history_cache_can_be_disabled(self, mocker: MockerFixture) -> None:
+        """Test that the provider only shares histories across processes when the shared history mode enables it."""
+        initializer = mocker.patch.object(YahooProvider, '__init__', return_value=None)
+
+        Container().get_stock_forecast_use_case()
+        disabled = Container()
+        disabled.config.shared_history.mode.from_value('disabled')
+        disabled.get_stock_forecast_use_case()
+
+        assert isinstance(initializer.call_args_list[0].kwargs['shared'], SharedHistoryCache)
+        assert initializer.call_args_list[1].kwargs['shared'] is None
+
+    def test_provider_upstream_limits_are_configurable(self, mocker: MockerFixture) -> None:
+        """Test that the provider gets the configured retry policy and a rate limiter shared by every fetch."""
+        initializer = mocker.patch.object(YahooProvider, '__init__', return_value=None)
+        container = Container()
+        container.config.upstream.retries.from_value(5)
+
+        container.get_stock_forecast_use_case()
+
+        options = initializer.call_args.kwargs
+        assert isinstance(options['rate_limit'], TokenBucket)
+        assert (options['retries'], options['backoff']) == (5, 0.5)
+
+    def test_get_portfolio_forecast_use_case(self) -> None:
+        """Test that the container provides a GetPortfolioForecastUseCase singleton."""
+        container = Container()
+        use_case = container.get_portfolio_forecast_use_case()
+
+        assert isinstance(use_case, GetPortfolioForecastUseCase)
+        assert use_case is container.get_portfolio_forecast_use_case()
+
+    def test_telemetry_is_shared_by_the_instrumented_services(self, mocker: MockerFixture) -> None:
+        """Test that the use case receives the container's single telemetry instance, as configured."""
+        initializer = mocker.patch.object(GetStockForecastUseCase, '__init__', return_value=None)
+        container = Container()
+        container.config.telemetry.enabled.from_value(False)
+
+        container.get_stock_forecast_use_case()
+
+        telemetry = initializer.call_args.args[3]
+        assert isinstance(telemetry, Telemetry) and telemetry is container.telemetry()
+        assert not telemetry.enabled
+
+    def test_building_the_container_does_not_import_the_heavy_dependencies(self) -> None:
+        """Test that importing the configuration and building a container leaves pandas and yfinance unloaded."""
+        script = (
+            'import sys; from rebelist.momentum.config import Container; Container(); '
+            "print(sorted({'pandas', 'yfinance', 'nicegui'} & set(sys.modules)))"
+        )
+        environment = os.environ | {'PYTHONPATH': os.pathsep.join(sys.path)}
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, env=environment)
+        output = result.stdout
+
+        assert output.strip() == '[]'
+
+    def test_get_container_returns_one_container_per_process(self) -> None:
+        """Test that every caller shares the same container."""
+        assert get_container() is get_container()
+
+    def test_warm_up_builds_the_services(self, mocker: MockerFixture) -> None:
+        """Test that the warm-up resolves both use cases and runs an offline simulation on the configured simulator."""
+        stock_use_case = mocker.patch.object(GetStockForecastUseCase, '__init__', return_value=None)
+        portfolio_use_case = mocker.patch.object(GetPortfolioForecastUseCase, '__init__', return_value=None)
+        simulate = mocker.patch.object(MonteCarloSimulator, 'simulate', autospec=True)
+        container = Container()
+
+        warm_up(container)
+
+        stock_use_case.assert_called_once()
+        portfolio_use_case.assert_called_once()
+        simulate.assert_called_once()
+        assert simulate.call_args.args[0] is container.finance_simulator()
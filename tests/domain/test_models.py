@@ -0,0 +1,108 @@
+import numpy
+import pytest
+
+from rebelist.momentum.domain import Distribution, Forecast, ReturnStatistics, Stock
+
+
+class TestStock:
+    """Tests for the array-backed stock model."""
+
+    def test_history_is_held_as_read_only_arrays(self) -> None:
+        """Test that the price history is stored as typed, read-only arrays."""
+        stock = Stock('Test', 'TST', 'USD', numpy.array([1, 2]), numpy.array([100.0, 101.0]))
+
+        assert stock.timestamps.dtype == numpy.int64
+        assert stock.prices.dtype == numpy.float64
+        with pytest.raises(ValueError):
+            stock.prices[0] = 0.0
+
+    def test_from_history_sorts_by_timestamp(self) -> None:
+        """Test that a mapping is turned into arrays in chronological order."""
+        stock = Stock.from_history('Test', 'TST', 'USD', {3: 103.0, 1: 101.0, 2: 102.0})
+
+        assert stock.timestamps.tolist() == [1, 2, 3]
+        assert stock.prices.tolist() == [101.0, 102.0, 103.0]
+
+    def test_mismatched_history_raises(self) -> None:
+        """Test that every timestamp needs exactly one price."""
+        with pytest.raises(ValueError, match='exactly one price'):
+            Stock('Test', 'TST', 'USD', numpy.array([1, 2]), numpy.array([100.0]))
+
+    def test_equality_and_fingerprint_follow_the_history(self) -> None:
+        """Test that equal histories compare equal and share a fingerprint, while a revised bar changes both."""
+        stock = Stock('Test', 'TST', 'USD', numpy.array([1, 2]), numpy.array([100.0, 101.0]))
+        same = Stock('Test', 'TST', 'USD', numpy.array([1, 2]), numpy.array([100.0, 101.0]))
+        revised = Stock('Test', 'TST', 'USD', numpy.array([1, 2]), numpy.array([100.0, 99.0]))
+
+        assert stock == same and stock.fingerprint == same.fingerprint
+        assert stock != revised and stock.fingerprint != revised.fingerprint
+
+    def test_attached_statistics_are_used_but_not_compared(self) -> None:
+        """Test that provider statistics take precedence over the history and leave equality alone."""
+        timestamps, prices = numpy.array([1, 2, 3]), numpy.array([100.0, 110.0, 121.0])
+        statistics = ReturnStatistics(2, 0.5, 0.1)
+
+        plain = Stock('Test', 'TST', 'USD', timestamps, prices)
+        indexed = Stock('Test', 'TST', 'USD', timestamps, prices, statistics)
+
+        assert indexed.return_statistics is statistics
+        assert plain.return_statistics.count == 2
+        assert plain.return_statistics.mean == pytest.approx(numpy.log(1.1))
+        assert plain == indexed
+
+
+class TestForecast:
+    """Tests for the array-backed forecast model."""
+
+    def test_points_pairs_timestamps_with_band(self) -> None:
+        """Test that a band is converted to chart pairs only on request."""
+        stock = Stock('Test', 'TST', 'USD', numpy.array([1]), numpy.array([100.0]))
+        forecast = Forecast(
+            stock,
+            numpy.array([10, 20]),
+            upper=numpy.array([102.0, 104.0]),
+            median=numpy.array([101.0, 102.0]),
+            lower=numpy.array([99.0, 98.0]),
+        )
+
+        assert forecast.points(forecast.upper) == [(10, 102.0), (20, 104.0)]
+
+    def test_misaligned_band_raises(self) -> None:
+        """Test that every band must match the timestamps."""
+        stock = Stock('Test', 'TST', 'USD', numpy.array([1]), numpy.array([100.0]))
+
+        with pytest.raises(ValueError, match='one price per timestamp'):
+            Forecast(
+                stock,
+                numpy.array([10, 20]),
+                upper=numpy.array([102.0]),
+                median=numpy.array([101.0, 102.0]),
+                lower=numpy.array([99.0, 98.0]),
+            )
+
+    def test_analytics_are_read_only(self) -> None:
+        """Test that the path statistics attached to a forecast cannot be changed afterwards."""
+        stock = Stock('Test', 'TST', 'USD', numpy.array([1]), numpy.array([100.0]))
+        band = numpy.array([100.0])
+        forecast = Forecast(stock, numpy.array([10]), band, band, band, analytics={'hit_probability[110]': 0.2})
+
+        with pytest.raises(TypeError):
+            forecast.analytics['hit_probability[110]'] = 0.3  # type: ignore[index]
+
+
+class TestDistribution:
+    """Tests for the histogram of a simulated quantity."""
+
+    def test_quantile_and_cumulative_interpolate_within_bins(self) -> None:
+        """Test that the quantile and the cumulative probability are inverse, linear inside every bin."""
+        distribution = Distribution(numpy.array([0.0, 1.0, 2.0, 4.0]), numpy.array([0.5, 0.25, 0.25]))
+
+        assert distribution.quantile(0.5) == pytest.approx(1.0)
+        assert distribution.quantile(0.875) == pytest.approx(3.0)
+        assert distribution.cumulative(3.0) == pytest.approx(0.875)
+        assert distribution.cumulative(-1.0) == 0.0
+
+    def test_mismatched_edges_raise(self) -> None:
+        """Test that every bin needs both of its edges."""
+        with pytest.raises(ValueError, match='lower and an upper edge'):
+            Distribution(numpy.array([0.0, 1.0]), numpy.array([0.5, 0.5]))
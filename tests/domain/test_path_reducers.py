@@ -0,0 +1,96 @@
+import math
+from collections.abc import Callable
+
+import numpy
+import pytest
+
+from rebelist.momentum.domain import (
+    Distribution,
+    HitProbability,
+    MaximumDrawdown,
+    PathReducer,
+    ReturnStatistics,
+    Stock,
+    TerminalDistribution,
+)
+
+
+def stock() -> Stock:
+    """Stock priced at 100 with known return moments."""
+    statistics = ReturnStatistics(250, 0.0, 0.01)
+    return Stock('Paths', 'PTH', 'USD', numpy.array([0, 86_400_000]), numpy.full(2, 100.0), statistics)
+
+
+def log_paths(*prices: list[float]) -> numpy.ndarray:
+    """Day-major cumulative log-returns from a last price of 100 for the given price paths."""
+    return numpy.log(numpy.array(prices, dtype=numpy.float64).T / 100.0)
+
+
+class TestPathReducers:
+    """Tests for the path statistics accumulated during the simulation."""
+
+    def test_hit_probability_counts_paths_touching_the_target(self) -> None:
+        """Test that a target above the last price is touched from below and one below it from above."""
+        paths = log_paths([101.0, 111.0, 105.0], [99.0, 98.0, 109.0], [95.0, 89.0, 92.0])
+        above, below = HitProbability(110.0), HitProbability(90.0)
+
+        assert above.finish(stock(), 3, above.reduce(stock(), paths), 3) == pytest.approx(1 / 3)
+        assert below.finish(stock(), 3, below.reduce(stock(), paths), 3) == pytest.approx(1 / 3)
+        assert above.name != below.name
+
+    def test_maximum_drawdown_is_measured_from_the_running_peak(self) -> None:
+        """Test that every path lands in the bin of its largest fall, the last price counting as the first peak."""
+        reducer = MaximumDrawdown(bins=10)
+        paths = log_paths([120.0, 90.0, 130.0], [100.0, 101.0, 102.0], [95.0, 97.0, 96.0])
+
+        distribution = reducer.finish(stock(), 3, reducer.reduce(stock(), paths), 3)
+
+        assert isinstance(distribution, Distribution)
+        assert distribution.probabilities.sum() == pytest.approx(1.0)
+        assert distribution.probabilities[[0, 2]].tolist() == pytest.approx([2 / 3, 1 / 3])
+
+    def test_terminal_distribution_sums_over_chunks(self) -> None:
+        """Test that chunk summaries add up to the histogram of all the paths, with price edges around the mean."""
+        reducer = TerminalDistribution(bins=8, deviations=3.0)
+        first, second = log_paths([100.0, 101.0], [100.0, 97.0]), log_paths([100.0, 100.5], [100.0, 250.0])
+
+        total = reducer.reduce(stock(), first) + reducer.reduce(stock(), second)
+        distribution = reducer.finish(stock(), 2, total, 4)
+
+        assert isinstance(distribution, Distribution)
+        assert distribution.probabilities.sum() == pytest.approx(1.0)
+        assert distribution.edges[0] == pytest.approx(100.0 * math.exp(-0.03 * math.sqrt(2)))
+        assert distribution.probabilities[-1] == pytest.approx(0.25)
+
+    @pytest.mark.parametrize('reducer', [HitProbability(104.0), MaximumDrawdown(bins=6), TerminalDistribution(bins=5)])
+    def test_prefix_summaries_match_the_summaries_of_every_prefix(self, reducer: PathReducer) -> None:
+        """Test that every day of the prefix summaries is exactly what reducing the paths up to that day gives."""
+        paths = numpy.cumsum(numpy.random.default_rng(7).normal(0.0, 0.02, (12, 50)), axis=0)
+
+        prefixes = reducer.reduce_prefixes(stock(), paths)
+
+        for days in range(1, 13):
+            numpy.testing.assert_array_equal(prefixes[days - 1], reducer.reduce(stock(), paths[:days]))
+
+    def test_prefix_summaries_bin_values_on_the_edges_like_the_summaries(self) -> None:
+        """Test that values right on the bin edges, and on the edges of days without spread, are binned alike."""
+        reducer = TerminalDistribution(bins=8, deviations=3.0)
+        on_edges = numpy.stack([numpy.linspace(-0.03, 0.03, 9) * math.sqrt(days) for days in range(1, 6)])
+        flat = ReturnStatistics(250, 0.0, 0.0)
+        constant = Stock('Flat', 'FLT', 'USD', numpy.array([0, 86_400_000]), numpy.full(2, 100.0), flat)
+        still = numpy.zeros((4, 6))
+        still[1, 1], still[2, 2] = 0.5, -0.5
+
+        for subject, paths in ((stock(), on_edges), (constant, still)):
+            for summarised in (reducer, MaximumDrawdown(bins=4)):
+                prefixes = summarised.reduce_prefixes(subject, paths)
+                for days in range(1, paths.shape[0] + 1):
+                    numpy.testing.assert_array_equal(prefixes[days - 1], summarised.reduce(subject, paths[:days]))
+
+    @pytest.mark.parametrize(
+        'build', [lambda: HitProbability(0.0), lambda: MaximumDrawdown(bins=0), lambda: TerminalDistribution(bins=0)]
+    )
+    def test_invalid_reducers_raise(self, build: Callable[[], PathReducer]) -> None:
+        """Test that unreachable targets and empty histograms are rejected."""
+        with pytest.raises(ValueError):
+            build()
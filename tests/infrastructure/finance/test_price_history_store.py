@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import numpy
+
+from rebelist.momentum.infrastructure.finance import PriceHistoryStore
+
+
+class TestPriceHistoryStore:
+    """Tests for the on-disk price history store."""
+
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        """Test that saved histories are loaded back unchanged."""
+        store = PriceHistoryStore(tmp_path / 'history')
+        timestamps = numpy.array([1, 2, 3], dtype=numpy.int64)
+        closes = numpy.array([10.0, 11.0, 12.5])
+
+        store.save('TST', timestamps, closes)
+        loaded = store.load('TST')
+
+        assert loaded is not None
+        numpy.testing.assert_array_equal(loaded[0], timestamps)
+        numpy.testing.assert_array_equal(loaded[1], closes)
+        assert loaded[0].flags.c_contiguous and loaded[1].flags.c_contiguous
+
+    def test_load_unknown_symbol_returns_none(self, tmp_path: Path) -> None:
+        """Test that a symbol without stored history yields None."""
+        assert PriceHistoryStore(tmp_path).load('MISSING') is None
+
+    def test_symbols_are_stored_in_separate_safe_files(self, tmp_path: Path) -> None:
+        """Test that symbols with special characters do not collide or escape the store directory."""
+        store = PriceHistoryStore(tmp_path)
+        store.save('^GSPC', numpy.array([1]), numpy.array([1.0]))
+        store.save('A/B', numpy.array([2]), numpy.array([2.0]))
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['%5EGSPC.npz', 'A%2FB.npz']
+        assert store.load('A/B') is not None
+
+    def test_archive_without_both_columns_is_ignored(self, tmp_path: Path) -> None:
+        """Test that a file not written by the store is treated as no history."""
+        numpy.savez(tmp_path / 'TST.npz', closes=numpy.array([1.0]))
+
+        assert PriceHistoryStore(tmp_path).load('TST') is None
+
+    def test_delete_forgets_history(self, tmp_path: Path) -> None:
+        """Test that a deleted symbol is no longer loaded."""
+        store = PriceHistoryStore(tmp_path)
+        store.save('TST', numpy.array([1]), numpy.array([1.0]))
+
+        store.delete('TST')
+
+        assert store.load('TST') is None
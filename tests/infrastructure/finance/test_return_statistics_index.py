@@ -0,0 +1,91 @@
+import math
+
+import numpy
+import pytest
+
+from rebelist.momentum.domain import ReturnStatistics
+from rebelist.momentum.infrastructure.finance import ReturnStatisticsIndex, RunningMoments
+
+
+def assert_matches(statistics: ReturnStatistics, closes: numpy.ndarray) -> None:
+    """Assert that incrementally maintained moments agree with a full pass over the closing prices."""
+    expected = ReturnStatistics.from_prices(closes)
+    assert statistics.count == expected.count
+    assert statistics.mean == pytest.approx(expected.mean, rel=1e-9, abs=1e-15)
+    assert statistics.standard_deviation == pytest.approx(expected.standard_deviation, rel=1e-9)
+
+
+class TestRunningMoments:
+    """Tests for the add/remove Welford state."""
+
+    def test_removing_values_restores_the_moments_of_the_rest(self) -> None:
+        """Test that adding then removing values leaves the moments of the remaining sample."""
+        values = numpy.random.default_rng(1).normal(0.001, 0.02, 200)
+        moments = RunningMoments()
+
+        for value in values.tolist():
+            moments.add(value)
+        for value in values[:50].tolist():
+            moments.remove(value)
+
+        statistics = moments.statistics()
+        assert statistics.count == 150
+        assert statistics.mean == pytest.approx(values[50:].mean())
+        assert statistics.standard_deviation == pytest.approx(values[50:].std(ddof=1))
+
+    def test_too_small_samples_have_undefined_moments(self) -> None:
+        """Test that the moments are NaN like NumPy's for samples without enough values."""
+        moments = RunningMoments()
+        assert math.isnan(moments.statistics().mean)
+
+        moments.add(0.5)
+        assert moments.statistics().mean == 0.5 and math.isnan(moments.statistics().standard_deviation)
+
+
+class TestReturnStatisticsIndex:
+    """Tests for the per-symbol return statistics index."""
+
+    def test_sliding_window_matches_full_recomputation(self) -> None:
+        """Test that appending and evicting bars one at a time tracks the moments of each window."""
+        closes = 100.0 * numpy.exp(numpy.cumsum(numpy.random.default_rng(2).normal(0.0, 0.01, 400)))
+        timestamps = numpy.arange(400, dtype=numpy.int64) * 86_400_000
+        index = ReturnStatisticsIndex()
+
+        for end in range(250, 400, 7):
+            window = slice(end - 250, end)
+            assert_matches(index.update('TST', timestamps[window], closes[window]), closes[window])
+
+    def test_replaced_latest_bar_is_retracted(self) -> None:
+        """Test that a latest bar whose close changed, like a settled intraday bar, replaces the old one."""
+        timestamps = numpy.arange(5, dtype=numpy.int64)
+        closes = numpy.array([100.0, 101.0, 99.0, 102.0, 103.0])
+        index = ReturnStatisticsIndex()
+        index.update('TST', timestamps, closes)
+
+        settled = numpy.array([100.0, 101.0, 99.0, 102.0, 104.5, 105.0])
+        statistics = index.update('TST', numpy.arange(6, dtype=numpy.int64), settled)
+
+        assert_matches(statistics, settled)
+
+    def test_readjusted_history_is_rebuilt(self) -> None:
+        """Test that a history whose past closes were re-adjusted is recomputed rather than extended."""
+        timestamps = numpy.arange(4, dtype=numpy.int64)
+        index = ReturnStatisticsIndex()
+        index.update('TST', timestamps, numpy.array([100.0, 102.0, 101.0, 104.0]))
+
+        adjusted = numpy.array([50.0, 51.0, 50.5, 52.0, 53.0])
+        statistics = index.update('TST', numpy.arange(5, dtype=numpy.int64), adjusted)
+
+        assert_matches(statistics, adjusted)
+
+    def test_symbols_are_independent(self) -> None:
+        """Test that every symbol has its own moments."""
+        index = ReturnStatisticsIndex()
+        first = numpy.array([100.0, 110.0, 99.0])
+        second = numpy.array([10.0, 10.5, 10.25, 10.75])
+
+        index.update('AAA', numpy.arange(3, dtype=numpy.int64), first)
+        statistics = index.update('BBB', numpy.arange(4, dtype=numpy.int64), second)
+
+        assert_matches(statistics, second)
+        assert_matches(index.update('AAA', numpy.arange(3, dtype=numpy.int64), first), first)
@@ -0,0 +1,105 @@
+import multiprocessing
+from pathlib import Path
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.infrastructure.finance import SharedHistoryCache
+
+
+def _publish(directory: Path, symbol: str, count: int) -> None:
+    """Publish ``count`` successive histories of one symbol from another process."""
+    cache = SharedHistoryCache(directory, max_age=60.0)
+    for length in range(1, count + 1):
+        cache.put(symbol, numpy.arange(length), numpy.full(length, float(length)), symbol, 'USD')
+
+
+class TestSharedHistoryCache:
+    """Tests for the memory-mapped history cache shared across processes."""
+
+    def test_put_and_get_round_trip_without_copying(self, tmp_path: Path) -> None:
+        """Test that a stored history is served as read-only views into the mapped arena."""
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        cache.put('TST', numpy.array([1, 2, 3]), numpy.array([10.0, 11.0, 12.5]), 'Test', 'EUR', 'XETR')
+
+        history = cache.get('TST')
+
+        assert history is not None
+        assert (history.name, history.currency, history.exchange) == ('Test', 'EUR', 'XETR')
+        assert history.timestamps.tolist() == [1, 2, 3]
+        assert history.closes.tolist() == [10.0, 11.0, 12.5]
+        assert not history.closes.flags.writeable
+        assert not history.closes.flags.owndata
+
+    def test_unknown_and_expired_symbols_are_missing(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test that histories are only served while younger than the maximum age."""
+        clock = mocker.patch('rebelist.momentum.infrastructure.finance.shared_history_cache.time.time')
+        clock.return_value = 1_000.0
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        cache.put('TST', numpy.array([1]), numpy.array([1.0]), 'Test', 'USD')
+
+        clock.return_value = 1_061.0
+
+        assert cache.get('MISSING') is None
+        assert cache.get('TST') is None
+
+    def test_histories_published_by_another_process_are_visible(self, tmp_path: Path) -> None:
+        """Test that one process reads what another one stored, including updates after its first read."""
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        cache.put('TST', numpy.array([1]), numpy.array([1.0]), 'Test', 'USD')
+        assert cache.get('TST') is not None
+
+        process = multiprocessing.get_context('spawn').Process(target=_publish, args=(tmp_path, 'TST', 3))
+        process.start()
+        process.join(timeout=60)
+
+        history = cache.get('TST')
+        assert process.exitcode == 0
+        assert history is not None
+        assert history.closes.tolist() == [3.0, 3.0, 3.0]
+
+    def test_concurrent_writers_do_not_lose_updates(self, tmp_path: Path) -> None:
+        """Test that processes writing at the same time all end up in the index, each with its latest history."""
+        context = multiprocessing.get_context('spawn')
+        symbols = ['AAA', 'BBB', 'CCC', 'DDD']
+        processes = [context.Process(target=_publish, args=(tmp_path, symbol, 40)) for symbol in symbols]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+        for symbol in symbols:
+            history = cache.get(symbol)
+            assert history is not None
+            assert history.name == symbol
+            assert history.timestamps.tolist() == list(range(40))
+
+    def test_superseded_histories_are_compacted_away(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test that the arena is rewritten once mostly superseded, and that views taken before stay valid."""
+        mocker.patch.object(SharedHistoryCache, 'COMPACTION_THRESHOLD', 0)
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        cache.put('TST', numpy.arange(100), numpy.ones(100), 'Test', 'USD')
+        before = cache.get('TST')
+
+        for _ in range(3):
+            cache.put('TST', numpy.arange(100), numpy.full(100, 2.0), 'Test', 'USD')
+
+        arenas = list(tmp_path.glob('arena-*.bin'))
+        assert len(arenas) == 1
+        assert arenas[0].stat().st_size <= 2 * 16 * 100
+        assert before is not None and before.closes.tolist() == [1.0] * 100
+        assert (after := cache.get('TST')) is not None and after.closes.tolist() == [2.0] * 100
+
+    @pytest.mark.parametrize('length', [0, 1])
+    def test_short_histories(self, tmp_path: Path, length: int) -> None:
+        """Test that empty and single-bar histories round-trip."""
+        cache = SharedHistoryCache(tmp_path, max_age=60.0)
+        cache.put('TST', numpy.arange(length), numpy.ones(length), 'Test', 'USD')
+
+        history = cache.get('TST')
+
+        assert history is not None
+        assert history.closes.size == length
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from rebelist.momentum.infrastructure.finance import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent calls per key."""
+
+    def test_concurrent_calls_share_one_execution(self) -> None:
+        """Test that callers arriving while a call is in flight get its result without running it again."""
+        flights: SingleFlight[int] = SingleFlight()
+        started, release = Event(), Event()
+        calls: list[str] = []
+
+        def fetch(key: str) -> int:
+            calls.append(key)
+            started.set()
+            release.wait(timeout=5)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flights.do, 'TST', fetch, 'TST')
+            started.wait(timeout=5)
+            followers = [executor.submit(flights.do, 'TST', fetch, 'TST') for _ in range(3)]
+            release.set()
+
+            assert [leader.result(), *(follower.result() for follower in followers)] == [42] * 4
+        assert calls == ['TST']
+
+    def test_failures_are_shared_and_not_remembered(self) -> None:
+        """Test that the exception reaches the caller, and that the next call for the key runs afresh."""
+        flights: SingleFlight[int] = SingleFlight()
+
+        def fail() -> int:
+            raise ValueError('upstream failed')
+
+        with pytest.raises(ValueError, match='upstream failed'):
+            flights.do('TST', fail)
+
+        assert flights.do('TST', lambda: 7) == 7
+
+    def test_different_keys_run_independently(self) -> None:
+        """Test that calls for different keys are not coalesced."""
+        flights: SingleFlight[str] = SingleFlight()
+
+        assert [flights.do(key, str.upper, key) for key in ('a', 'b')] == ['A', 'B']
@@ -0,0 +1,40 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.infrastructure.finance import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+
+    def test_burst_passes_then_calls_are_spaced_at_the_rate(self, mocker: MockerFixture) -> None:
+        """Test that a full bucket serves a burst at once, and later calls wait for their token."""
+        clock = mocker.patch('rebelist.momentum.infrastructure.finance.token_bucket.monotonic', return_value=0.0)
+        sleep = mocker.patch('rebelist.momentum.infrastructure.finance.token_bucket.sleep')
+        bucket = TokenBucket(rate=2.0, capacity=3)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+        assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+
+        clock.return_value = 10.0
+        assert bucket.acquire() == 0.0
+
+    def test_tokens_refill_up_to_the_capacity(self, mocker: MockerFixture) -> None:
+        """Test that an idle bucket refills, but never beyond its capacity."""
+        clock = mocker.patch('rebelist.momentum.infrastructure.finance.token_bucket.monotonic', return_value=0.0)
+        mocker.patch('rebelist.momentum.infrastructure.finance.token_bucket.sleep')
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        clock.return_value = 100.0
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+    @pytest.mark.parametrize(('rate', 'capacity'), [(0.0, 1), (1.0, 0)])
+    def test_invalid_parameters_raise(self, rate: float, capacity: int) -> None:
+        """Test that the rate must be positive and the bucket hold at least one token."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=rate, capacity=capacity)
@@ -1,14 +1,86 @@
 from __future__ import annotations
 
-from typing import Callable, Optional
+import json
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any, Callable, ClassVar, Optional
 
+import numpy
 import pytest
-from pandas import DataFrame, Timestamp
+from pandas import DataFrame, Timestamp, concat, to_datetime
 from pytest_mock import MockerFixture
 from yfinance import Ticker
+from yfinance.exceptions import YFRateLimitError
 
-from rebelist.momentum.domain import ProviderError, Stock
-from rebelist.momentum.infrastructure.finance import YahooProvider
+from rebelist.momentum.domain import ProviderError, ReturnStatistics, Stock
+from rebelist.momentum.infrastructure.finance import PriceHistoryStore, SharedHistoryCache, TokenBucket, YahooProvider
+
+
+class _StubYahoo(BaseHTTPRequestHandler):
+    """Local stand-in for the Yahoo endpoints, counting requests and throttling the first history requests."""
+
+    requests: ClassVar[Counter[str]] = Counter()
+    throttled: ClassVar[int] = 0
+    latency: ClassVar[float] = 0.2
+
+    def do_GET(self) -> None:
+        """Answer with the metadata or history of the requested symbol."""
+        self.requests[self.path] += 1
+        time.sleep(self.latency)
+        kind, symbol = self.path.strip('/').split('/')
+
+        if kind == 'history' and self.requests[self.path] <= self.throttled:
+            self.send_response(429)
+            self.end_headers()
+            return
+
+        if kind == 'info':
+            body: dict[str, Any] = {'regularMarketPrice': 101.0, 'longName': symbol, 'currency': 'USD'}
+        else:
+            body = {'dates': ['2025-09-15', '2025-09-16', '2025-09-17'], 'closes': [100.0, 101.0, 99.5]}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keep the test output quiet."""
+
+
+class _StubTicker:
+    """Ticker stand-in fetching from the stub server through the session the provider passes in, as yfinance does."""
+
+    sessions: ClassVar[list[Any]] = []
+
+    def __init__(self, url: str, symbol: str, session: Any = None) -> None:
+        self.url, self.symbol, self.session = url, symbol, session
+        self.sessions.append(session)
+
+    @property
+    def info(self) -> dict[str, Any]:
+        """Ticker metadata."""
+        return self.__get('info')
+
+    def history(self, **_: Any) -> DataFrame:
+        """Daily closing prices."""
+        history = self.__get('history')
+        return DataFrame({'Close': history['closes']}, index=to_datetime(list[str](history['dates'])))
+
+    def __get(self, kind: str) -> dict[str, Any]:
+        response = self.session.get(f'{self.url}/{kind}/{self.symbol}')
+        if response.status_code == 429:
+            raise YFRateLimitError()
+        response.raise_for_status()
+        return response.json()
 
 
 class TestYahooProvider:
@@ -24,7 +96,7 @@ class TestYahooProvider:
         info: dict[str, str | float | None] | None = None,
         history: Optional[DataFrame] = None,
         side_effect: Exception | Callable[..., Ticker] | None = None,
-    ) -> None:
+    ) -> Ticker:
         """Ticker mock."""
         mock_ticker = mocker.MagicMock(spec=Ticker)
         if info is not None:
@@ -37,6 +109,7 @@ class TestYahooProvider:
             autospec=True,
             side_effect=side_effect,
         )
+        return mock_ticker
 
     def test_get_stock_returns_stock(self, mocker: MockerFixture) -> None:
         """Normal case returns Stock."""
@@ -52,11 +125,25 @@ class TestYahooProvider:
         assert stock.name == 'Test Stock'
         assert stock.ticker == 'TST'
         assert stock.currency == 'USD'
-        expected_history = {
-            int(Timestamp('2025-09-15').timestamp() * 1000): 100.0,
-            int(Timestamp('2025-09-16').timestamp() * 1000): 101.0,
+        expected_timestamps = [int(Timestamp(day).timestamp() * 1000) for day in ('2025-09-15', '2025-09-16')]
+        assert stock.timestamps.tolist() == expected_timestamps
+        assert stock.prices.tolist() == [100.0, 101.0]
+
+    @pytest.mark.parametrize(('code', 'exchange'), [('NMS', 'XNAS'), ('GER', 'XETR'), ('TOR', None)])
+    def test_exchange_is_taken_from_the_ticker_metadata(
+        self, mocker: MockerFixture, code: str, exchange: str | None
+    ) -> None:
+        """Test that the Yahoo exchange code is mapped to the market identifier of a calendar, when there is one."""
+        mock_history = DataFrame({'Close': [100.0, 101.0]}, index=[Timestamp('2025-09-15'), Timestamp('2025-09-16')])
+        info: dict[str, str | float | None] = {
+            'regularMarketPrice': 101.0,
+            'longName': 'Test Stock',
+            'currency': 'USD',
+            'exchange': code,
         }
-        assert stock.history == expected_history
+        self.mock_ticker(mocker, info=info, history=mock_history)
+
+        assert self.provider.get_stock('TST').exchange == exchange
 
     def test_empty_history_raises(self, mocker: MockerFixture) -> None:
         """Raises ProviderError when history is empty."""
@@ -76,7 +163,7 @@ class TestYahooProvider:
 
         stock = self.provider.get_stock('NONDATE')
         ts = int(Timestamp('2025-09-15').timestamp() * 1000)
-        assert ts in stock.history
+        assert ts in stock.timestamps
 
     def test_all_nan_close_raises(self, mocker: MockerFixture) -> None:
         """Raises ProviderError when all Close values are NaN."""
@@ -99,4 +186,219 @@ class TestYahooProvider:
 
         stock = self.provider.get_stock('PARTIAL')
         ts = int(Timestamp('2025-09-16').timestamp() * 1000)
-        assert stock.history.items() == {ts: 101.0}.items()
+        assert stock.timestamps.tolist() == [ts]
+        assert stock.prices.tolist() == [101.0]
+
+    def test_store_appends_only_new_bars_on_warm_fetch(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """A stored history is extended with the bars downloaded since its last stored dates."""
+        provider = YahooProvider(PriceHistoryStore(tmp_path))
+        cold_history = DataFrame(
+            {'Close': [100.0, 101.0, 102.0]},
+            index=[Timestamp('2025-09-15'), Timestamp('2025-09-16'), Timestamp('2025-09-17')],
+        )
+        warm_history = DataFrame(
+            {'Close': [101.0, 102.5, 103.0]},
+            index=[Timestamp('2025-09-16'), Timestamp('2025-09-17'), Timestamp('2025-09-18')],
+        )
+        ticker = self.mock_ticker(mocker, info={'regularMarketPrice': 103.0, 'longName': 'Test', 'currency': 'USD'})
+        history = mocker.patch.object(ticker, 'history', side_effect=[cold_history, warm_history])
+
+        provider.get_stock('TST')
+        stock = provider.get_stock('TST')
+
+        assert history.call_args_list[0].kwargs['period'] == 'max'
+        assert str(history.call_args_list[1].kwargs['start']) == '2025-09-16'
+        assert stock.prices.tolist() == [100.0, 101.0, 102.5, 103.0]
+        assert stock.statistics == ReturnStatistics.from_prices(stock.prices)
+        assert provider.fetch_latency['cold'].count == 1
+        assert provider.fetch_latency['warm'].count == 1
+
+    def test_store_refetches_everything_after_adjustment(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """A warm fetch whose settled bars no longer match the store falls back to a full download."""
+        provider = YahooProvider(PriceHistoryStore(tmp_path))
+        dates = [Timestamp('2025-09-15'), Timestamp('2025-09-16'), Timestamp('2025-09-17')]
+        cold_history = DataFrame({'Close': [100.0, 101.0, 102.0]}, index=dates)
+        adjusted_history = DataFrame({'Close': [50.5, 51.0]}, index=dates[1:])
+        full_history = DataFrame({'Close': [50.0, 50.5, 51.0]}, index=dates)
+        ticker = self.mock_ticker(mocker, info={'regularMarketPrice': 51.0, 'longName': 'Test', 'currency': 'USD'})
+        history = mocker.patch.object(ticker, 'history', side_effect=[cold_history, adjusted_history, full_history])
+
+        provider.get_stock('TST')
+        stock = provider.get_stock('TST')
+
+        assert history.call_args_list[2].kwargs['period'] == 'max'
+        assert stock.prices.tolist() == [50.0, 50.5, 51.0]
+
+    def test_store_keeps_history_when_no_new_bars(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """A warm fetch without any downloaded bar keeps serving the stored history."""
+        provider = YahooProvider(PriceHistoryStore(tmp_path))
+        cold_history = DataFrame({'Close': [100.0, 101.0]}, index=[Timestamp('2025-09-15'), Timestamp('2025-09-16')])
+        ticker = self.mock_ticker(mocker, info={'regularMarketPrice': 101.0, 'longName': 'Test', 'currency': 'USD'})
+        mocker.patch.object(ticker, 'history', side_effect=[cold_history, DataFrame()])
+
+        provider.get_stock('TST')
+        stock = provider.get_stock('TST')
+
+        assert stock.prices.tolist() == [100.0, 101.0]
+
+    def test_store_is_only_written_when_the_history_changed(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """A warm fetch that downloads the stored bars again does not rewrite the store."""
+        store = PriceHistoryStore(tmp_path)
+        provider = YahooProvider(store)
+        dates = [Timestamp('2025-09-15'), Timestamp('2025-09-16'), Timestamp('2025-09-17')]
+        cold_history = DataFrame({'Close': [100.0, 101.0, 102.0]}, index=dates)
+        repeated_history = DataFrame({'Close': [101.0, 102.0]}, index=dates[1:])
+        updated_history = DataFrame({'Close': [101.0, 102.5]}, index=dates[1:])
+        ticker = self.mock_ticker(mocker, info={'regularMarketPrice': 102.0, 'longName': 'Test', 'currency': 'USD'})
+        mocker.patch.object(ticker, 'history', side_effect=[cold_history, repeated_history, updated_history])
+        save = mocker.spy(store, 'save')
+
+        provider.get_stock('TST')
+        provider.get_stock('TST')
+        stock = provider.get_stock('TST')
+
+        assert save.call_count == 2
+        assert stock.prices.tolist() == [100.0, 101.0, 102.5]
+
+    def test_shared_history_is_served_to_other_workers_without_download(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """A history downloaded by one worker is served to another one from the shared cache."""
+        dates = [Timestamp('2025-09-15'), Timestamp('2025-09-16'), Timestamp('2025-09-17')]
+        history = DataFrame({'Close': [100.0, 101.0, 99.5]}, index=dates)
+        ticker = self.mock_ticker(mocker, info={'regularMarketPrice': 99.5, 'longName': 'Test', 'currency': 'USD'})
+        download = mocker.patch.object(ticker, 'history', return_value=history)
+        first = YahooProvider(shared=SharedHistoryCache(tmp_path, max_age=60.0))
+        second = YahooProvider(shared=SharedHistoryCache(tmp_path, max_age=60.0))
+
+        downloaded = first.get_stock('TST')
+        shared = second.get_stock('TST')
+
+        download.assert_called_once()
+        assert shared == downloaded
+        assert shared.statistics == ReturnStatistics.from_prices(shared.prices)
+        assert second.fetch_latency['shared'].count == 1
+        assert second.fetch_latency['cold'].count == 0
+
+    def test_get_stocks_only_downloads_symbols_missing_from_the_shared_cache(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Symbols another worker published are served from the shared cache and left out of the batch download."""
+        dates = [Timestamp('2025-09-15'), Timestamp('2025-09-16')]
+        shared = SharedHistoryCache(tmp_path, max_age=60.0)
+        shared.put('AAA', numpy.array([1, 2]), numpy.array([10.0, 11.0]), 'Cached', 'USD')
+        batch = concat({'BBB': DataFrame({'Close': [20.0, 21.0]}, index=dates)}, axis=1)
+        self.mock_ticker(mocker, info={'regularMarketPrice': 1.0, 'longName': 'Test', 'currency': 'USD'})
+        download = mocker.patch(
+            'rebelist.momentum.infrastructure.finance.yahoo_provider.client.download', return_value=batch
+        )
+
+        stocks = YahooProvider(shared=shared).get_stocks(['AAA', 'BBB'])
+
+        assert download.call_args.args[0] == ['BBB']
+        assert [(stock.ticker, stock.name) for stock in stocks] == [('AAA', 'Cached'), ('BBB', 'Test')]
+        assert stocks[0].prices.tolist() == [10.0, 11.0]
+
+    def test_get_stocks_downloads_all_histories_in_one_batch(self, mocker: MockerFixture) -> None:
+        """Several stocks are downloaded in a single batch request and split per symbol."""
+        dates = [Timestamp('2025-09-15'), Timestamp('2025-09-16')]
+        batch = concat(
+            {
+                'AAA': DataFrame({'Close': [10.0, 11.0]}, index=dates),
+                'BBB': DataFrame({'Close': [float('nan'), 21.0]}, index=dates),
+            },
+            axis=1,
+        )
+        self.mock_ticker(mocker, info={'regularMarketPrice': 1.0, 'longName': 'Test', 'currency': 'USD'})
+        download = mocker.patch(
+            'rebelist.momentum.infrastructure.finance.yahoo_provider.client.download', return_value=batch
+        )
+
+        stocks = self.provider.get_stocks(['AAA', 'BBB'])
+
+        download.assert_called_once()
+        assert download.call_args.args[0] == ['AAA', 'BBB']
+        assert download.call_args.kwargs['period'] == 'max'
+        assert [stock.ticker for stock in stocks] == ['AAA', 'BBB']
+        assert stocks[0].prices.tolist() == [10.0, 11.0]
+        assert stocks[1].prices.tolist() == [21.0]
+
+    def test_get_stocks_missing_symbol_raises(self, mocker: MockerFixture) -> None:
+        """A symbol absent from the batch download raises ProviderError."""
+        batch = concat({'AAA': DataFrame({'Close': [10.0]}, index=[Timestamp('2025-09-15')])}, axis=1)
+        self.mock_ticker(mocker, info={'regularMarketPrice': 1.0, 'longName': 'Test', 'currency': 'USD'})
+        mocker.patch('rebelist.momentum.infrastructure.finance.yahoo_provider.client.download', return_value=batch)
+
+        with pytest.raises(ProviderError):
+            self.provider.get_stocks(['AAA', 'ZZZ'])
+
+
+class TestYahooProviderUpstream:
+    """Tests of the upstream traffic of YahooProvider, against a local stub HTTP server."""
+
+    @pytest.fixture
+    def stub(self, mocker: MockerFixture) -> Iterator[type[_StubYahoo]]:
+        """Serve the stub endpoints and route the provider's tickers to them."""
+        _StubYahoo.requests, _StubYahoo.throttled, _StubYahoo.latency, _StubTicker.sessions = Counter(), 0, 0.2, []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StubYahoo)
+        Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        mocker.patch('rebelist.momentum.infrastructure.finance.yahoo_provider.Ticker', partial(_StubTicker, url))
+
+        yield _StubYahoo
+
+        server.shutdown()
+        server.server_close()
+
+    def test_concurrent_requests_for_a_symbol_make_one_upstream_fetch(self, stub: type[_StubYahoo]) -> None:
+        """Many users opening the same ticker at once cause a single metadata and history request."""
+        provider = YahooProvider()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            stocks = list(executor.map(provider.get_stock, ['TST'] * 8))
+
+        assert stub.requests == {'/info/TST': 1, '/history/TST': 1}
+        assert all(stock is stocks[0] for stock in stocks)
+        assert stocks[0].prices.tolist() == [100.0, 101.0, 99.5]
+
+    def test_sequential_requests_reuse_one_pooled_session(self, stub: type[_StubYahoo]) -> None:
+        """Requests that do not overlap fetch again, through the same HTTP session."""
+        provider = YahooProvider()
+
+        provider.get_stock('AAA')
+        provider.get_stock('AAA')
+        provider.get_stock('BBB')
+
+        assert stub.requests == {'/info/AAA': 2, '/history/AAA': 2, '/info/BBB': 1, '/history/BBB': 1}
+        assert len({id(session) for session in _StubTicker.sessions}) == 1
+
+    def test_throttled_requests_are_retried(self, stub: type[_StubYahoo], mocker: MockerFixture) -> None:
+        """Throttled upstream calls are retried with exponential backoff until they succeed."""
+        sleep = mocker.patch('rebelist.momentum.infrastructure.finance.yahoo_provider.sleep')
+        stub.throttled = 2
+
+        stock = YahooProvider(retries=3, backoff=0.5).get_stock('TST')
+
+        assert stock.prices.size == 3
+        assert stub.requests['/history/TST'] == 3
+        first, second = (call.args[0] for call in sleep.call_args_list)
+        assert 0.25 <= first <= 0.75 and 0.5 <= second <= 1.5
+
+    def test_persistent_throttling_raises_after_the_retries(self, stub: type[_StubYahoo]) -> None:
+        """A call still throttled after every retry fails with ProviderError."""
+        stub.throttled = 10
+
+        with pytest.raises(ProviderError):
+            YahooProvider(retries=1, backoff=0.0).get_stock('TST')
+
+        assert stub.requests['/history/TST'] == 2
+
+    def test_upstream_calls_wait_for_the_rate_limit(self, stub: type[_StubYahoo], mocker: MockerFixture) -> None:
+        """Every upstream call takes a token from the rate limiter first."""
+        stub.latency = 0.0
+        rate_limit = TokenBucket(rate=1_000.0, capacity=1)
+        acquire = mocker.spy(rate_limit, 'acquire')
+
+        YahooProvider(rate_limit=rate_limit).get_stock('TST')
+
+        assert acquire.call_count == sum(stub.requests.values()) == 2
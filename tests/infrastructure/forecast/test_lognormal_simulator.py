@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import numpy
+import pytest
+
+from rebelist.momentum.domain import Stock
+from rebelist.momentum.infrastructure.forecast import LognormalSimulator, MonteCarloSimulator
+
+
+def random_walk(seed: int) -> Stock:
+    """Stock with a year of random-walk history."""
+    generator = numpy.random.default_rng(seed)
+    prices = 100.0 * numpy.exp(numpy.cumsum(generator.normal(0.0004, 0.012, size=250)))
+    start = datetime(2024, 9, 17, 10, 0, 0)
+    history = {int((start + timedelta(days=i)).timestamp() * 1000): float(p) for i, p in enumerate(prices)}
+
+    return Stock.from_history('RandomWalk', 'RWK', 'USD', history)
+
+
+class TestLognormalSimulator:
+    """Tests for the closed-form lognormal simulator."""
+
+    def test_bands_are_the_lognormal_percentiles(self) -> None:
+        """Test that the median is the drift line and the bands sit symmetrically around it in log space."""
+        stock = random_walk(1)
+        statistics = stock.return_statistics
+
+        forecast = LognormalSimulator().simulate(stock, simulation_count=1, forecast_length=250)
+
+        days = numpy.arange(1, 251)
+        last_price = float(stock.prices[-1])
+        numpy.testing.assert_allclose(forecast.median, last_price * numpy.exp(statistics.mean * days), atol=0.005)
+        numpy.testing.assert_allclose(
+            numpy.log(forecast.upper) + numpy.log(forecast.lower), 2 * numpy.log(forecast.median), atol=1e-3
+        )
+        assert forecast.timestamps.size == 250 and forecast.precision == 0.0
+
+    def test_monte_carlo_converges_to_the_closed_form(self) -> None:
+        """Test that the Monte Carlo bands approach the analytic ones as the number of paths grows."""
+        stock = random_walk(2)
+        exact = LognormalSimulator().simulate(stock, simulation_count=0, forecast_length=60)
+
+        errors = []
+        for paths in (500, 5_000, 50_000):
+            sampled = MonteCarloSimulator().simulate(stock, simulation_count=paths, forecast_length=60, seed=8)
+            bands = zip(
+                (sampled.lower, sampled.median, sampled.upper), (exact.lower, exact.median, exact.upper), strict=True
+            )
+            errors.append(max(float(numpy.max(numpy.abs(band / reference - 1))) for band, reference in bands))
+
+        assert errors[0] > errors[1] > errors[2]
+        assert errors[2] < 0.005
+        numpy.testing.assert_array_equal(sampled.timestamps, exact.timestamps)
+
+    def test_sweep_simulates_every_length(self) -> None:
+        """Test that the default sweep returns one forecast per distinct length, in order."""
+        stock = random_walk(4)
+        simulator = LognormalSimulator()
+
+        sweep = simulator.sweep(stock, simulation_count=1, forecast_lengths=[30, 10, 30])
+
+        assert list(sweep) == [10, 30]
+        assert sweep[10] == simulator.simulate(stock, simulation_count=1, forecast_length=10)
+
+    def test_empty_history_raises(self) -> None:
+        """Test that a stock without prices cannot be forecast."""
+        with pytest.raises(ValueError, match='The stock has no price history.'):
+            LognormalSimulator().simulate(Stock.from_history('Empty', 'EMP', 'USD', {}), 10, 5)
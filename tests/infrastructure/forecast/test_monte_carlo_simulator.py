@@ -1,10 +1,47 @@
-from datetime import datetime, timedelta
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from statistics import NormalDist
+from typing import Any
 
+import numpy
 import pytest
 from pytest_mock import MockerFixture
 
-from rebelist.momentum.domain import Forecast, Stock
+from rebelist.momentum.domain import (
+    Distribution,
+    Forecast,
+    HitProbability,
+    MaximumDrawdown,
+    ReturnStatistics,
+    Stock,
+    TerminalDistribution,
+)
 from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator
+from rebelist.momentum.telemetry import Telemetry
+
+
+def reference_simulation(stock: Stock, simulation_count: int, forecast_length: int) -> numpy.ndarray:
+    """Original per-path, per-day loop implementation, kept as the statistical reference for the vectorized engine."""
+    prices = stock.prices
+    returns = numpy.log(prices[1:] / prices[:-1])
+    average_daily_move = float(returns.mean())
+    standard_deviation = float(returns.std(ddof=1))
+
+    all_simulations = numpy.zeros((simulation_count, forecast_length), dtype=float)
+    for sim in range(simulation_count):
+        price = float(prices[-1])
+        for day in range(forecast_length):
+            shock = numpy.random.normal(average_daily_move, standard_deviation)
+            price = price * numpy.exp(shock)
+            all_simulations[sim, day] = price
+
+    return all_simulations
+
+
+def moment_stock(average_daily_move: float, standard_deviation: float) -> Stock:
+    """Stock priced at 100 whose return moments are given, so that its bands have closed-form quantiles."""
+    statistics = ReturnStatistics(250, average_daily_move, standard_deviation)
+    return Stock('Moments', 'MOM', 'USD', numpy.array([0, 86_400_000]), numpy.full(2, 100.0), statistics)
 
 
 class TestMonteCarloSimulator:
@@ -15,7 +52,7 @@ class TestMonteCarloSimulator:
         # Prepare a stock with some history
         now = datetime(2025, 9, 17, 10, 0, 0)
         timestamps: dict[int, float] = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + i for i in range(10)}
-        stock = Stock(name='TestStock', ticker='TST', currency='USD', history=timestamps)
+        stock = Stock.from_history('TestStock', 'TST', 'USD', timestamps)
 
         simulator = MonteCarloSimulator()
         forecast_length = 5
@@ -28,34 +65,407 @@ class TestMonteCarloSimulator:
         assert len(forecast.lower) == forecast_length
         assert len(forecast.upper) == forecast_length
 
-        for lower, median, upper in zip(forecast.lower, forecast.median, forecast.upper, strict=True):
-            assert isinstance(lower, tuple) and len(lower) == 2
-            assert isinstance(median, tuple) and len(median) == 2
-            assert isinstance(upper, tuple) and len(upper) == 2
-            assert lower[1] <= median[1] <= upper[1]
+        assert forecast.timestamps.dtype == numpy.int64 and len(forecast.timestamps) == forecast_length
+        assert numpy.all(forecast.lower <= forecast.median) and numpy.all(forecast.median <= forecast.upper)
+        assert not forecast.upper.flags.writeable
+
+    def test_forecast_dates_follow_the_exchange_calendar(self) -> None:
+        """Test that forecast days are the trading days of the stock's exchange, holidays skipped."""
+        last_bar = int(datetime(2025, 12, 23, 5, tzinfo=timezone.utc).timestamp() * 1000)
+        timestamps = last_bar - 86_400_000 * numpy.arange(3)[::-1]
+        stock = Stock('Calendar', 'CAL', 'USD', timestamps, numpy.array([100.0, 102.0, 101.0]))
+        listed = Stock('Calendar', 'CAL', 'USD', stock.timestamps, stock.prices, exchange='XNYS')
+
+        weekdays = MonteCarloSimulator().simulate(stock, 10, 3, seed=1).timestamps.astype('datetime64[ms]')
+        trading_days = MonteCarloSimulator().simulate(listed, 10, 3, seed=1).timestamps.astype('datetime64[ms]')
+
+        assert weekdays.astype('datetime64[D]').astype(str).tolist() == ['2025-12-24', '2025-12-25', '2025-12-26']
+        assert trading_days.astype('datetime64[D]').astype(str).tolist() == ['2025-12-24', '2025-12-26', '2025-12-29']
 
     def test_simulate_raises_error_on_empty_history(self) -> None:
-        """Test that simulate raises ValueError when stock.history is empty."""
-        stock = Stock(name='EmptyStock', ticker='EMP', currency='USD', history={})
+        """Test that simulate raises ValueError when the stock has no prices."""
+        stock = Stock.from_history('EmptyStock', 'EMP', 'USD', {})
         simulator = MonteCarloSimulator()
         with pytest.raises(ValueError, match='The stock has no price history.'):
             simulator.simulate(stock, simulation_count=10, forecast_length=5)
 
-    def test_simulate_with_constant_prices(self, mocker: MockerFixture) -> None:
-        """Test simulate behavior when stock prices are constant with deterministic randomness."""
+    def test_simulate_with_constant_prices(self) -> None:
+        """Test simulate behavior when stock prices are constant, which leaves no room for randomness."""
         now = datetime(2025, 9, 17, 10, 0, 0)
         timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100.0 for i in range(10)}
-        stock = Stock(name='ConstantStock', ticker='CONST', currency='USD', history=timestamps)
-
-        mocker.patch('numpy.random.normal', return_value=0.0, autospec=True)
+        stock = Stock.from_history('ConstantStock', 'CONST', 'USD', timestamps)
 
         simulator = MonteCarloSimulator()
         forecast = simulator.simulate(stock, simulation_count=50, forecast_length=3)
 
-        last_price = 100.0
-        for _, price in forecast.median:
-            assert price == last_price
-        for _, price in forecast.lower:
-            assert price == last_price
-        for _, price in forecast.upper:
-            assert price == last_price
+        for band in (forecast.lower, forecast.median, forecast.upper):
+            assert numpy.all(band == 100.0)
+
+    def test_simulate_is_reproducible_with_seed(self) -> None:
+        """Test that two runs seeded alike produce identical forecasts."""
+        now = datetime(2025, 9, 17, 10, 0, 0)
+        timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + (i % 3) for i in range(30)}
+        stock = Stock.from_history('SeededStock', 'SEED', 'USD', dict(sorted(timestamps.items())))
+
+        simulator = MonteCarloSimulator()
+        first = simulator.simulate(stock, simulation_count=200, forecast_length=20, seed=7)
+        second = simulator.simulate(stock, simulation_count=200, forecast_length=20, seed=7)
+
+        assert first == second
+
+    def test_simulate_matches_reference_distribution(self) -> None:
+        """Test that the vectorized engine reproduces the bands of the original per-path loop."""
+        generator = numpy.random.default_rng(2025)
+        prices = 100.0 * numpy.exp(numpy.cumsum(generator.normal(0.0005, 0.01, size=250)))
+        start = datetime(2024, 9, 17, 10, 0, 0)
+        history = {int((start + timedelta(days=i)).timestamp() * 1000): float(p) for i, p in enumerate(prices)}
+        stock = Stock.from_history('RandomWalk', 'RWK', 'USD', history)
+        simulation_count, forecast_length = 4000, 20
+
+        numpy.random.seed(2025)
+        reference = reference_simulation(stock, simulation_count, forecast_length)
+        forecast = MonteCarloSimulator().simulate(stock, simulation_count, forecast_length, seed=2025)
+
+        expected = {
+            'lower': numpy.percentile(reference, MonteCarloSimulator.LOWER_PERCENTIL, axis=0),
+            'median': numpy.median(reference, axis=0),
+            'upper': numpy.percentile(reference, MonteCarloSimulator.UPPER_PERCENTIL, axis=0),
+        }
+        actual = {'lower': forecast.lower, 'median': forecast.median, 'upper': forecast.upper}
+
+        for band, values in expected.items():
+            numpy.testing.assert_allclose(actual[band], values, rtol=0.01, err_msg=f'{band} band drifted')
+
+    def test_streaming_mode_matches_exact_bands(self) -> None:
+        """Test that simulating in chunks through the quantile sketch agrees with the exact dense reduction."""
+        generator = numpy.random.default_rng(3)
+        prices = 100.0 * numpy.exp(numpy.cumsum(generator.normal(0.0, 0.015, size=250)))
+        start = datetime(2024, 9, 17, 10, 0, 0)
+        history = {int((start + timedelta(days=i)).timestamp() * 1000): float(p) for i, p in enumerate(prices)}
+        stock = Stock.from_history('RandomWalk', 'RWK', 'USD', history)
+
+        exact = MonteCarloSimulator().simulate(stock, simulation_count=20_000, forecast_length=30, seed=5)
+        streamed = MonteCarloSimulator(chunk_size=1_500, streaming_threshold=5_000).simulate(
+            stock, simulation_count=20_000, forecast_length=30, seed=5
+        )
+
+        for exact_band, streamed_band in zip(
+            (exact.lower, exact.median, exact.upper), (streamed.lower, streamed.median, streamed.upper), strict=True
+        ):
+            numpy.testing.assert_allclose(streamed_band, exact_band, rtol=0.01)
+
+    @pytest.mark.parametrize('streaming_threshold', [100_000, 1_000])
+    def test_seeded_output_does_not_depend_on_worker_count(self, streaming_threshold: int) -> None:
+        """Test that a seeded run is bit-identical on one or several workers, in exact and streaming mode."""
+        now = datetime(2025, 9, 17, 10, 0, 0)
+        timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + (i % 5) for i in range(60)}
+        stock = Stock.from_history('Parallel', 'PAR', 'USD', dict(sorted(timestamps.items())))
+
+        forecasts = [
+            MonteCarloSimulator(workers, chunk_size=700, streaming_threshold=streaming_threshold).simulate(
+                stock, simulation_count=5_000, forecast_length=15, seed=11
+            )
+            for workers in (1, 3, 8)
+        ]
+
+        assert forecasts[0] == forecasts[1] == forecasts[2]
+
+    def test_different_seeds_produce_different_forecasts(self) -> None:
+        """Test that chunk streams depend on the run's seed."""
+        now = datetime(2025, 9, 17, 10, 0, 0)
+        timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + (i % 5) for i in range(60)}
+        stock = Stock.from_history('Seeds', 'SDS', 'USD', dict(sorted(timestamps.items())))
+        simulator = MonteCarloSimulator(workers=2, chunk_size=50)
+
+        first = simulator.simulate(stock, simulation_count=500, forecast_length=10, seed=1)
+        second = simulator.simulate(stock, simulation_count=500, forecast_length=10, seed=2)
+
+        assert not numpy.array_equal(first.median, second.median)
+
+    @pytest.mark.parametrize('streaming_threshold', [100_000, 100])
+    def test_stages_are_recorded_in_telemetry(self, streaming_threshold: int) -> None:
+        """Test that path generation and the band reduction are timed as separate stages in both modes."""
+        now = datetime(2025, 9, 17, 10, 0, 0)
+        timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + (i % 5) for i in range(60)}
+        stock = Stock.from_history('Timed', 'TMD', 'USD', timestamps)
+        telemetry = Telemetry()
+
+        MonteCarloSimulator(streaming_threshold=streaming_threshold, telemetry=telemetry).simulate(stock, 500, 10)
+
+        assert {stage: snapshot.count for stage, snapshot in telemetry.durations().items()} == {
+            'simulator.paths': 1,
+            'simulator.reduce': 1,
+        }
+
+    @pytest.mark.parametrize('streaming_threshold', [100_000, 1_000])
+    def test_progressive_estimates_end_with_the_complete_forecast(self, streaming_threshold: int) -> None:
+        """Test that every batch has as many paths as all the previous ones, the last matching a one-off simulation."""
+        now = datetime(2025, 9, 17, 10, 0, 0)
+        timestamps = {int((now - timedelta(days=i)).timestamp() * 1000): 100 + (i % 7) for i in range(60)}
+        stock = Stock.from_history('Progressive', 'PRG', 'USD', timestamps)
+        simulator = MonteCarloSimulator(workers=2, chunk_size=500, streaming_threshold=streaming_threshold)
+
+        estimates = list(simulator.simulate_progressively(stock, simulation_count=3_200, forecast_length=20, seed=9))
+
+        assert [estimate.paths for estimate in estimates] == [64, 192, 448, 1_448, 3_200]
+        assert estimates[-1] == simulator.simulate(stock, simulation_count=3_200, forecast_length=20, seed=9)
+        assert not numpy.array_equal(estimates[0].upper, estimates[-1].upper)
+
+    @pytest.mark.parametrize('simulation_count', [100, 1_000, 10_000])
+    def test_progressive_runs_of_dashboard_sizes_refine_their_estimates(self, simulation_count: int) -> None:
+        """Test that the path counts the dashboard asks for are estimated more than once, from a few dozen paths up."""
+        estimates = list(MonteCarloSimulator().simulate_progressively(moment_stock(0.0, 0.01), simulation_count, 30))
+
+        assert len(estimates) > 1
+        assert estimates[0].paths == MonteCarloSimulator.FIRST_CHUNK_SIZE
+        assert estimates[-1].paths == simulation_count
+
+    def test_adaptive_run_stops_once_the_bands_are_precise_enough(self) -> None:
+        """Test that a calm stock converges on fewer paths than a volatile one, both reporting what they reached."""
+        simulator = MonteCarloSimulator(chunk_size=250, tolerance=0.005)
+
+        calm = simulator.simulate(moment_stock(0.0003, 0.005), simulation_count=100_000, forecast_length=60, seed=2)
+        volatile = simulator.simulate(moment_stock(0.0003, 0.03), simulation_count=100_000, forecast_length=60, seed=2)
+
+        assert calm.paths is not None and volatile.paths is not None
+        assert calm.paths < volatile.paths <= 100_000
+        assert calm.precision is not None and calm.precision <= 0.005
+        assert volatile.precision is not None and volatile.precision <= 0.005
+
+    def test_adaptive_run_stops_at_the_path_budget(self) -> None:
+        """Test that an unreachable tolerance uses the whole budget and reports the precision it got to."""
+        forecast = MonteCarloSimulator(chunk_size=100, tolerance=1e-6).simulate(
+            moment_stock(0.0, 0.02), simulation_count=2_000, forecast_length=20, seed=1
+        )
+
+        assert forecast.paths == 2_000
+        assert forecast.precision is not None and forecast.precision > 1e-6
+
+    def test_antithetic_sampling_centres_the_median_exactly(self) -> None:
+        """Test that mirrored paths put the median on the drift line, whatever the seed."""
+        forecast = MonteCarloSimulator(sampling='antithetic').simulate(moment_stock(0.001, 0.02), 1_000, 30, seed=4)
+
+        expected = 100.0 * numpy.exp(0.001 * numpy.arange(1, 31))
+        numpy.testing.assert_allclose(forecast.median, expected, atol=0.01)
+
+    def test_sobol_sampling_matches_exact_quantiles_with_few_paths(self) -> None:
+        """Test that quasi-random paths land close to the exact bands, the same on any number of workers."""
+        pytest.importorskip('scipy')
+        stock = moment_stock(0.0005, 0.015)
+        days = numpy.arange(1, 61)
+
+        forecasts = [
+            MonteCarloSimulator(workers, chunk_size=512, sampling='sobol').simulate(stock, 4_096, 60, seed=3)
+            for workers in (1, 4)
+        ]
+
+        assert forecasts[0] == forecasts[1]
+        for band, percentile in ((forecasts[0].lower, 0.1), (forecasts[0].median, 0.5), (forecasts[0].upper, 0.9)):
+            exact = 100.0 * numpy.exp(0.0005 * days + 0.015 * numpy.sqrt(days) * NormalDist().inv_cdf(percentile))
+            numpy.testing.assert_allclose(band, exact, rtol=0.005)
+
+    def test_sobol_sampling_without_scipy_raises(self, mocker: MockerFixture) -> None:
+        """Test that choosing Sobol sampling without the optional dependency fails on construction."""
+        mocker.patch(
+            'rebelist.momentum.infrastructure.forecast.monte_carlo_simulator.import_module', side_effect=ImportError
+        )
+
+        with pytest.raises(RuntimeError, match='scipy'):
+            MonteCarloSimulator(sampling='sobol')
+
+    @pytest.mark.parametrize('sampling', MonteCarloSimulator.SAMPLING_MODES)
+    def test_single_precision_bands_match_double_precision_accuracy(self, sampling: str) -> None:
+        """Test that float32 paths land as close to the exact quantiles as float64 paths do, in every sampling mode."""
+        if sampling == 'sobol':
+            pytest.importorskip('scipy')
+        stock = moment_stock(0.0005, 0.015)
+        days = numpy.arange(1, 121)
+        exact = numpy.array(
+            [
+                100.0 * numpy.exp(0.0005 * days + 0.015 * numpy.sqrt(days) * NormalDist().inv_cdf(percentile))
+                for percentile in (0.1, 0.5, 0.9)
+            ]
+        )
+        errors = {}
+
+        for dtype in MonteCarloSimulator.DTYPES:
+            forecast = MonteCarloSimulator(sampling=sampling, dtype=dtype).simulate(stock, 20_000, 120, seed=5)
+            bands = (forecast.lower, forecast.median, forecast.upper)
+            assert forecast.median.dtype == numpy.float64
+            errors[dtype] = float(numpy.abs(numpy.array(bands) / exact - 1).max())
+
+        assert errors['float32'] < 0.01
+        assert errors['float32'] < 2 * errors['float64'] + 0.001
+
+    def test_single_precision_halves_peak_memory(self) -> None:
+        """Test that float32 paths take about half the memory, and that the bands need no copy of the path buffer."""
+        stock = moment_stock(0.0005, 0.015)
+        buffer_bytes = 50_000 * 120 * 8
+        peaks = {}
+
+        for dtype in MonteCarloSimulator.DTYPES:
+            simulator = MonteCarloSimulator(chunk_size=4_096, dtype=dtype)
+            tracemalloc.start()
+            try:
+                simulator.simulate(stock, 50_000, 120, seed=1)
+                peaks[dtype] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        assert peaks['float64'] < 1.25 * buffer_bytes
+        assert peaks['float32'] < 0.6 * peaks['float64']
+
+    @pytest.mark.parametrize('streaming_threshold', [100_000, 1_000])
+    def test_path_analytics_match_closed_forms(self, streaming_threshold: int) -> None:
+        """Test that reducers see every path once, on any number of workers, and agree with the driftless walk."""
+        stock = moment_stock(0.0, 0.02)
+        reducers = (HitProbability(120.0), MaximumDrawdown(), TerminalDistribution())
+
+        forecasts = [
+            MonteCarloSimulator(workers, chunk_size=1_000, streaming_threshold=streaming_threshold).simulate(
+                stock, 20_000, 60, seed=8, reducers=reducers
+            )
+            for workers in (1, 4)
+        ]
+
+        assert forecasts[0] == forecasts[1]
+        analytics = forecasts[0].analytics
+        # Closes are watched daily, which shifts the barrier of the continuous reflection principle by 0.5826 sd.
+        barrier = (numpy.log(1.2) + 0.5826 * 0.02) / (0.02 * numpy.sqrt(60))
+        assert analytics['hit_probability[120]'] == pytest.approx(2 * (1 - NormalDist().cdf(barrier)), abs=0.015)
+        terminal, drawdown = analytics['terminal_distribution'], analytics['maximum_drawdown']
+        assert isinstance(terminal, Distribution) and isinstance(drawdown, Distribution)
+        assert terminal.cumulative(100.0) == pytest.approx(0.5, abs=0.02)
+        assert drawdown.probabilities.sum() == pytest.approx(1.0)
+        assert 0.0 < drawdown.quantile(0.5) < 0.5
+
+    def test_progressive_analytics_cover_the_paths_simulated_so_far(self) -> None:
+        """Test that every estimate carries the analytics of its own paths, the last those of the whole run."""
+        simulator = MonteCarloSimulator(chunk_size=500)
+        stock, reducers = moment_stock(0.0, 0.01), (HitProbability(105.0),)
+
+        estimates = list(simulator.simulate_progressively(stock, 3_500, 20, seed=2, reducers=reducers))
+        complete = simulator.simulate(stock, 3_500, 20, seed=2, reducers=reducers)
+
+        assert [estimate.paths for estimate in estimates] == [64, 192, 448, 1_448, 3_448, 3_500]
+        assert estimates[-1].analytics == complete.analytics
+        assert estimates[0].analytics['hit_probability[105]'] != complete.analytics['hit_probability[105]']
+
+    @pytest.mark.parametrize(
+        ('sampling', 'dtype', 'streaming'),
+        [('pseudo', 'float64', 100_000), ('antithetic', 'float32', 100_000), ('pseudo', 'float64', 1_000)],
+    )
+    def test_shorter_horizons_are_prefixes_of_longer_ones(self, sampling: str, dtype: str, streaming: int) -> None:
+        """Test that the first days of a long forecast are bit-identical to a shorter forecast from the same seed."""
+        simulator = MonteCarloSimulator(
+            chunk_size=700, streaming_threshold=streaming, sampling=sampling, dtype=dtype, horizon_cache_size=0
+        )
+        stock = moment_stock(0.0005, 0.015)
+
+        long = simulator.simulate(stock, 3_000, 90, seed=6)
+        short = simulator.simulate(stock, 3_000, 30, seed=6)
+
+        assert short.timestamps.tolist() == long.timestamps[:30].tolist()
+        for band in ('lower', 'median', 'upper'):
+            numpy.testing.assert_array_equal(getattr(short, band), getattr(long, band)[:30])
+
+    def test_shorter_horizons_are_sliced_from_the_cached_forecast(self) -> None:
+        """Test that a shorter horizon of the same history, seed and path count generates no paths."""
+        telemetry = Telemetry()
+        simulator = MonteCarloSimulator(telemetry=telemetry)
+        stock = moment_stock(0.0005, 0.015)
+
+        simulator.simulate(stock, 2_000, 120, seed=3)
+        short = simulator.simulate(stock, 2_000, 40, seed=3)
+        estimates = list(simulator.simulate_progressively(stock, 2_000, 80, seed=3))
+        other_seed = simulator.simulate(stock, 2_000, 40, seed=4)
+
+        assert telemetry.durations()['simulator.paths'].count == 2
+        assert short == MonteCarloSimulator(horizon_cache_size=0).simulate(stock, 2_000, 40, seed=3)
+        assert len(estimates) == 1 and estimates[0].median.size == 80
+        assert other_seed != short
+
+    def test_shorter_horizons_are_sliced_with_their_analytics(self) -> None:
+        """Test that the analytics of a shorter horizon are finished from the cached run, as long as it had them."""
+        telemetry = Telemetry()
+        simulator = MonteCarloSimulator(chunk_size=500, telemetry=telemetry, horizon_analytics=True)
+        stock = moment_stock(0.0005, 0.015)
+        reducers = (HitProbability(110.0), MaximumDrawdown(), TerminalDistribution())
+        fresh = MonteCarloSimulator(chunk_size=500, horizon_cache_size=0)
+
+        simulator.simulate(stock, 2_000, 120, seed=3, reducers=reducers)
+        short = simulator.simulate(stock, 2_000, 40, seed=3, reducers=reducers[1:])
+        *_, estimate = simulator.simulate_progressively(stock, 2_000, 80, seed=3, reducers=reducers[:1])
+        assert telemetry.durations()['simulator.paths'].count == 1
+
+        simulator.simulate(stock, 2_000, 40, seed=3, reducers=(HitProbability(90.0),))
+        assert telemetry.durations()['simulator.paths'].count == 2
+        assert short == fresh.simulate(stock, 2_000, 40, seed=3, reducers=reducers[1:])
+        assert estimate == fresh.simulate(stock, 2_000, 80, seed=3, reducers=reducers[:1])
+
+    def test_horizons_with_analytics_are_only_sliced_when_asked_for(self, mocker: MockerFixture) -> None:
+        """Test that by default the reducers only summarise the requested horizon, so their requests are simulated."""
+        telemetry = Telemetry()
+        simulator = MonteCarloSimulator(chunk_size=500, telemetry=telemetry)
+        stock = moment_stock(0.0005, 0.015)
+        prefixes = mocker.spy(TerminalDistribution, 'reduce_prefixes')
+
+        simulator.simulate(stock, 2_000, 120, seed=3, reducers=(TerminalDistribution(),))
+        simulator.simulate(stock, 2_000, 40, seed=3, reducers=(TerminalDistribution(),))
+        short = simulator.simulate(stock, 2_000, 40, seed=3)
+
+        prefixes.assert_not_called()
+        assert telemetry.durations()['simulator.paths'].count == 2
+        assert short == MonteCarloSimulator(chunk_size=500, horizon_cache_size=0).simulate(stock, 2_000, 40, seed=3)
+
+    def test_unseeded_runs_are_not_cached(self) -> None:
+        """Test that runs without a seed draw fresh paths every time, even for a horizon a cached run covers."""
+        telemetry = Telemetry()
+        simulator = MonteCarloSimulator(telemetry=telemetry)
+        stock = moment_stock(0.0005, 0.015)
+
+        first = simulator.simulate(stock, 2_000, 60)
+        second = simulator.simulate(stock, 2_000, 60)
+        shorter = simulator.simulate(stock, 2_000, 30)
+
+        assert telemetry.durations()['simulator.paths'].count == 3
+        assert not numpy.array_equal(first.median, second.median)
+        assert not numpy.array_equal(shorter.median, second.median[:30])
+
+    def test_sweep_forecasts_every_horizon_from_one_generation(self) -> None:
+        """Test that a sweep generates the longest horizon once and matches a simulation per horizon, analytics too."""
+        telemetry = Telemetry()
+        stock = moment_stock(0.0, 0.02)
+        reducers = (HitProbability(110.0), TerminalDistribution())
+
+        sweep = MonteCarloSimulator(chunk_size=500, telemetry=telemetry).sweep(
+            stock, 2_000, [60, 20, 40, 20], seed=5, reducers=reducers
+        )
+        separate = MonteCarloSimulator(chunk_size=500, horizon_cache_size=0)
+
+        assert list(sweep) == [20, 40, 60]
+        assert telemetry.durations()['simulator.paths'].count == 1
+        for horizon, forecast in sweep.items():
+            assert forecast == separate.simulate(stock, 2_000, horizon, seed=5, reducers=reducers)
+        early, late = (sweep[horizon].analytics['hit_probability[110]'] for horizon in (20, 60))
+        assert isinstance(early, float) and isinstance(late, float) and early < late
+
+    def test_adaptive_runs_are_not_sliced(self) -> None:
+        """Test that an adaptive run, whose path count depends on every day of its horizon, is simulated again."""
+        telemetry = Telemetry()
+        simulator = MonteCarloSimulator(chunk_size=250, tolerance=0.01, telemetry=telemetry)
+        stock = moment_stock(0.0005, 0.015)
+
+        simulator.simulate(stock, 10_000, 60, seed=1)
+        simulator.simulate(stock, 10_000, 20, seed=1)
+
+        assert telemetry.durations()['simulator.paths'].count > 2
+
+    @pytest.mark.parametrize(
+        'arguments',
+        [{'workers': 0}, {'chunk_size': 0}, {'sampling': 'lattice'}, {'tolerance': 0.0}, {'dtype': 'float16'}],
+    )
+    def test_invalid_configuration_raises(self, arguments: dict[str, Any]) -> None:
+        """Test that the worker count, chunk size and tolerance must be positive, the sampling mode and dtype known."""
+        with pytest.raises(ValueError):
+            MonteCarloSimulator(**arguments)
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import numpy
+import pytest
+
+from rebelist.momentum.domain import PortfolioForecast, Stock
+from rebelist.momentum.infrastructure.forecast import CorrelatedMonteCarloSimulator, MonteCarloSimulator
+
+
+def random_walk(ticker: str, log_returns: numpy.ndarray, start_price: float = 100.0, offset_hours: int = 0) -> Stock:
+    """Build a stock whose daily closes follow the given log-returns, stamped at a local midnight offset."""
+    start = datetime(2024, 1, 1, 0, 0, 0) + timedelta(hours=offset_hours)
+    prices = start_price * numpy.exp(numpy.concatenate(([0.0], numpy.cumsum(log_returns))))
+    history = {int((start + timedelta(days=i)).timestamp() * 1000): float(p) for i, p in enumerate(prices)}
+    return Stock.from_history(ticker, ticker, 'USD', history)
+
+
+class TestCorrelatedMonteCarloSimulator:
+    """Tests for the correlated portfolio simulator."""
+
+    def test_simulate_returns_portfolio_bands(self) -> None:
+        """Test the structure of the portfolio forecast and the normalisation of the weights."""
+        generator = numpy.random.default_rng(1)
+        stocks = [random_walk(name, generator.normal(0.0, 0.01, 200)) for name in ('A', 'B', 'C')]
+
+        forecast = CorrelatedMonteCarloSimulator().simulate(stocks, [2, 1, 1], 500, 15, seed=1)
+
+        assert isinstance(forecast, PortfolioForecast)
+        assert forecast.weights.tolist() == [0.5, 0.25, 0.25]
+        assert forecast.assets == []
+        assert len(forecast.median) == len(forecast.lower) == len(forecast.upper) == 15
+        assert numpy.all(forecast.lower <= forecast.median) and numpy.all(forecast.median <= forecast.upper)
+
+    def test_perfectly_correlated_basket_matches_single_asset(self) -> None:
+        """Test that a basket of two identical movers is as wide as one of them, unlike independent movers."""
+        generator = numpy.random.default_rng(2)
+        returns = generator.normal(0.0, 0.02, 250)
+        twins = [random_walk('A', returns), random_walk('B', returns, start_price=40.0)]
+        independent = [random_walk('A', returns), random_walk('C', generator.normal(0.0, 0.02, 250))]
+        simulator = CorrelatedMonteCarloSimulator()
+
+        single = MonteCarloSimulator().simulate(twins[0], 4_000, 30, seed=3)
+        correlated = simulator.simulate(twins, [1, 1], 4_000, 30, seed=3)
+        diversified = simulator.simulate(independent, [1, 1], 4_000, 30, seed=3)
+
+        single_width = (single.upper[-1] - single.lower[-1]) / twins[0].prices[-1]
+        correlated_width = (correlated.upper[-1] - correlated.lower[-1]) / 100
+        diversified_width = (diversified.upper[-1] - diversified.lower[-1]) / 100
+        assert correlated_width == pytest.approx(single_width, rel=0.05)
+        assert diversified_width < 0.8 * correlated_width
+
+    def test_histories_are_aligned_by_calendar_date(self) -> None:
+        """Test that bars stamped at different local midnights are matched to the same trading date."""
+        generator = numpy.random.default_rng(4)
+        stocks = [
+            random_walk('NY', generator.normal(0.0, 0.01, 50), offset_hours=5),
+            random_walk('FRA', generator.normal(0.0, 0.01, 50), offset_hours=-1),
+        ]
+
+        forecast = CorrelatedMonteCarloSimulator().simulate(stocks, [1, 1], 100, 5, seed=1)
+
+        assert len(forecast.median) == 5
+
+    def test_include_assets_returns_per_asset_bands(self) -> None:
+        """Test that per-asset bands come back in basket order and close to single-asset simulations."""
+        generator = numpy.random.default_rng(5)
+        stocks = [random_walk(name, generator.normal(0.0, 0.015, 250)) for name in ('A', 'B')]
+
+        forecast = CorrelatedMonteCarloSimulator().simulate(stocks, [1, 1], 5_000, 20, seed=6, include_assets=True)
+        single = MonteCarloSimulator().simulate(stocks[1], 5_000, 20, seed=6)
+
+        assert [asset.stock.ticker for asset in forecast.assets] == ['A', 'B']
+        assert forecast.assets[1].median[-1] == pytest.approx(single.median[-1], rel=0.02)
+        assert forecast.assets[1].upper[-1] == pytest.approx(single.upper[-1], rel=0.02)
+
+    def test_seeded_runs_are_reproducible(self) -> None:
+        """Test that the same seed reproduces the same portfolio forecast."""
+        generator = numpy.random.default_rng(7)
+        stocks = [random_walk(name, generator.normal(0.0, 0.01, 100)) for name in ('A', 'B')]
+        simulator = CorrelatedMonteCarloSimulator(chunk_size=64)
+
+        assert simulator.simulate(stocks, [1, 3], 300, 10, seed=8) == simulator.simulate(
+            stocks, [1, 3], 300, 10, seed=8
+        )
+
+    @pytest.mark.parametrize(
+        ('weights', 'message'),
+        [([1.0], 'exactly one weight'), ([1.0, -1.0], 'non-negative'), ([0.0, 0.0], 'non-negative')],
+    )
+    def test_invalid_weights_raise(self, weights: list[float], message: str) -> None:
+        """Test that weights must match the stocks and describe a long-only allocation."""
+        generator = numpy.random.default_rng(9)
+        stocks = [random_walk(name, generator.normal(0.0, 0.01, 20)) for name in ('A', 'B')]
+
+        with pytest.raises(ValueError, match=message):
+            CorrelatedMonteCarloSimulator().simulate(stocks, weights, 10, 5)
+
+    def test_disjoint_histories_raise(self) -> None:
+        """Test that stocks without enough common dates are rejected."""
+        early = random_walk('A', numpy.zeros(10))
+        late = Stock.from_history('B', 'B', 'USD', {1_900_000_000_000: 1.0, 1_900_086_400_000: 1.0})
+
+        with pytest.raises(ValueError, match='too little price history'):
+            CorrelatedMonteCarloSimulator().simulate([early, late], [1, 1], 10, 5)
@@ -0,0 +1,61 @@
+import numpy
+import pytest
+
+from rebelist.momentum.infrastructure.forecast import QuantileSketch
+
+
+class TestQuantileSketch:
+    """Tests for the per-day streaming quantile sketch."""
+
+    PROBABILITIES = (0.1, 0.5, 0.9)
+
+    def test_quantiles_stay_within_relative_accuracy(self) -> None:
+        """Test that every estimate lies within the documented relative error of the exact quantile."""
+        generator = numpy.random.default_rng(1)
+        values = numpy.cumsum(generator.normal(0.0, 0.02, size=(30, 20_000)), axis=0)
+        deviation = 8 * 0.02 * numpy.sqrt(numpy.arange(1, 31))
+        sketch = QuantileSketch(-deviation, deviation, relative_accuracy=0.001)
+
+        for chunk in numpy.array_split(values, 7, axis=1):
+            sketch.update(chunk)
+
+        exact = numpy.quantile(values, self.PROBABILITIES, axis=1)
+        estimated = sketch.quantiles(self.PROBABILITIES)
+
+        assert sketch.count == 20_000
+        assert numpy.all(numpy.abs(numpy.exp(estimated - exact) - 1) <= 0.001 + 1e-9)
+
+    def test_merge_equals_single_sketch(self) -> None:
+        """Test that merging two partial sketches gives the same answer as one sketch over all values."""
+        generator = numpy.random.default_rng(2)
+        values = generator.normal(0.0, 0.1, size=(5, 1_000))
+        bounds = numpy.full(5, 1.0)
+
+        whole = QuantileSketch(-bounds, bounds, relative_accuracy=0.01)
+        whole.update(values)
+        left = QuantileSketch(-bounds, bounds, relative_accuracy=0.01)
+        left.update(values[:, :400])
+        right = QuantileSketch(-bounds, bounds, relative_accuracy=0.01)
+        right.update(values[:, 400:])
+        left.merge(right)
+
+        numpy.testing.assert_array_equal(left.quantiles(self.PROBABILITIES), whole.quantiles(self.PROBABILITIES))
+
+    def test_constant_values_are_exact(self) -> None:
+        """Test that estimates are clamped to the observed range, which makes constant values exact."""
+        sketch = QuantileSketch(numpy.zeros(3), numpy.zeros(3), relative_accuracy=0.01)
+        sketch.update(numpy.zeros((3, 10)))
+
+        numpy.testing.assert_array_equal(sketch.quantiles(self.PROBABILITIES), numpy.zeros((3, 3)))
+
+    def test_empty_sketch_raises(self) -> None:
+        """Test that querying a sketch without values raises ValueError."""
+        sketch = QuantileSketch(numpy.zeros(3), numpy.ones(3), relative_accuracy=0.01)
+
+        with pytest.raises(ValueError, match='The sketch is empty.'):
+            sketch.quantiles(self.PROBABILITIES)
+
+    def test_invalid_relative_accuracy_raises(self) -> None:
+        """Test that the relative accuracy must be a fraction."""
+        with pytest.raises(ValueError):
+            QuantileSketch(numpy.zeros(3), numpy.ones(3), relative_accuracy=0)
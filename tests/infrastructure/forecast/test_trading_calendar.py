@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone
+
+import numpy
+import pytest
+
+from rebelist.momentum.infrastructure.forecast import TradingCalendar, calendar_for
+from rebelist.momentum.infrastructure.forecast.trading_calendar import WEEKDAYS
+
+
+def midnight(day: date, hour: int = 0) -> int:
+    """Epoch milliseconds of the given hour, UTC, on a day."""
+    return int(datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def dates(timestamps: numpy.ndarray) -> list[date]:
+    """Calendar dates of UTC-midnight timestamps."""
+    return [datetime.fromtimestamp(timestamp / 1000, timezone.utc).date() for timestamp in timestamps.tolist()]
+
+
+class TestTradingCalendar:
+    """Tests for the precomputed exchange trading calendars."""
+
+    def test_new_york_skips_weekends_and_holidays(self) -> None:
+        """Test that the days after a New York bar skip Christmas, New Year's Day, and the weekends in between."""
+        days = calendar_for('XNYS').following(midnight(date(2025, 12, 23), hour=5), 6)
+
+        assert dates(days) == [
+            date(2025, 12, 24),
+            date(2025, 12, 26),
+            date(2025, 12, 29),
+            date(2025, 12, 30),
+            date(2025, 12, 31),
+            date(2026, 1, 2),
+        ]
+
+    @pytest.mark.parametrize(
+        ('exchange', 'year', 'closed'),
+        [
+            ('XNYS', 2025, [date(2025, 1, 20), date(2025, 4, 18), date(2025, 6, 19), date(2025, 11, 27)]),
+            ('XNYS', 2021, [date(2021, 7, 5), date(2021, 12, 24)]),
+            ('XLON', 2021, [date(2021, 4, 5), date(2021, 5, 31), date(2021, 12, 27), date(2021, 12, 28)]),
+            ('XETR', 2025, [date(2025, 4, 21), date(2025, 5, 1), date(2025, 12, 24), date(2025, 12, 31)]),
+        ],
+    )
+    def test_holidays_are_closed(self, exchange: str, year: int, closed: list[date]) -> None:
+        """Test that holidays, and the weekdays weekend holidays are observed on, are not trading days."""
+        days = set(dates(calendar_for(exchange).following(midnight(date(year, 1, 1)), 260)))
+
+        assert days.isdisjoint(closed)
+        assert len(days) == 260
+
+    def test_european_bars_are_dated_by_the_nearest_midnight(self) -> None:
+        """Test that a bar stamped at Frankfurt midnight, the evening before in UTC, counts as its local date."""
+        days = calendar_for('XETR').following(midnight(date(2025, 9, 16), hour=22), 2)
+
+        assert dates(days) == [date(2025, 9, 18), date(2025, 9, 19)]
+
+    def test_unknown_exchanges_trade_every_weekday(self) -> None:
+        """Test that without rules the calendar matches numpy's business days."""
+        start = numpy.datetime64('2025-09-18', 'D')
+        expected = numpy.busday_offset(start, numpy.arange(300), roll='forward').astype('datetime64[ms]')
+
+        days = calendar_for('XTSE').following(midnight(date(2025, 9, 17)), 300)
+
+        assert days.tolist() == expected.astype(numpy.int64).tolist()
+        assert calendar_for('XTSE') is calendar_for(None)
+
+    def test_window_grows_to_cover_distant_dates(self) -> None:
+        """Test that dates far outside the precomputed window are still answered."""
+        calendar = TradingCalendar(WEEKDAYS)
+
+        past = calendar.following(0, 3)
+        future = calendar.following(midnight(date(2090, 6, 1)), 600)
+
+        assert dates(past) == [date(1970, 1, 2), date(1970, 1, 5), date(1970, 1, 6)]
+        assert future.size == 600 and numpy.all(numpy.diff(future) > 0)
+        assert not future.flags.writeable
@@ -0,0 +1,73 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.domain import Forecast, ProviderError, Stock
+from rebelist.momentum.presentation.cli import main, read_symbols
+
+
+class TestCli:
+    """Tests for the headless batch forecasting entry point."""
+
+    @staticmethod
+    def use_case(symbol: str, simulation_count: int, forecast_length: int, seed: int | None) -> Forecast:
+        """Forecast a flat line, failing for the BAD ticker."""
+        if symbol == 'BAD':
+            raise ProviderError(f"No price history available for ticker '{symbol}'.")
+
+        stock = Stock.from_history(symbol.title(), symbol, 'USD', {1: 100.0})
+        band = numpy.full(forecast_length, 100.0)
+        return Forecast(stock, numpy.arange(forecast_length) + 2, upper=band, median=band, lower=band)
+
+    @pytest.fixture(autouse=True)
+    def in_process_pool(self, mocker: MockerFixture) -> None:
+        """Run the pool in threads with a stub use case, so workers see the test doubles."""
+        container = mocker.MagicMock()
+        container.get_stock_forecast_use_case.return_value = self.use_case
+        mocker.patch('rebelist.momentum.presentation.cli.Container', return_value=container)
+        mocker.patch('rebelist.momentum.presentation.cli.ProcessPoolExecutor', ThreadPoolExecutor)
+        mocker.patch('rebelist.momentum.presentation.cli._use_case', None)
+
+    def test_read_symbols_skips_comments_blanks_and_repeats(self) -> None:
+        """Test that the ticker list is normalised to unique upper-case symbols."""
+        assert read_symbols(['msft\n', '\n', '# indices\n', 'voo  # S&P 500\n', 'MSFT\n']) == ['MSFT', 'VOO']
+
+    def test_batch_streams_results_and_records_failures(self, tmp_path: Path) -> None:
+        """Test that every ticker ends up in the JSON Lines output, failed ones with their error."""
+        tickers = tmp_path / 'tickers.txt'
+        tickers.write_text('AAA\nBAD\nCCC\n')
+        output = tmp_path / 'forecasts.jsonl'
+
+        status = main([str(tickers), '-o', str(output), '-n', '10', '-d', '3', '-p', '2'])
+
+        records = {record['symbol']: record for record in map(json.loads, output.read_text().splitlines())}
+        assert status == 0
+        assert set(records) == {'AAA', 'BAD', 'CCC'}
+        assert records['AAA']['median'] == [100.0, 100.0, 100.0]
+        assert records['AAA']['timestamps'] == [2, 3, 4]
+        assert 'No price history' in records['BAD']['error']
+
+    def test_format_follows_the_extension(self, tmp_path: Path) -> None:
+        """Test that a .csv output is written as long-format CSV."""
+        tickers = tmp_path / 'tickers.txt'
+        tickers.write_text('AAA\n')
+        output = tmp_path / 'forecasts.csv'
+
+        main([str(tickers), '-o', str(output), '-d', '2'])
+
+        assert output.read_text().splitlines() == [
+            'symbol,name,currency,timestamp,lower,median,upper,error',
+            'AAA,Aaa,USD,2,100.0,100.0,100.0,',
+            'AAA,Aaa,USD,3,100.0,100.0,100.0,',
+        ]
+
+    def test_batch_fails_when_every_ticker_fails(self, tmp_path: Path) -> None:
+        """Test that the exit status reports a batch without a single forecast."""
+        tickers = tmp_path / 'tickers.txt'
+        tickers.write_text('BAD\n')
+
+        assert main([str(tickers), '-o', str(tmp_path / 'out.jsonl')]) == 1
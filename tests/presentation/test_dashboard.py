@@ -7,7 +7,8 @@ from pytest_mock import MockerFixture
 
 from rebelist.momentum.application.use_cases.forecast import GetStockForecastUseCase
 from rebelist.momentum.config import Container
-from rebelist.momentum.presentation.dashboard import index
+from rebelist.momentum.presentation.dashboard import index, metrics, prepare
+from rebelist.momentum.telemetry import Telemetry
 
 
 class TestDashboardIndexPage:
@@ -19,7 +20,7 @@ class TestDashboardIndexPage:
         mock_container = mocker.MagicMock(spec=Container)
         mock_use_case = mocker.MagicMock(spec=GetStockForecastUseCase)
         mock_container.get_stock_forecast_use_case.return_value = mock_use_case
-        mocker.patch('rebelist.momentum.presentation.dashboard.Container', return_value=mock_container, autospec=True)
+        mocker.patch('rebelist.momentum.presentation.dashboard.get_container', return_value=mock_container)
 
         index()
 
@@ -30,6 +31,8 @@ class TestDashboardIndexPage:
         mock_ui.number.assert_any_call(label='Forecast Days', min=30, max=600, value=200, step=1)
         mock_ui.label.assert_any_call()
         mock_ui.button.assert_called_once_with('Run Simulation')
+        mock_ui.spinner.assert_called_once_with(size='md')
+        mock_ui.spinner.return_value.set_visibility.assert_called_once_with(False)
         mock_ui.column.assert_called_once()
 
         mock_container.get_stock_forecast_use_case.assert_called_once()
@@ -40,7 +43,7 @@ class TestDashboardIndexPage:
         mock_container = mocker.MagicMock()
         mock_use_case = mocker.MagicMock()
         mock_container.get_stock_forecast_use_case.return_value = mock_use_case
-        mocker.patch('rebelist.momentum.presentation.dashboard.Container', return_value=mock_container)
+        mocker.patch('rebelist.momentum.presentation.dashboard.get_container', return_value=mock_container)
 
         mock_input = mocker.MagicMock(spec=Input)
         mock_button = mocker.MagicMock(spec=Button)
@@ -54,3 +57,28 @@ class TestDashboardIndexPage:
 
         mock_input.on.assert_called_once()
         mock_button.on.assert_called_once()
+
+    def test_metrics_renders_telemetry_for_prometheus(self, mocker: MockerFixture) -> None:
+        """Test that the metrics route serves the container telemetry in the Prometheus text format."""
+        telemetry = Telemetry()
+        telemetry.record('provider.info', 0.2)
+        mock_container = mocker.MagicMock(spec=Container)
+        mock_container.telemetry.return_value = telemetry
+        mocker.patch('rebelist.momentum.presentation.dashboard.get_container', return_value=mock_container)
+
+        response = metrics()
+
+        assert response.media_type is not None and response.media_type.startswith('text/plain; version=0.0.4')
+        assert b'momentum_stage_duration_seconds_count{stage="provider.info"} 1' in response.body
+
+    def test_prepare_warms_the_process_up_unless_disabled(self, mocker: MockerFixture) -> None:
+        """Test that the startup hook only runs the warm-up when the configuration enables it."""
+        warm_up = mocker.patch('rebelist.momentum.presentation.dashboard.warm_up')
+        container = Container()
+        mocker.patch('rebelist.momentum.presentation.dashboard.get_container', return_value=container)
+
+        prepare()
+        container.config.warmup.enabled.from_value(False)
+        prepare()
+
+        warm_up.assert_called_once_with(container)
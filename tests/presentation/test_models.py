@@ -1,13 +1,30 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy
 from nicegui.elements.column import Column
 from nicegui.elements.input import Input
 from nicegui.elements.label import Label
 from nicegui.elements.number import Number
+from nicegui.elements.spinner import Spinner
 from nicegui_highcharts.highchart import Highchart
 from pytest_mock import MockerFixture
 
 from rebelist.momentum.application.use_cases.forecast import GetStockForecastUseCase
-from rebelist.momentum.domain import Forecast, Stock
+from rebelist.momentum.domain import (
+    Distribution,
+    Forecast,
+    HitProbability,
+    MaximumDrawdown,
+    ProviderError,
+    Stock,
+    TerminalDistribution,
+)
+from rebelist.momentum.infrastructure.forecast import MonteCarloSimulator
 from rebelist.momentum.presentation.models import Dashboard
+from rebelist.momentum.presentation.runner import ForecastRunner
 
 
 class TestDashboard:
@@ -26,6 +43,7 @@ class TestDashboard:
             forecast_length=mocker.MagicMock(spec=Number),
             chart=mocker.MagicMock(spec=Column),
             get_stock_forecast=mocker.MagicMock(spec=GetStockForecastUseCase),
+            runner=ForecastRunner(),
         )
 
         result = dashboard.validate()
@@ -45,6 +63,7 @@ class TestDashboard:
             forecast_length=mocker.MagicMock(spec=Number),
             chart=mocker.MagicMock(spec=Column),
             get_stock_forecast=mocker.MagicMock(spec=GetStockForecastUseCase),
+            runner=ForecastRunner(),
         )
 
         result = dashboard.validate()
@@ -67,9 +86,10 @@ class TestDashboard:
             forecast_length=mocker.MagicMock(spec=Number),
             chart=mock_chart,
             get_stock_forecast=mock_get_stock_forecast,
+            runner=ForecastRunner(),
         )
 
-        dashboard.update()
+        asyncio.run(dashboard.update())
 
         mock_chart.clear.assert_not_called()
         mock_get_stock_forecast.assert_not_called()
@@ -86,17 +106,19 @@ class TestDashboard:
         mock_forecast_length.value = 30
         mock_chart = mocker.MagicMock(spec=Column)
 
-        stock = Stock(name='Microsoft', ticker='MSFT', currency='USD', history={})
+        stock = Stock.from_history('Microsoft', 'MSFT', 'USD', {})
         forecast = Forecast(
             stock=stock,
-            upper=[(1, 200.0)],
-            median=[(1, 150.0)],
-            lower=[(1, 100.0)],
+            timestamps=numpy.array([1]),
+            upper=numpy.array([200.0]),
+            median=numpy.array([150.0]),
+            lower=numpy.array([100.0]),
         )
         mock_get_stock_forecast = mocker.MagicMock(return_value=forecast)
 
         mock_highchart = mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
         mock_highchart.return_value = mocker.MagicMock(spec=Highchart)
+        mock_spinner = mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
 
         dashboard = Dashboard(
             ticker=mock_input,
@@ -105,13 +127,264 @@ class TestDashboard:
             forecast_length=mock_forecast_length,
             chart=mock_chart,
             get_stock_forecast=mock_get_stock_forecast,
+            runner=ForecastRunner(),
         )
 
-        dashboard.update()
+        asyncio.run(dashboard.update())
 
-        mock_chart.clear.assert_called_once()
+        assert mock_chart.clear.call_count == 2
+        mock_spinner.assert_called_once()
         assert mock_input.value == 'MSFT'
-        mock_get_stock_forecast.assert_called_once_with('MSFT', 100, 30)
+        mock_get_stock_forecast.assert_called_once_with('MSFT', 100, 30, seed=None, reducers=())
         assert mock_title.text == 'Microsoft'
         mock_highchart.assert_called_once()
         mock_highchart.return_value.classes.assert_called_once_with('w-full h-[700px]')
+
+    def test_update_notifies_provider_errors(self, mocker: MockerFixture) -> None:
+        """Test update clears the loading state and notifies the user when the provider fails."""
+        mock_input = mocker.MagicMock(spec=Input)
+        mock_input.value = 'NOPE'
+        mock_count = mocker.MagicMock(spec=Number)
+        mock_count.value = 100
+        mock_chart = mocker.MagicMock(spec=Column)
+        mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
+        mock_notify = mocker.patch('rebelist.momentum.presentation.models.ui.notify', autospec=True)
+
+        dashboard = Dashboard(
+            ticker=mock_input,
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mock_count,
+            forecast_length=mock_count,
+            chart=mock_chart,
+            get_stock_forecast=mocker.MagicMock(side_effect=ProviderError('Unknown ticker')),
+            runner=ForecastRunner(),
+        )
+
+        asyncio.run(dashboard.update())
+
+        mock_notify.assert_called_once_with('ERROR: Unknown ticker', color='red')
+        assert not dashboard.pending
+
+    def test_new_update_cancels_pending_update(self, mocker: MockerFixture) -> None:
+        """Test that a second click cancels the stale run, so only the latest forecast is rendered."""
+        mock_input = mocker.MagicMock(spec=Input)
+        mock_input.value = 'SLOW'
+        mock_count = mocker.MagicMock(spec=Number)
+        mock_count.value = 100
+        mock_length = mocker.MagicMock(spec=Number)
+        mock_length.value = 30
+        mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
+        mock_highchart = mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
+
+        release = threading.Event()
+        stock = Stock.from_history('Slow', 'SLOW', 'USD', {})
+        forecast = Forecast(
+            stock,
+            timestamps=numpy.empty(0, dtype=numpy.int64),
+            upper=numpy.empty(0, dtype=numpy.float64),
+            median=numpy.empty(0, dtype=numpy.float64),
+            lower=numpy.empty(0, dtype=numpy.float64),
+        )
+
+        def use_case(symbol: str, simulation_count: int, forecast_length: int, **_: Any) -> Forecast:
+            if forecast_length == 30:
+                release.wait(5)
+            return forecast
+
+        dashboard = Dashboard(
+            ticker=mock_input,
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mock_count,
+            forecast_length=mock_length,
+            chart=mocker.MagicMock(spec=Column),
+            get_stock_forecast=mocker.MagicMock(side_effect=use_case),
+            runner=ForecastRunner(),
+        )
+
+        async def click_twice() -> None:
+            stale = asyncio.create_task(dashboard.update())
+            await asyncio.sleep(0.05)
+            mock_length.value = 60
+            await dashboard.update()
+            release.set()
+            await asyncio.gather(stale, return_exceptions=True)
+            assert stale.cancelled()
+
+        asyncio.run(click_twice())
+
+        mock_highchart.assert_called_once()
+
+    def test_activity_is_shown_until_the_latest_update_finishes(self, mocker: MockerFixture) -> None:
+        """Test that the spinner stays visible while a superseded update unwinds, and hides once none is pending."""
+        mock_input = mocker.MagicMock(spec=Input)
+        mock_input.value = 'SLOW'
+        mock_count = mocker.MagicMock(spec=Number)
+        mock_count.value = 100
+        mock_length = mocker.MagicMock(spec=Number)
+        mock_length.value = 30
+        mock_activity = mocker.MagicMock(spec=Spinner)
+        mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
+        mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
+
+        release = threading.Event()
+        forecast = Forecast(
+            Stock.from_history('Slow', 'SLOW', 'USD', {}),
+            timestamps=numpy.empty(0, dtype=numpy.int64),
+            upper=numpy.empty(0, dtype=numpy.float64),
+            median=numpy.empty(0, dtype=numpy.float64),
+            lower=numpy.empty(0, dtype=numpy.float64),
+        )
+
+        def use_case(symbol: str, simulation_count: int, forecast_length: int, **_: Any) -> Forecast:
+            if forecast_length == 30:
+                release.wait(5)
+            return forecast
+
+        dashboard = Dashboard(
+            ticker=mock_input,
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mock_count,
+            forecast_length=mock_length,
+            chart=mocker.MagicMock(spec=Column),
+            get_stock_forecast=mocker.MagicMock(side_effect=use_case),
+            runner=ForecastRunner(),
+            activity=mock_activity,
+        )
+
+        async def click_twice() -> None:
+            stale = asyncio.create_task(dashboard.update())
+            await asyncio.sleep(0.05)
+            mock_length.value = 60
+            await dashboard.update()
+            release.set()
+            await asyncio.gather(stale, return_exceptions=True)
+
+        asyncio.run(click_twice())
+
+        assert mock_activity.set_visibility.call_args_list == [
+            mocker.call(True),
+            mocker.call(True),
+            mocker.call(False),
+        ]
+
+    def test_progressive_update_refines_the_chart_in_place(self, mocker: MockerFixture) -> None:
+        """Test that the first estimate builds the chart and later ones only replace its series."""
+        mock_input = mocker.MagicMock(spec=Input)
+        mock_input.value = 'MSFT'
+        mock_count = mocker.MagicMock(spec=Number)
+        mock_count.value = 100
+        mock_chart = mocker.MagicMock(spec=Column)
+        mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
+        mock_highchart = mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
+        plot = mock_highchart.return_value.classes.return_value = mocker.MagicMock(spec=Highchart)
+        plot.options = {}
+
+        stock = Stock.from_history('Microsoft', 'MSFT', 'USD', {})
+        estimates = [
+            Forecast(stock, numpy.array([1]), numpy.array([upper]), numpy.array([150.0]), numpy.array([100.0]))
+            for upper in (210.0, 205.0, 200.0)
+        ]
+        use_case = mocker.MagicMock(spec=GetStockForecastUseCase)
+        use_case.progressively.return_value = iter(estimates)
+
+        dashboard = Dashboard(
+            ticker=mock_input,
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mock_count,
+            forecast_length=mock_count,
+            chart=mock_chart,
+            get_stock_forecast=use_case,
+            runner=ForecastRunner(),
+            progressive=True,
+        )
+
+        asyncio.run(dashboard.update())
+
+        mock_highchart.assert_called_once()
+        assert plot.update.call_count == 2
+        assert plot.options['series'][0]['data'] == [200.0]
+        assert dashboard.plot == [plot]
+
+    def test_update_requests_and_summarises_path_analytics(self, mocker: MockerFixture) -> None:
+        """Test that the configured analytics and the target price are requested and summarised below the button."""
+        mock_input = mocker.MagicMock(spec=Input)
+        mock_input.value = 'MSFT'
+        mock_count = mocker.MagicMock(spec=Number)
+        mock_count.value = 100
+        mock_target = mocker.MagicMock(spec=Number)
+        mock_target.value = 120
+        mock_summary = mocker.MagicMock(spec=Label)
+        mocker.patch('rebelist.momentum.presentation.models.ui.spinner', autospec=True)
+        mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
+
+        stock = Stock.from_history('Microsoft', 'MSFT', 'USD', {1: 100.0})
+        drawdowns = Distribution(numpy.linspace(0.0, 1.0, 11), numpy.array([0.0, 1.0] + [0.0] * 8))
+        prices = Distribution(numpy.array([50.0, 100.0, 150.0]), numpy.array([0.4, 0.6]))
+        forecast = Forecast(
+            stock,
+            numpy.array([1]),
+            numpy.array([200.0]),
+            numpy.array([150.0]),
+            numpy.array([100.0]),
+            analytics={'hit_probability[120]': 0.25, 'maximum_drawdown': drawdowns, 'terminal_distribution': prices},
+        )
+        use_case = mocker.MagicMock(return_value=forecast)
+
+        dashboard = Dashboard(
+            ticker=mock_input,
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mock_count,
+            forecast_length=mock_count,
+            chart=mocker.MagicMock(spec=Column),
+            get_stock_forecast=use_case,
+            runner=ForecastRunner(),
+            analytics=(MaximumDrawdown(bins=10), TerminalDistribution()),
+            target=mock_target,
+            summary=mock_summary,
+        )
+
+        asyncio.run(dashboard.update())
+
+        reducers = (MaximumDrawdown(bins=10), TerminalDistribution(), HitProbability(120.0))
+        use_case.assert_called_once_with('MSFT', 100, 100, seed=None, reducers=reducers)
+        assert mock_summary.text == (
+            'Median maximum drawdown: 15% · Chance to end above 100.00 USD: 60% · Chance to touch 120.00 USD: 25%'
+        )
+
+    def test_business_day_forecasts_are_sent_on_an_axis_of_trading_days(self, mocker: MockerFixture) -> None:
+        """Test that the weekends and holidays a forecast skips no longer turn its bands into (date, price) pairs."""
+        mock_highchart = mocker.patch('rebelist.momentum.presentation.models.ui.highchart', autospec=True)
+        plot = mock_highchart.return_value.classes.return_value = mocker.MagicMock(spec=Highchart)
+        plot.options = {}
+        history = {1_757_980_800_000 + day * 86_400_000: 100.0 + day % 3 for day in range(60)}
+        stock = Stock.from_history('Microsoft', 'MSFT', 'USD', history)
+        simulator = MonteCarloSimulator()
+        dashboard = Dashboard(
+            ticker=mocker.MagicMock(spec=Input),
+            title=mocker.MagicMock(spec=Label),
+            simulation_count=mocker.MagicMock(spec=Number),
+            forecast_length=mocker.MagicMock(spec=Number),
+            chart=mocker.MagicMock(spec=Column),
+            get_stock_forecast=mocker.MagicMock(spec=GetStockForecastUseCase),
+            runner=ForecastRunner(),
+        )
+
+        short = simulator.simulate(stock, 100, 150, seed=1)
+        dashboard.render(short)
+        options = mock_highchart.call_args.args[0]
+        long = simulator.simulate(stock, 100, 600, seed=1)
+        dashboard.render(long)
+
+        assert len(set(numpy.diff(short.timestamps).tolist())) > 1
+        median = options['series'][1]
+        assert median['data'] == short.median.tolist()
+        assert (median['pointStart'], median['pointInterval']) == (0, 1)
+        first_day = datetime.fromtimestamp(int(short.timestamps[0]) / 1000, timezone.utc).date()
+        assert options['xAxis']['categories'][0] == first_day.isoformat()
+        assert len(options['xAxis']['categories']) == 150
+
+        updated: dict[str, Any] = plot.options
+        downsampled = updated['series'][1]['data']
+        assert len(downsampled) == Dashboard.MAX_CHART_POINTS
+        assert downsampled[0] == [0, long.median[0]] and downsampled[-1] == [599, long.median[-1]]
+        assert len(updated['xAxis']['categories']) == 600
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import aclosing
+
+import numpy
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.domain import Forecast, Stock
+from rebelist.momentum.presentation.runner import ForecastRunner
+
+
+class TestForecastRunner:
+    """Tests for the off-loop forecast runner."""
+
+    @staticmethod
+    def forecast(paths: int | None = None) -> Forecast:
+        """Build an empty forecast, of the given number of paths."""
+        stock = Stock.from_history('Test', 'TST', 'USD', {})
+        return Forecast(
+            stock,
+            timestamps=numpy.empty(0, dtype=numpy.int64),
+            upper=numpy.empty(0, dtype=numpy.float64),
+            median=numpy.empty(0, dtype=numpy.float64),
+            lower=numpy.empty(0, dtype=numpy.float64),
+            paths=paths,
+        )
+
+    def test_identical_concurrent_requests_share_one_run(self, mocker: MockerFixture) -> None:
+        """Test that identical requests in flight at the same time call the use case once."""
+        release = threading.Event()
+        forecast = self.forecast()
+        use_case = mocker.MagicMock(side_effect=lambda *_, **__: release.wait(5) and forecast)
+        runner = ForecastRunner()
+
+        async def scenario() -> list[Forecast]:
+            runs = [asyncio.create_task(runner.run(use_case, 'TST', 100, 30)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            assert runner.in_flight == 1
+            release.set()
+            return await asyncio.gather(*runs)
+
+        results = asyncio.run(scenario())
+
+        use_case.assert_called_once_with('TST', 100, 30, seed=None, reducers=())
+        assert all(result is forecast for result in results)
+        assert runner.in_flight == 0
+
+    def test_different_requests_run_separately(self, mocker: MockerFixture) -> None:
+        """Test that requests with different parameters are not coalesced."""
+        use_case = mocker.MagicMock(return_value=self.forecast())
+        runner = ForecastRunner()
+
+        async def scenario() -> None:
+            await asyncio.gather(runner.run(use_case, 'TST', 100, 30), runner.run(use_case, 'TST', 100, 60))
+
+        asyncio.run(scenario())
+
+        assert use_case.call_count == 2
+
+    def test_cancelled_waiter_does_not_cancel_shared_run(self, mocker: MockerFixture) -> None:
+        """Test that cancelling one waiter leaves the other waiters of the same run untouched."""
+        release = threading.Event()
+        forecast = self.forecast()
+        use_case = mocker.MagicMock(side_effect=lambda *_, **__: release.wait(5) and forecast)
+        runner = ForecastRunner()
+
+        async def scenario() -> Forecast:
+            cancelled = asyncio.create_task(runner.run(use_case, 'TST', 100, 30))
+            kept = asyncio.create_task(runner.run(use_case, 'TST', 100, 30))
+            await asyncio.sleep(0.05)
+            cancelled.cancel()
+            release.set()
+            return await kept
+
+        assert asyncio.run(scenario()) is forecast
+        use_case.assert_called_once()
+
+    def test_run_without_waiters_is_cancelled_before_it_starts(self, mocker: MockerFixture) -> None:
+        """Test that a queued run whose only waiter is cancelled never takes a worker, and is not shared any more."""
+        release = threading.Event()
+        forecast = self.forecast()
+        use_case = mocker.MagicMock(side_effect=lambda *_, **__: release.wait(5) and forecast)
+        runner = ForecastRunner(workers=1)
+
+        async def scenario() -> Forecast:
+            busy = asyncio.create_task(runner.run(use_case, 'TST', 100, 30))
+            stale = asyncio.create_task(runner.run(use_case, 'TST', 100, 60))
+            await asyncio.sleep(0.05)
+            stale.cancel()
+            await asyncio.sleep(0.05)
+            assert runner.in_flight == 1
+            release.set()
+            return await busy
+
+        assert asyncio.run(scenario()) is forecast
+        use_case.assert_called_once()
+
+    def test_stream_yields_estimates_until_the_consumer_stops(self, mocker: MockerFixture) -> None:
+        """Test that estimates are streamed one by one and that no more are computed once the consumer stops."""
+        produced: list[int] = []
+
+        def estimates(*_: object, **__: object) -> Iterator[Forecast]:
+            for index in range(5):
+                produced.append(index)
+                yield self.forecast()
+
+        use_case = mocker.MagicMock()
+        use_case.progressively.side_effect = estimates
+        runner = ForecastRunner()
+
+        async def scenario() -> int:
+            received = 0
+            async for _ in runner.stream(use_case, 'TST', 100, 30):
+                received += 1
+                if received == 2:
+                    break
+            return received
+
+        assert asyncio.run(scenario()) == 2
+        use_case.progressively.assert_called_once_with('TST', 100, 30, seed=None, reducers=())
+        assert produced == [0, 1]
+
+    def test_identical_concurrent_streams_share_one_run(self, mocker: MockerFixture) -> None:
+        """Test that identical streams in flight at the same time run the use case once and all end on its result."""
+        release = threading.Event()
+
+        def estimates(*_: object, **__: object) -> Iterator[Forecast]:
+            release.wait(5)
+            for paths in (100, 300, 700):
+                yield self.forecast(paths)
+
+        use_case = mocker.MagicMock()
+        use_case.progressively.side_effect = estimates
+        runner = ForecastRunner()
+
+        async def consume() -> list[int | None]:
+            return [estimate.paths async for estimate in runner.stream(use_case, 'TST', 700, 30)]
+
+        async def scenario() -> list[list[int | None]]:
+            streams = [asyncio.create_task(consume()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            assert runner.in_flight == 1
+            release.set()
+            return await asyncio.gather(*streams)
+
+        results = asyncio.run(scenario())
+
+        use_case.progressively.assert_called_once_with('TST', 700, 30, seed=None, reducers=())
+        assert all(result[-1] == 700 for result in results)
+        assert runner.in_flight == 0
+
+    def test_stopped_consumer_does_not_stop_a_shared_stream(self, mocker: MockerFixture) -> None:
+        """Test that a consumer leaving a shared stream early leaves the other consumers of it untouched."""
+        use_case = mocker.MagicMock()
+        use_case.progressively.side_effect = lambda *_, **__: (self.forecast(paths) for paths in (100, 300, 700))
+        runner = ForecastRunner()
+
+        async def first(stream: AsyncGenerator[Forecast, None]) -> Forecast:
+            async with aclosing(stream):
+                async for estimate in stream:
+                    return estimate
+            raise AssertionError('The stream ended without an estimate.')
+
+        async def scenario() -> tuple[Forecast, list[int | None]]:
+            leaving = asyncio.create_task(first(runner.stream(use_case, 'TST', 700, 30)))
+            staying = [estimate.paths async for estimate in runner.stream(use_case, 'TST', 700, 30)]
+            return await leaving, staying
+
+        left, stayed = asyncio.run(scenario())
+
+        use_case.progressively.assert_called_once()
+        assert left.paths == 100
+        assert stayed[-1] == 700
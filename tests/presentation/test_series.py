@@ -0,0 +1,64 @@
+import numpy
+
+from rebelist.momentum.presentation.series import compact, day_labels, downsample
+
+
+class TestDownsample:
+    """Tests for the Largest-Triangle-Three-Buckets reducer."""
+
+    def test_short_series_are_kept_whole(self) -> None:
+        """Test that a series within the threshold is not reduced."""
+        timestamps = numpy.arange(10, dtype=numpy.int64)
+
+        assert downsample(timestamps, numpy.ones(10), 20).tolist() == list(range(10))
+
+    def test_keeps_endpoints_and_extremes(self) -> None:
+        """Test that the reduced series keeps its endpoints and the spikes that define its shape."""
+        timestamps = numpy.arange(1_000, dtype=numpy.int64) * 86_400_000
+        values = numpy.zeros(1_000)
+        values[[250, 700]] = (50.0, -30.0)
+
+        selected = downsample(timestamps, values, 50)
+
+        assert len(selected) == 50
+        assert selected[0] == 0 and selected[-1] == 999
+        assert {250, 700} <= set(selected.tolist())
+        assert numpy.all(numpy.diff(selected) > 0)
+
+
+class TestCompact:
+    """Tests for the compact Highcharts serialization."""
+
+    def test_evenly_spaced_series_share_the_axis(self) -> None:
+        """Test that evenly spaced points are sent as values with a start and an interval."""
+        timestamps = numpy.array([1_000, 2_000, 3_000], dtype=numpy.int64)
+
+        assert compact(timestamps, numpy.array([1.0, 2.0, 3.0])) == {
+            'data': [1.0, 2.0, 3.0],
+            'pointStart': 1_000,
+            'pointInterval': 1_000,
+        }
+
+    def test_irregular_series_fall_back_to_pairs(self) -> None:
+        """Test that unevenly spaced points keep their own timestamps."""
+        timestamps = numpy.array([1_000, 2_000, 4_000], dtype=numpy.int64)
+
+        assert compact(timestamps, numpy.array([1.0, 2.0, 3.0])) == {'data': [[1_000, 1.0], [2_000, 2.0], [4_000, 3.0]]}
+
+    def test_single_point_starts_the_axis(self) -> None:
+        """Test that a lone point is sent as a value at its position, like an evenly spaced series."""
+        assert compact(numpy.array([4], dtype=numpy.int64), numpy.array([1.0])) == {
+            'data': [1.0],
+            'pointStart': 4,
+            'pointInterval': 1,
+        }
+
+
+class TestDayLabels:
+    """Tests for the labels of an axis of trading days."""
+
+    def test_labels_are_the_iso_dates_of_the_days(self) -> None:
+        """Test that UTC-midnight timestamps become their dates, gaps and all."""
+        timestamps = numpy.array([1_758_240_000_000, 1_758_499_200_000], dtype=numpy.int64)
+
+        assert day_labels(timestamps) == ['2025-09-19', '2025-09-22']
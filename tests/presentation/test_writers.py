@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.momentum.domain import Forecast, Stock
+from rebelist.momentum.presentation.writers import BatchResult, ResultWriter, open_writer
+
+
+class TestWriters:
+    """Tests for the streaming batch result writers."""
+
+    def test_failed_ticker_is_a_single_error_row(self) -> None:
+        """Test that a failure is written as one row carrying only the symbol and the error."""
+        assert ResultWriter.rows(BatchResult('BAD', error='Unknown ticker')) == [
+            ('BAD', None, None, None, None, None, None, 'Unknown ticker')
+        ]
+
+    def test_parquet_requires_pyarrow(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test that Parquet output explains how to get the optional dependency."""
+        mocker.patch.dict(sys.modules, {'pyarrow': None, 'pyarrow.parquet': None})
+
+        with pytest.raises(RuntimeError, match=r'rebelist-momentum\[parquet\]'):
+            open_writer(tmp_path / 'out.parquet', 'parquet')
+
+    def test_parquet_round_trip(self, tmp_path: Path) -> None:
+        """Test that forecasts and failures written to Parquet read back as the same long-format rows."""
+        parquet = pytest.importorskip('pyarrow.parquet')
+        timestamps = numpy.array([1_700_000_000_000, 1_700_086_400_000], dtype=numpy.int64)
+        stock = Stock('Vanguard S&P 500', 'VOO', 'USD', timestamps, numpy.array([400.0, 401.0]))
+        forecast = Forecast(
+            stock,
+            timestamps=timestamps + 172_800_000,
+            upper=numpy.array([410.0, 420.0]),
+            median=numpy.array([402.0, 403.0]),
+            lower=numpy.array([395.0, 390.0]),
+        )
+
+        with open_writer(tmp_path / 'out.parquet', 'parquet') as writer:
+            writer.write(BatchResult('VOO', forecast=forecast))
+            writer.write(BatchResult('BAD', error='Unknown ticker'))
+
+        table = parquet.read_table(tmp_path / 'out.parquet')
+        assert table.column_names == list(ResultWriter.COLUMNS)
+        assert table.num_rows == 3
+        assert table.column('symbol').to_pylist() == ['VOO', 'VOO', 'BAD']
+        assert table.column('median').to_pylist() == [402.0, 403.0, None]
+        assert table.column('error').to_pylist() == [None, None, 'Unknown ticker']
+        assert [
+            None if timestamp is None else int(timestamp.timestamp() * 1000)
+            for timestamp in table.column('timestamp').to_pylist()
+        ] == [*(timestamps + 172_800_000).tolist(), None]
+
+    def test_parquet_to_dash_is_written_to_stdout(
+        self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test that Parquet output to ``-`` goes to stdout, as the other formats do, rather than to a file named -."""
+        parquet = pytest.importorskip('pyarrow.parquet')
+        stdout = mocker.patch.object(sys, 'stdout')
+        stdout.buffer = (tmp_path / 'stdout.parquet').open('wb')
+        monkeypatch.chdir(tmp_path)
+
+        with open_writer(Path('-'), 'parquet') as writer:
+            writer.write(BatchResult('BAD', error='Unknown ticker'))
+        stdout.buffer.close()
+
+        assert not (tmp_path / '-').exists()
+        assert parquet.read_table(tmp_path / 'stdout.parquet').column('symbol').to_pylist() == ['BAD']
+
+    def test_unknown_format_raises(self, tmp_path: Path) -> None:
+        """Test that an unsupported format is rejected before the output is created."""
+        with pytest.raises(ValueError, match='Unknown output format'):
+            open_writer(tmp_path / 'out.xml', 'xml')
+
+        assert not (tmp_path / 'out.xml').exists()
@@ -0,0 +1,24 @@
+import pytest
+
+from rebelist.momentum.telemetry import Histogram
+
+
+class TestHistogram:
+    """Tests for the fixed-bucket histogram."""
+
+    def test_snapshot_counts_are_cumulative(self) -> None:
+        """Test that every bucket counts the observations up to and including its bound."""
+        histogram = Histogram([1.0, 2.0, 5.0])
+        for value in (0.5, 1.0, 1.5, 4.0, 9.0):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot.cumulative_counts == (2, 3, 4)
+        assert snapshot.count == 5
+        assert snapshot.total == pytest.approx(16.0)
+
+    def test_bounds_must_increase(self) -> None:
+        """Test that unsorted or repeated bounds are rejected."""
+        with pytest.raises(ValueError, match='strictly increasing'):
+            Histogram([1.0, 1.0, 2.0])
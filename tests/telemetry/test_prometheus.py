@@ -0,0 +1,21 @@
+from rebelist.momentum.telemetry import Telemetry, prometheus
+
+
+class TestPrometheus:
+    """Tests for the Prometheus text exposition."""
+
+    def test_render_writes_cumulative_buckets_sum_and_count(self) -> None:
+        """Test that each stage is rendered as a labelled histogram."""
+        telemetry = Telemetry()
+        telemetry.record('provider.history', 0.3)
+        telemetry.record('provider.history', 3.0, peak_bytes=2_048)
+
+        text = prometheus.render(telemetry)
+
+        assert '# TYPE momentum_stage_duration_seconds histogram' in text
+        assert 'momentum_stage_duration_seconds_bucket{stage="provider.history",le="0.25"} 0' in text
+        assert 'momentum_stage_duration_seconds_bucket{stage="provider.history",le="0.5"} 1' in text
+        assert 'momentum_stage_duration_seconds_bucket{stage="provider.history",le="+Inf"} 2' in text
+        assert 'momentum_stage_duration_seconds_sum{stage="provider.history"} 3.3' in text
+        assert 'momentum_stage_peak_memory_bytes_count{stage="provider.history"} 1' in text
+        assert text.endswith('\n')
@@ -0,0 +1,49 @@
+import tracemalloc
+
+import numpy
+
+from rebelist.momentum.telemetry import Telemetry
+
+
+class TestTelemetry:
+    """Tests for the per-stage telemetry."""
+
+    def test_spans_are_aggregated_per_stage(self) -> None:
+        """Test that every span is recorded in the histogram of its stage."""
+        telemetry = Telemetry()
+
+        for _ in range(3):
+            with telemetry.span('simulator.paths'):
+                pass
+        with telemetry.span('simulator.reduce'):
+            pass
+
+        durations = telemetry.durations()
+        assert list(durations) == ['simulator.paths', 'simulator.reduce']
+        assert durations['simulator.paths'].count == 3
+        assert telemetry.memory() == {}
+
+    def test_disabled_telemetry_records_nothing(self) -> None:
+        """Test that a disabled instance hands out one shared no-op span."""
+        telemetry = Telemetry(enabled=False)
+
+        with telemetry.span('provider.info'):
+            pass
+
+        assert telemetry.span('a') is telemetry.span('b')
+        assert telemetry.durations() == {}
+
+    def test_memory_peaks_reach_enclosing_spans(self) -> None:
+        """Test that the peak of a nested stage also counts towards the stage around it."""
+        telemetry = Telemetry(trace_memory=True)
+
+        try:
+            with telemetry.span('outer'):
+                with telemetry.span('inner'):
+                    numpy.ones(1_000_000)
+        finally:
+            tracemalloc.stop()
+
+        memory = telemetry.memory()
+        assert memory['inner'].total >= 8_000_000
+        assert memory['outer'].total >= memory['inner'].total